@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Banco Local de Projetos (SQLite)
+Armazena várias produções e suas revisões de plano já processadas,
+permitindo gerar ODs de qualquer revisão sem reler CSV/PDF
+"""
+
+import argparse
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from snapshot_projeto import calcular_digests_fontes
+
+ARQUIVO_BANCO_PADRAO = "arquivos/projetos.db"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS projetos (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    criado_em TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS revisoes (
+    id INTEGER PRIMARY KEY,
+    projeto_id INTEGER NOT NULL REFERENCES projetos(id) ON DELETE CASCADE,
+    rotulo TEXT NOT NULL,
+    titulo TEXT,
+    diretor TEXT,
+    digest_decupagem TEXT,
+    digest_plano TEXT,
+    importado_em TEXT NOT NULL,
+    UNIQUE (projeto_id, rotulo)
+);
+
+CREATE TABLE IF NOT EXISTS dias (
+    id INTEGER PRIMARY KEY,
+    revisao_id INTEGER NOT NULL REFERENCES revisoes(id) ON DELETE CASCADE,
+    numero INTEGER NOT NULL,
+    locacao_principal TEXT,
+    UNIQUE (revisao_id, numero)
+);
+
+CREATE TABLE IF NOT EXISTS itens_cronograma (
+    id INTEGER PRIMARY KEY,
+    dia_id INTEGER NOT NULL REFERENCES dias(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    numero INTEGER,
+    tipo_local TEXT,
+    atividade TEXT,
+    descricao TEXT,
+    descricao_detalhada TEXT,
+    horario_inicio TEXT,
+    horario_fim TEXT,
+    linha_original TEXT
+);
+
+CREATE TABLE IF NOT EXISTS cenas (
+    id INTEGER PRIMARY KEY,
+    revisao_id INTEGER NOT NULL REFERENCES revisoes(id) ON DELETE CASCADE,
+    numero TEXT NOT NULL,
+    locacao TEXT,
+    descricao TEXT,
+    elenco TEXT,
+    observacoes TEXT,
+    UNIQUE (revisao_id, numero)
+);
+
+CREATE TABLE IF NOT EXISTS planos (
+    id INTEGER PRIMARY KEY,
+    cena_id INTEGER NOT NULL REFERENCES cenas(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    planos TEXT,
+    elenco TEXT,
+    observacoes TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_revisoes_projeto ON revisoes(projeto_id);
+CREATE INDEX IF NOT EXISTS idx_dias_revisao ON dias(revisao_id, numero);
+CREATE INDEX IF NOT EXISTS idx_itens_dia ON itens_cronograma(dia_id, ordem);
+CREATE INDEX IF NOT EXISTS idx_itens_cena ON itens_cronograma(numero);
+CREATE INDEX IF NOT EXISTS idx_cenas_numero ON cenas(numero);
+CREATE INDEX IF NOT EXISTS idx_planos_cena ON planos(cena_id, ordem);
+"""
+
+# Colunas opcionais de um item do cronograma (NULL = chave ausente no dict)
+CAMPOS_ITEM = (
+    "numero",
+    "tipo_local",
+    "atividade",
+    "descricao",
+    "descricao_detalhada",
+    "horario_inicio",
+    "horario_fim",
+    "linha_original",
+)
+
+SQL_INSERIR_ITEM = """
+INSERT INTO itens_cronograma (
+    dia_id, ordem, tipo, numero, tipo_local, atividade, descricao,
+    descricao_detalhada, horario_inicio, horario_fim, linha_original
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_ITENS_REVISAO = """
+SELECT i.dia_id, i.tipo, i.numero, i.tipo_local, i.atividade, i.descricao,
+       i.descricao_detalhada, i.horario_inicio, i.horario_fim, i.linha_original
+FROM itens_cronograma i JOIN dias d ON d.id = i.dia_id
+WHERE d.revisao_id = ? ORDER BY i.dia_id, i.ordem
+"""
+
+
+class BancoProjetos:
+    """Armazenamento SQLite de projetos, revisões, dias, cenas e planos"""
+
+    def __init__(self, caminho=ARQUIVO_BANCO_PADRAO):
+        self.caminho = caminho
+        if caminho != ":memory:":
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.row_factory = sqlite3.Row
+        self.conexao.execute("PRAGMA foreign_keys = ON")
+        self.conexao.executescript(ESQUEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+    def importar_gerador(self, gerador, nome_projeto, rotulo_revisao):
+        """Grava o projeto carregado no gerador como uma revisão
+
+        Uma revisão com o mesmo rótulo é substituída. Retorna o id da revisão.
+        """
+        dias_filmagem = gerador.config.get("dias_filmagem", {})
+        for dia_str, dia_config in dias_filmagem.items():
+            if "cronograma_completo" not in dia_config:
+                raise ValueError(
+                    f"Dia {dia_str} sem cronograma do PDF - carregue o plano antes de importar"
+                )
+
+        digests = calcular_digests_fontes(
+            gerador.arquivo_decupagem, gerador.arquivo_plano
+        )
+        digest_decupagem, digest_plano = (
+            (digests[0].hex(), digests[1].hex()) if digests else (None, None)
+        )
+        agora = datetime.now().isoformat(timespec="seconds")
+        projeto = gerador.config.get("projeto", {})
+
+        with self.conexao:
+            cursor = self.conexao.cursor()
+            cursor.execute(
+                "INSERT OR IGNORE INTO projetos (nome, criado_em) VALUES (?, ?)",
+                (nome_projeto, agora),
+            )
+            projeto_id = cursor.execute(
+                "SELECT id FROM projetos WHERE nome = ?", (nome_projeto,)
+            ).fetchone()["id"]
+
+            cursor.execute(
+                "DELETE FROM revisoes WHERE projeto_id = ? AND rotulo = ?",
+                (projeto_id, rotulo_revisao),
+            )
+            cursor.execute(
+                "INSERT INTO revisoes (projeto_id, rotulo, titulo, diretor, "
+                "digest_decupagem, digest_plano, importado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    projeto_id,
+                    rotulo_revisao,
+                    projeto.get("titulo"),
+                    projeto.get("diretor"),
+                    digest_decupagem,
+                    digest_plano,
+                    agora,
+                ),
+            )
+            revisao_id = cursor.lastrowid
+
+            for dia_str, dia_config in dias_filmagem.items():
+                cursor.execute(
+                    "INSERT INTO dias (revisao_id, numero, locacao_principal) "
+                    "VALUES (?, ?, ?)",
+                    (revisao_id, int(dia_str), dia_config.get("locacao_principal")),
+                )
+                dia_id = cursor.lastrowid
+                cursor.executemany(
+                    SQL_INSERIR_ITEM,
+                    [
+                        (dia_id, ordem, item["tipo"])
+                        + tuple(item.get(campo) for campo in CAMPOS_ITEM)
+                        for ordem, item in enumerate(dia_config["cronograma_completo"])
+                    ],
+                )
+
+            for numero, cena in gerador.dados_decupagem.items():
+                cursor.execute(
+                    "INSERT INTO cenas (revisao_id, numero, locacao, descricao, "
+                    "elenco, observacoes) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        revisao_id,
+                        numero,
+                        cena.get("locacao"),
+                        cena.get("descricao"),
+                        cena.get("elenco"),
+                        cena.get("observacoes"),
+                    ),
+                )
+                cena_id = cursor.lastrowid
+                cursor.executemany(
+                    "INSERT INTO planos (cena_id, ordem, planos, elenco, observacoes) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            cena_id,
+                            ordem,
+                            plano.get("planos"),
+                            plano.get("elenco"),
+                            plano.get("observacoes"),
+                        )
+                        for ordem, plano in enumerate(cena.get("planos", []))
+                    ],
+                )
+
+        print(
+            f"💾 Revisão '{rotulo_revisao}' de '{nome_projeto}' gravada no banco "
+            f"({len(dias_filmagem)} dias, {len(gerador.dados_decupagem)} cenas)"
+        )
+        return revisao_id
+
+    def listar_projetos(self):
+        """Lista projetos com a quantidade de revisões"""
+        linhas = self.conexao.execute(
+            "SELECT p.nome, COUNT(r.id) AS revisoes FROM projetos p "
+            "LEFT JOIN revisoes r ON r.projeto_id = p.id "
+            "GROUP BY p.id ORDER BY p.nome"
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def listar_revisoes(self, nome_projeto):
+        """Lista as revisões de um projeto, da mais recente para a mais antiga"""
+        linhas = self.conexao.execute(
+            "SELECT r.id, r.rotulo, r.titulo, r.importado_em, "
+            "(SELECT COUNT(*) FROM dias d WHERE d.revisao_id = r.id) AS total_dias "
+            "FROM revisoes r JOIN projetos p ON p.id = r.projeto_id "
+            "WHERE p.nome = ? ORDER BY r.importado_em DESC, r.id DESC",
+            (nome_projeto,),
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def buscar_revisao(self, nome_projeto, rotulo_revisao=None):
+        """Retorna o id da revisão pelo rótulo (ou a mais recente)"""
+        revisoes = self.listar_revisoes(nome_projeto)
+        for revisao in revisoes:
+            if rotulo_revisao is None or revisao["rotulo"] == rotulo_revisao:
+                return revisao["id"]
+        return None
+
+    def historico_cena(self, nome_projeto, numero_cena):
+        """Dias em que uma cena aparece em cada revisão do projeto"""
+        linhas = self.conexao.execute(
+            "SELECT r.rotulo, d.numero AS dia FROM itens_cronograma i "
+            "JOIN dias d ON d.id = i.dia_id "
+            "JOIN revisoes r ON r.id = d.revisao_id "
+            "JOIN projetos p ON p.id = r.projeto_id "
+            "WHERE p.nome = ? AND i.tipo = 'cena' AND i.numero = ? "
+            "ORDER BY r.importado_em, r.id, d.numero",
+            (nome_projeto, int(numero_cena)),
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def carregar_revisao(self, revisao_id, gerador):
+        """Preenche o gerador com os dados de uma revisão gravada"""
+        revisao = self.conexao.execute(
+            "SELECT titulo, diretor, digest_decupagem, digest_plano "
+            "FROM revisoes WHERE id = ?",
+            (revisao_id,),
+        ).fetchone()
+        if revisao is None:
+            print(f"❌ Revisão {revisao_id} não encontrada no banco")
+            return False
+
+        dados_decupagem = {}
+        cena_por_id = {}
+        for cena in self.conexao.execute(
+            "SELECT id, numero, locacao, descricao, elenco, observacoes "
+            "FROM cenas WHERE revisao_id = ? ORDER BY id",
+            (revisao_id,),
+        ):
+            dados_decupagem[cena["numero"]] = {
+                "locacao": cena["locacao"],
+                "descricao": cena["descricao"],
+                "elenco": cena["elenco"],
+                "observacoes": cena["observacoes"],
+                "planos": [],
+            }
+            cena_por_id[cena["id"]] = dados_decupagem[cena["numero"]]
+
+        for plano in self.conexao.execute(
+            "SELECT pl.cena_id, pl.planos, pl.elenco, pl.observacoes FROM planos pl "
+            "JOIN cenas c ON c.id = pl.cena_id WHERE c.revisao_id = ? "
+            "ORDER BY pl.cena_id, pl.ordem",
+            (revisao_id,),
+        ):
+            cena_por_id[plano["cena_id"]]["planos"].append(
+                {
+                    "planos": plano["planos"],
+                    "elenco": plano["elenco"],
+                    "observacoes": plano["observacoes"],
+                }
+            )
+
+        dias_filmagem = {}
+        dia_por_id = {}
+        for dia in self.conexao.execute(
+            "SELECT id, numero, locacao_principal FROM dias "
+            "WHERE revisao_id = ? ORDER BY id",
+            (revisao_id,),
+        ):
+            dia_config = {
+                "cronograma_completo": [],
+                "cenas": [],
+                "locacao_principal": dia["locacao_principal"],
+                "atividades_fixas": [],
+            }
+            dias_filmagem[str(dia["numero"])] = dia_config
+            dia_por_id[dia["id"]] = dia_config
+
+        for item in self.conexao.execute(SQL_ITENS_REVISAO, (revisao_id,)):
+            atividade = {"tipo": item["tipo"]}
+            for campo in CAMPOS_ITEM:
+                if item[campo] is not None:
+                    atividade[campo] = item[campo]
+
+            dia_config = dia_por_id[item["dia_id"]]
+            dia_config["cronograma_completo"].append(atividade)
+            if atividade["tipo"] == "cena":
+                dia_config["cenas"].append(str(atividade["numero"]))
+
+        config = {
+            "projeto": {
+                "titulo": revisao["titulo"],
+                "diretor": revisao["diretor"],
+                "total_dias": len(dias_filmagem),
+            },
+            "dias_filmagem": dias_filmagem,
+        }
+        digests = None
+        if revisao["digest_decupagem"] and revisao["digest_plano"]:
+            digests = (
+                bytes.fromhex(revisao["digest_decupagem"]),
+                bytes.fromhex(revisao["digest_plano"]),
+            )
+
+        # Mesmo caminho dos snapshots: o gerador deixa de acompanhar as
+        # fontes em disco até o próximo carregar_projeto()
+        with gerador._lock_carga:
+            gerador.restaurar_estado(
+                {
+                    "dados_decupagem": dados_decupagem,
+                    "config": config,
+                    "titulo_extraido": revisao["titulo"],
+                    "indices": {},
+                },
+                digests,
+            )
+            gerador._construir_indices()
+
+        print(
+            f"📂 Revisão {revisao_id} carregada do banco: "
+            f"{len(dados_decupagem)} cenas, {len(dias_filmagem)} dias"
+        )
+        return True
+
+
+def main(argv=None):
+    """Linha de comando do banco de projetos"""
+    parser = argparse.ArgumentParser(
+        description="Banco local de projetos e revisões do Gerador de OD"
+    )
+    parser.add_argument("--banco", default=ARQUIVO_BANCO_PADRAO, help="arquivo SQLite")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    importar = subparsers.add_parser(
+        "importar", help="lê arquivos/ e grava como revisão"
+    )
+    importar.add_argument("projeto")
+    importar.add_argument("revisao")
+
+    subparsers.add_parser("projetos", help="lista projetos")
+
+    revisoes = subparsers.add_parser("revisoes", help="lista revisões de um projeto")
+    revisoes.add_argument("projeto")
+
+    gerar = subparsers.add_parser("gerar", help="gera ODs de uma revisão gravada")
+    gerar.add_argument("projeto")
+    gerar.add_argument("dia", help="número do dia ou 'all'")
+    gerar.add_argument("--revisao", help="rótulo da revisão (padrão: mais recente)")
+
+    cena = subparsers.add_parser("cena", help="dias de uma cena em cada revisão")
+    cena.add_argument("projeto")
+    cena.add_argument("numero")
+
+    args = parser.parse_args(argv)
+
+    from gerador_od_completo import GeradorOD
+
+    with BancoProjetos(args.banco) as banco:
+        if args.comando == "importar":
+            gerador = GeradorOD()
+            if not gerador.carregar_projeto():
+                return 1
+            try:
+                banco.importar_gerador(gerador, args.projeto, args.revisao)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+
+        elif args.comando == "projetos":
+            for projeto in banco.listar_projetos():
+                print(f"{projeto['nome']} ({projeto['revisoes']} revisões)")
+
+        elif args.comando == "revisoes":
+            for revisao in banco.listar_revisoes(args.projeto):
+                print(
+                    f"{revisao['rotulo']:<20} {revisao['total_dias']:>3} dias  "
+                    f"{revisao['importado_em']}"
+                )
+
+        elif args.comando == "gerar":
+            todos = args.dia.lower() == "all"
+            if not todos and not args.dia.isdigit():
+                print(f"❌ Dia inválido: {args.dia} (use o número do dia ou 'all')")
+                return 1
+            revisao_id = banco.buscar_revisao(args.projeto, args.revisao)
+            if revisao_id is None:
+                print("❌ Revisão não encontrada")
+                return 1
+            gerador = GeradorOD()
+            if not banco.carregar_revisao(revisao_id, gerador):
+                return 1
+            if todos:
+                ok = gerador.renderizar_todas_ods()
+            else:
+                ok = gerador.renderizar_od_dia(int(args.dia))
+            return 0 if ok else 1
+
+        elif args.comando == "cena":
+            if not args.numero.isdigit():
+                print(f"❌ Cena inválida: {args.numero} (use o número da cena)")
+                return 1
+            for registro in banco.historico_cena(args.projeto, args.numero):
+                print(f"{registro['rotulo']:<20} Dia {registro['dia']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
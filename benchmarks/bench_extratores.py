@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos extratores de texto de PDF: páginas/s, pico de memória e
+conformidade do cronograma com o pdfplumber
+
+Uso:
+    python benchmarks/bench_extratores.py [pdf ...] [--repeticoes N] [--copias N]
+
+--copias repete as páginas de cada PDF (ex.: 100 cópias do plano de exemplo
+= 300 páginas) para conferir que a memória não cresce com o tamanho do plano.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extratores_pdf import EXTRATORES, EXTRATOR_PADRAO, HAS_PYPDF  # noqa: E402
+from gerador_od_completo import ARQUIVO_PLANO, GeradorOD  # noqa: E402
+from memoria_processo import formatar_mb, pico_rss_bytes  # noqa: E402
+
+
+def _multiplicar_paginas(arquivo_pdf, copias, pasta):
+    """Grava um PDF com as páginas do original repetidas `copias` vezes"""
+    import pypdf
+
+    leitor = pypdf.PdfReader(arquivo_pdf)
+    escritor = pypdf.PdfWriter()
+    for _ in range(copias):
+        for pagina in leitor.pages:
+            escritor.add_page(pagina)
+    destino = os.path.join(pasta, f"x{copias}_{os.path.basename(arquivo_pdf)}")
+    escritor.write(destino)
+    return destino
+
+
+def _cronograma(gerador, arquivo_pdf):
+    """Extrai as páginas e analisa as linhas, sem gravar arquivos de debug"""
+    paginas = gerador._extrair_paginas_pdf(arquivo_pdf)
+    linhas, _ = gerador._linhas_das_paginas(paginas)
+    cronograma, _ = gerador._analisar_linhas_plano(linhas)
+    return cronograma, len(paginas)
+
+
+def _medir(nome, arquivos, repeticoes):
+    """Retorna (páginas/s, pico de memória em MB, cronogramas) do extrator"""
+    gerador = GeradorOD(extrator_pdf=nome)
+
+    # Pico de memória numa passada à parte (tracemalloc distorce o tempo)
+    tracemalloc.start()
+    cronogramas = [_cronograma(gerador, arquivo)[0] for arquivo in arquivos]
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    paginas = 0
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for arquivo in arquivos:
+            paginas += _cronograma(gerador, arquivo)[1]
+    segundos = time.perf_counter() - inicio
+
+    return paginas / segundos, pico / (1024 * 1024), cronogramas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara os extratores de PDF")
+    parser.add_argument("pdfs", nargs="*", default=[ARQUIVO_PLANO])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--copias", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.copias > 1 and not HAS_PYPDF:
+        print("❌ --copias requer pypdf (pip install pypdf)")
+        return 1
+
+    nomes = [nome for nome in EXTRATORES if nome != "pypdf" or HAS_PYPDF]
+
+    with tempfile.TemporaryDirectory() as pasta:
+        pdfs = args.pdfs
+        if args.copias > 1:
+            pdfs = [_multiplicar_paginas(pdf, args.copias, pasta) for pdf in pdfs]
+
+        # Saída dos prints internos não interessa aqui
+        stdout_original = sys.stdout
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+        try:
+            resultados = {nome: _medir(nome, pdfs, args.repeticoes) for nome in nomes}
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout_original
+
+    referencia = resultados[EXTRATOR_PADRAO][2]
+    print(
+        f"📊 Extratores de PDF ({len(args.pdfs)} arquivo(s), {args.repeticoes} repetições)"
+    )
+    print(f"{'Extrator':<14}{'páginas/s':>12}{'pico MB':>10}{'cronograma':>14}")
+    for nome, (paginas_s, pico_mb, cronogramas) in resultados.items():
+        conforme = "✅ idêntico" if cronogramas == referencia else "❌ diferente"
+        print(f"{nome:<14}{paginas_s:>12.1f}{pico_mb:>10.1f}{conforme:>14}")
+    print(f"🧠 Pico de RSS do processo: {formatar_mb(pico_rss_bytes())}")
+    if not HAS_PYPDF:
+        print("⚠️ pypdf não instalado - backend ignorado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de partida a quente: snapshot binário x JSON de configuração
+
+Uso:
+    python benchmarks/bench_snapshot.py [repeticoes]
+"""
+
+import json
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from gerador_od_completo import GeradorOD  # noqa: E402
+from snapshot_projeto import calcular_digests_fontes, carregar_snapshot  # noqa: E402
+
+
+def _cronometrar(funcao, repeticoes):
+    """Retorna o tempo médio (ms) de execução da função"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    gerador = GeradorOD()
+
+    # Garante que snapshot e JSON existam antes de medir
+    if not gerador._carregar_dados():
+        print("❌ Não foi possível carregar o projeto de exemplo")
+        return 1
+
+    def carregar_json():
+        # Partida "a quente" sem snapshot: JSON + reconstrução da decupagem
+        with open(gerador.arquivo_config, "r", encoding="utf-8") as f:
+            gerador.config = json.load(f)
+        df = pd.read_csv(gerador.arquivo_decupagem, encoding="utf-8")
+        gerador._processar_decupagem(df)
+        gerador._construir_indices()
+
+    def carregar_snapshot_binario():
+        digests = calcular_digests_fontes(
+            gerador.arquivo_decupagem, gerador.arquivo_plano
+        )
+        dados = carregar_snapshot(gerador.arquivo_snapshot, digests)
+        assert dados is not None, "snapshot inválido"
+
+    # Saída dos prints internos não interessa aqui
+    stdout_original = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    try:
+        tempo_json = _cronometrar(carregar_json, repeticoes)
+        tempo_snapshot = _cronometrar(carregar_snapshot_binario, repeticoes)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout_original
+
+    tamanho_json = os.path.getsize(gerador.arquivo_config)
+    tamanho_snapshot = os.path.getsize(gerador.arquivo_snapshot)
+
+    print(f"📊 Partida a quente ({repeticoes} repetições)")
+    print(f"{'Método':<28}{'ms/carga':>12}{'bytes':>12}")
+    print(f"{'JSON + decupagem (pandas)':<28}{tempo_json:>12.2f}{tamanho_json:>12}")
+    print(f"{'Snapshot binário':<28}{tempo_snapshot:>12.2f}{tamanho_snapshot:>12}")
+    if tempo_snapshot > 0:
+        print(f"⚡ Ganho: {tempo_json / tempo_snapshot:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks ponta a ponta com baselines em JSON
+
+Mede cada etapa separadamente (decupagem, extração do PDF, análise do
+cronograma, gravação da configuração, montagem de um dia, gravação da planilha
+e gerar_todas_ods completo) em corpus sintéticos pequeno/medio/grande.
+
+Uso:
+    python benchmarks/suite.py run [--tamanhos pequeno medio] [--repeticoes 3]
+                                   [--saida benchmarks/baselines/referencia.json]
+    python benchmarks/suite.py compare BASELINE.json [ATUAL.json] [--limite 0.2]
+
+Sem ATUAL.json, o compare executa a suíte agora com os mesmos tamanhos e
+repetições da baseline. Sai com código 1 se alguma etapa regrediu além do
+limite (fração, padrão 20%).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_corpus import TAMANHOS, gerar_corpus  # noqa: E402
+from gerador_od_completo import GeradorOD  # noqa: E402
+
+VERSAO_RESULTADOS = 1
+SEMENTE_CORPUS = 1
+LIMITE_PADRAO = 0.20
+# Diferenças menores que isso são ruído de medição, não regressão
+MINIMO_MS_PADRAO = 2.0
+
+ETAPAS = [
+    "ler_decupagem",
+    "extrair_pdf",
+    "analisar_cronograma",
+    "gravar_config",
+    "montar_dia",
+    "salvar_planilha",
+    "gerar_todas_ods",
+]
+
+
+def _cronometrar(funcao, repeticoes, preparar=None):
+    """Executa a função `repeticoes` vezes e retorna os tempos em ms"""
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def medir_corpus(pasta, repeticoes):
+    """Mede todas as etapas sobre a pasta de projeto e retorna {etapa: tempos}"""
+    gerador = GeradorOD(pasta_projeto=pasta)
+    tempos = {}
+    estado = {}
+
+    tempos["ler_decupagem"] = _cronometrar(gerador._carregar_decupagem, repeticoes)
+
+    def extrair():
+        estado["paginas"] = gerador._extrair_paginas_pdf(gerador.arquivo_plano)
+
+    tempos["extrair_pdf"] = _cronometrar(extrair, repeticoes)
+
+    def analisar():
+        linhas, posicoes = gerador._linhas_das_paginas(estado["paginas"])
+        cronograma, _ = gerador._analisar_linhas_plano(linhas, posicoes)
+        gerador._criar_config_do_cronograma(cronograma)
+
+    tempos["analisar_cronograma"] = _cronometrar(analisar, repeticoes)
+    tempos["gravar_config"] = _cronometrar(gerador._gravar_config, repeticoes)
+
+    primeiro_dia = next(iter(gerador.config["dias_filmagem"]))
+
+    def montar():
+        estado["wb"] = gerador.montar_workbook_dia(primeiro_dia)
+
+    tempos["montar_dia"] = _cronometrar(montar, repeticoes)
+
+    arquivo_od = os.path.join(gerador.pasta_ods, "OD_benchmark.xlsx")
+    tempos["salvar_planilha"] = _cronometrar(
+        lambda: estado["wb"].save(arquivo_od), repeticoes
+    )
+
+    def limpar_caches():
+        # Execução fria: sem snapshot nem índice de diárias
+        for arquivo in (gerador.arquivo_snapshot, gerador.arquivo_indice_plano):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    tempos["gerar_todas_ods"] = _cronometrar(
+        lambda: GeradorOD(pasta_projeto=pasta).gerar_todas_ods(),
+        repeticoes,
+        preparar=limpar_caches,
+    )
+    return tempos
+
+
+def executar_suite(tamanhos, repeticoes, parametros_tamanho=None):
+    """Gera os corpus, mede as etapas e retorna o documento de resultados"""
+    parametros_tamanho = parametros_tamanho or TAMANHOS
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as pasta_base:
+        for tamanho in tamanhos:
+            pasta = os.path.join(pasta_base, tamanho)
+            corpus = gerar_corpus(
+                pasta, semente=SEMENTE_CORPUS, **parametros_tamanho[tamanho]
+            )
+
+            # Saída dos prints internos não interessa aqui
+            stdout_original = sys.stdout
+            sys.stdout = open(os.devnull, "w", encoding="utf-8")
+            try:
+                tempos = medir_corpus(pasta, repeticoes)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout_original
+
+            resultados[tamanho] = {
+                "corpus": {
+                    chave: corpus[chave]
+                    for chave in ("dias", "cenas", "planos", "paginas")
+                },
+                "etapas": {
+                    etapa: {
+                        "mediana_ms": round(statistics.median(valores), 3),
+                        "min_ms": round(min(valores), 3),
+                    }
+                    for etapa, valores in tempos.items()
+                },
+            }
+            print(f"✅ {tamanho}: {corpus['paginas']} páginas, {corpus['cenas']} cenas")
+
+    return {
+        "versao": VERSAO_RESULTADOS,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "extrator_pdf": os.environ.get("OD_EXTRATOR_PDF", "pdfplumber"),
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def comparar(baseline, atual, limite=LIMITE_PADRAO, minimo_ms=MINIMO_MS_PADRAO):
+    """Compara medianas e retorna [(tamanho, etapa, base, atual, variação, regrediu)]"""
+    linhas = []
+    for tamanho, dados_base in baseline["resultados"].items():
+        dados_atual = atual["resultados"].get(tamanho)
+        if not dados_atual:
+            continue
+        for etapa, medida_base in dados_base["etapas"].items():
+            medida_atual = dados_atual["etapas"].get(etapa)
+            if not medida_atual:
+                continue
+            base = medida_base["mediana_ms"]
+            agora = medida_atual["mediana_ms"]
+            variacao = (agora - base) / base if base else 0.0
+            regrediu = variacao > limite and agora - base > minimo_ms
+            linhas.append((tamanho, etapa, base, agora, variacao, regrediu))
+    return linhas
+
+
+def imprimir_resultados(documento):
+    """Tabela de medianas por tamanho e etapa"""
+    for tamanho, dados in documento["resultados"].items():
+        corpus = dados["corpus"]
+        print(
+            f"\n📊 {tamanho} ({corpus['dias']} dias, {corpus['cenas']} cenas, "
+            f"{corpus['paginas']} páginas)"
+        )
+        print(f"{'Etapa':<22}{'mediana ms':>12}{'mín ms':>12}")
+        for etapa, medida in dados["etapas"].items():
+            print(f"{etapa:<22}{medida['mediana_ms']:>12.1f}{medida['min_ms']:>12.1f}")
+
+
+def imprimir_comparacao(linhas, limite):
+    """Tabela da comparação, marcando regressões"""
+    print(f"\n{'Tamanho':<10}{'Etapa':<22}{'base ms':>11}{'atual ms':>11}{'var.':>9}")
+    for tamanho, etapa, base, agora, variacao, regrediu in linhas:
+        marca = "  ⚠️ REGRESSÃO" if regrediu else ""
+        print(
+            f"{tamanho:<10}{etapa:<22}{base:>11.1f}{agora:>11.1f}"
+            f"{variacao:>+9.0%}{marca}"
+        )
+    regressoes = sum(1 for linha in linhas if linha[5])
+    if regressoes:
+        print(f"\n❌ {regressoes} etapa(s) mais lentas que o limite de {limite:.0%}")
+    else:
+        print(f"\n✅ Nenhuma regressão acima de {limite:.0%}")
+    return regressoes
+
+
+def _ler_json(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_json(caminho, documento):
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(documento, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em {caminho}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do GeradorOD")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    run = comandos.add_parser("run", help="executa a suíte")
+    run.add_argument("--tamanhos", nargs="+", choices=TAMANHOS, default=list(TAMANHOS))
+    run.add_argument("--repeticoes", type=int, default=3)
+    run.add_argument("--saida", help="grava os resultados (baseline) neste JSON")
+
+    compare = comandos.add_parser("compare", help="compara com uma baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("atual", nargs="?", help="resultados já medidos (JSON)")
+    compare.add_argument("--limite", type=float, default=LIMITE_PADRAO)
+    compare.add_argument("--minimo-ms", type=float, default=MINIMO_MS_PADRAO)
+    compare.add_argument("--saida", help="grava os resultados atuais neste JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "run":
+        documento = executar_suite(args.tamanhos, args.repeticoes)
+        imprimir_resultados(documento)
+        if args.saida:
+            _gravar_json(args.saida, documento)
+        return 0
+
+    baseline = _ler_json(args.baseline)
+    if args.atual:
+        atual = _ler_json(args.atual)
+    else:
+        atual = executar_suite(list(baseline["resultados"]), baseline["repeticoes"])
+        if args.saida:
+            _gravar_json(args.saida, atual)
+
+    linhas = comparar(baseline, atual, args.limite, args.minimo_ms)
+    return 1 if imprimir_comparacao(linhas, args.limite) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
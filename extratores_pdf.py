@@ -0,0 +1,232 @@
+"""
+Extratores de Texto do Plano de Filmagem
+Backends intercambiáveis para extrair o texto de cada página do PDF:
+pdfplumber (padrão), pdfminer.six direto e pypdf
+
+O extrator é escolhido pelo parâmetro `extrator_pdf` do GeradorOD ou pela
+variável de ambiente OD_EXTRATOR_PDF. Todos devolvem o texto no formato do
+pdfplumber (linhas agrupadas pela altura, palavras separadas por um espaço),
+para que o cronograma extraído seja o mesmo com qualquer backend.
+"""
+
+import os
+
+try:
+    import pypdf
+
+    HAS_PYPDF = True
+except ImportError:
+    HAS_PYPDF = False
+
+EXTRATOR_PADRAO = "pdfplumber"
+VARIAVEL_EXTRATOR = "OD_EXTRATOR_PDF"
+
+# Mesmas tolerâncias padrão do pdfplumber (em pontos)
+TOLERANCIA_X = 3
+TOLERANCIA_Y = 3
+
+
+def montar_texto(fragmentos, tolerancia_x=TOLERANCIA_X, tolerancia_y=TOLERANCIA_Y):
+    """Monta o texto de uma página a partir de fragmentos posicionados
+
+    Cada fragmento é (x0, x1, topo, texto). Fragmentos cujo topo fica a até
+    `tolerancia_y` do anterior formam uma linha; dentro dela, fragmentos
+    separados por até `tolerancia_x` continuam a mesma palavra. Com x1 None
+    (largura desconhecida) o fragmento nunca é colado ao seguinte.
+    """
+    linhas = []
+    topo_anterior = None
+    for fragmento in sorted(fragmentos, key=lambda f: f[2]):
+        if linhas and fragmento[2] - topo_anterior <= tolerancia_y:
+            linhas[-1].append(fragmento)
+        else:
+            linhas.append([fragmento])
+        topo_anterior = fragmento[2]
+
+    texto = []
+    for linha in linhas:
+        palavras = []
+        colar = False
+        fim = None
+        for x0, x1, _, conteudo in sorted(linha, key=lambda f: f[0]):
+            partes = conteudo.split()
+            if not partes:
+                colar = False
+                continue
+            if colar and not conteudo[0].isspace() and x0 - fim <= tolerancia_x:
+                palavras[-1] += partes.pop(0)
+            palavras.extend(partes)
+            colar = x1 is not None and not conteudo[-1].isspace()
+            fim = x1
+        texto.append(" ".join(palavras))
+    return "\n".join(texto)
+
+
+class ExtratorPDF:
+    """Interface dos extratores: abre o PDF e extrai o texto de uma página por vez"""
+
+    nome = ""
+
+    def abrir(self, arquivo_pdf):
+        """Abre o PDF e retorna o documento do backend"""
+        raise NotImplementedError
+
+    def total_paginas(self, documento):
+        """Número de páginas do documento"""
+        raise NotImplementedError
+
+    def texto_pagina(self, documento, indice):
+        """Texto da página `indice` (base 0), ou None se ela não tem texto
+
+        Objetos de layout da página não devem sobreviver à chamada: a memória
+        precisa ficar estável mesmo em planos com centenas de páginas.
+        """
+        raise NotImplementedError
+
+    def fechar(self, documento):
+        """Libera os recursos do documento"""
+
+
+class ExtratorPdfplumber(ExtratorPDF):
+    """pdfplumber: referência de formato, mais lento"""
+
+    nome = "pdfplumber"
+
+    def abrir(self, arquivo_pdf):
+        import pdfplumber
+
+        return pdfplumber.open(arquivo_pdf)
+
+    def total_paginas(self, documento):
+        return len(documento.pages)
+
+    def texto_pagina(self, documento, indice):
+        pagina = documento.pages[indice]
+        try:
+            return pagina.extract_text()
+        finally:
+            # Sem isso cada página mantém chars/rects/layout até o PDF fechar
+            liberar = getattr(pagina, "close", None) or getattr(
+                pagina, "flush_cache", None
+            )
+            if liberar is not None:
+                liberar()
+
+    def fechar(self, documento):
+        documento.close()
+
+
+class _DocumentoPdfminer:
+    """Estado do pdfminer para um PDF aberto"""
+
+    def __init__(self, arquivo_pdf, laparams):
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        self.arquivo = open(arquivo_pdf, "rb")
+        try:
+            self.paginas = list(PDFPage.get_pages(self.arquivo))
+        except Exception:
+            self.arquivo.close()
+            raise
+        recursos = PDFResourceManager(caching=True)
+        self.dispositivo = PDFPageAggregator(recursos, laparams=laparams)
+        self.interpretador = PDFPageInterpreter(recursos, self.dispositivo)
+
+
+class ExtratorPdfminer(ExtratorPDF):
+    """pdfminer.six direto, sem os objetos de página do pdfplumber
+
+    Por padrão a análise de layout fica desligada (laparams=None): as caixas
+    de texto do LAParams quebram as linhas da tabela do plano, e as linhas
+    são remontadas a partir dos caracteres de qualquer forma.
+    """
+
+    nome = "pdfminer"
+
+    def __init__(self, laparams=None):
+        self.laparams = laparams
+
+    def abrir(self, arquivo_pdf):
+        return _DocumentoPdfminer(arquivo_pdf, self.laparams)
+
+    def total_paginas(self, documento):
+        return len(documento.paginas)
+
+    def texto_pagina(self, documento, indice):
+        from pdfminer.layout import LTChar, LTContainer
+
+        documento.interpretador.process_page(documento.paginas[indice])
+        layout = documento.dispositivo.get_result()
+
+        fragmentos = []
+        pendentes = [layout]
+        while pendentes:
+            for objeto in pendentes.pop():
+                if isinstance(objeto, LTChar):
+                    fragmentos.append(
+                        (objeto.x0, objeto.x1, layout.y1 - objeto.y1, objeto.get_text())
+                    )
+                elif isinstance(objeto, LTContainer):
+                    pendentes.append(objeto)
+        return montar_texto(fragmentos) or None
+
+    def fechar(self, documento):
+        documento.arquivo.close()
+
+
+class ExtratorPypdf(ExtratorPDF):
+    """pypdf: trechos de texto com a posição de início, sem caracteres"""
+
+    nome = "pypdf"
+
+    def abrir(self, arquivo_pdf):
+        if not HAS_PYPDF:
+            raise RuntimeError(
+                "Módulo 'pypdf' não encontrado! Execute: pip install pypdf"
+            )
+        return pypdf.PdfReader(arquivo_pdf)
+
+    def total_paginas(self, documento):
+        return len(documento.pages)
+
+    def texto_pagina(self, documento, indice):
+        pagina = documento.pages[indice]
+        topo_pagina = float(pagina.mediabox.top)
+        fragmentos = []
+
+        def visitar(texto, cm, tm, fonte, tamanho):
+            if not texto.strip():
+                return
+            x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+            y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+            # Topo da caixa do glifo, como no pdfminer: base + descida + tamanho
+            tamanho = tamanho * tm[3] * cm[3]
+            descida = 0.0
+            if fonte is not None and "/FontDescriptor" in fonte:
+                descritor = fonte["/FontDescriptor"].get_object()
+                descida = float(descritor.get("/Descent", 0))
+            topo = topo_pagina - (y + descida * tamanho / 1000 + tamanho)
+            fragmentos.append((x, None, topo, texto))
+
+        pagina.extract_text(visitor_text=visitar)
+        return montar_texto(fragmentos) or None
+
+
+EXTRATORES = {
+    ExtratorPdfplumber.nome: ExtratorPdfplumber,
+    ExtratorPdfminer.nome: ExtratorPdfminer,
+    ExtratorPypdf.nome: ExtratorPypdf,
+}
+
+
+def criar_extrator(nome=None):
+    """Cria o extrator pelo nome (padrão: OD_EXTRATOR_PDF ou pdfplumber)"""
+    nome = nome or os.environ.get(VARIAVEL_EXTRATOR) or EXTRATOR_PADRAO
+    if nome not in EXTRATORES:
+        raise ValueError(
+            f"Extrator de PDF desconhecido: {nome} "
+            f"(disponíveis: {', '.join(EXTRATORES)})"
+        )
+    return EXTRATORES[nome]()
@@ -0,0 +1,295 @@
+"""
+Geração Paralela de Dias
+Distribui os dias de um projeto já carregado entre processos de trabalho e
+avisa o status de cada dia (na fila, renderizando, gravando, concluído,
+falhou) com o tempo decorrido, para a interface mostrar uma linha por dia.
+
+PoolGeracao mantém os processos vivos entre gerações (a interface cria um
+por janela): pandas/openpyxl são importados uma vez por processo e o estado
+do projeto só é relido quando muda.
+"""
+
+import itertools
+import marshal
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from progresso_od import GeracaoCancelada
+
+STATUS_NA_FILA = "na_fila"
+STATUS_RENDERIZANDO = "renderizando"
+STATUS_GRAVANDO = "gravando"
+STATUS_CONCLUIDO = "concluido"
+STATUS_FALHOU = "falhou"
+STATUS_CANCELADO = "cancelado"
+
+# Etapas das métricas do gerador que marcam a mudança de status de um dia
+STATUS_POR_ETAPA = {
+    "renderizar_dia": STATUS_RENDERIZANDO,
+    "salvar_xlsx": STATUS_GRAVANDO,
+}
+
+INTERVALO_ESPERA = 0.05  # segundos entre repasses de status no processo principal
+MAX_DIAS_NO_PROCESSO = 2  # até aqui subir processos custa mais que gerar direto
+
+# Estado do processo de trabalho (preenchido por _iniciar_processo)
+_gerador_processo = None
+_observador_processo = None
+_versao_estado_processo = None
+
+
+def workers_por_nucleos(nucleos=None):
+    """Processos que cabem na máquina: um núcleo fica livre para a interface"""
+    nucleos = nucleos or os.cpu_count() or 1
+    return max(1, nucleos - 1)
+
+
+def workers_padrao(total_dias, nucleos=None):
+    """Processos para `total_dias` dias (nunca mais que workers_por_nucleos)"""
+    return max(1, min(total_dias, workers_por_nucleos(nucleos)))
+
+
+class _ObservadorStatus:
+    """Observador das métricas: converte etapas do gerador em status do dia"""
+
+    def __init__(self, avisar):
+        self.avisar = avisar
+        self.dia = None
+        self.inicio = None
+
+    def ms(self):
+        return int((time.perf_counter() - self.inicio) * 1000)
+
+    @contextmanager
+    def span(self, nome, **args):
+        status = STATUS_POR_ETAPA.get(nome)
+        if status and self.dia is not None:
+            self.avisar(self.dia, status, self.ms())
+        yield
+
+
+def _gerar_dia(gerador, observador, dia):
+    """Gera a OD de um dia; retorna o resultado com o tempo em ms"""
+    observador.dia = dia
+    observador.inicio = time.perf_counter()
+    resultado = {"dia": dia, "sucesso": False, "erro": None, "ms": 0}
+    try:
+        resultado["sucesso"] = bool(gerador.renderizar_od_dia(int(dia)))
+        if not resultado["sucesso"]:
+            resultado["erro"] = "falha na geração"
+    except GeracaoCancelada:
+        raise
+    except Exception as e:
+        resultado["erro"] = str(e)
+    finally:
+        resultado["ms"] = observador.ms()
+        observador.dia = None
+    return resultado
+
+
+def _iniciar_processo(classe_gerador, pasta_projeto, fila):
+    """Inicializador do processo de trabalho (uma vez por processo)"""
+    global _gerador_processo, _observador_processo
+    _gerador_processo = classe_gerador(pasta_projeto=pasta_projeto)
+    _observador_processo = _ObservadorStatus(lambda *evento: fila.put(evento))
+    _gerador_processo.metricas.observadores.append(_observador_processo)
+
+
+def _gerar_dia_no_processo(versao, arquivo_estado, dia):
+    """Tarefa do processo de trabalho: relê o estado só se ele mudou"""
+    global _versao_estado_processo
+    if _versao_estado_processo != versao:
+        with open(arquivo_estado, "rb") as f:
+            _gerador_processo.restaurar_estado(marshal.load(f))
+        _versao_estado_processo = versao
+    return _gerar_dia(_gerador_processo, _observador_processo, dia)
+
+
+def _repassar_status(fila, avisar, finalizados):
+    """Entrega os status vindos dos processos (ignora dias já finalizados)"""
+    while True:
+        try:
+            dia, status, ms = fila.get_nowait()
+        except queue.Empty:
+            return
+        if dia not in finalizados:
+            avisar(dia, status, ms)
+
+
+class PoolGeracao:
+    """Processos de trabalho reaproveitados entre chamadas de gerar_dias_em_paralelo
+
+    Criados no primeiro uso paralelo. A cada geração o estado do projeto é
+    gravado uma vez num arquivo do cache, e só se mudou desde a anterior
+    (cada carga monta dicionários novos, então basta comparar identidade).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(1, workers or workers_por_nucleos())
+        self._executor = None
+        self._fila = None
+        self._origem = None  # (classe, pasta) dos geradores dos processos
+        self._estado = None  # objetos do estado gravado (mantidos vivos)
+        self._arquivo_estado = None
+        self._versoes = itertools.count(1)
+        self._versao = None
+        self._lock = threading.Lock()
+
+    def preparar(self, gerador):
+        """Garante os processos e o estado de `gerador`; retorna a tarefa base"""
+        origem = (type(gerador), gerador.pasta_projeto)
+        if self._executor is not None and self._origem != origem:
+            self.fechar()
+        if self._executor is None:
+            self._fila = multiprocessing.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_iniciar_processo,
+                initargs=(origem[0], origem[1], self._fila),
+            )
+            self._origem = origem
+            self._estado = None
+
+        estado = gerador._dados_snapshot()
+        if self._estado is None or any(
+            estado[chave] is not self._estado[chave] for chave in estado
+        ):
+            self._gravar_estado(gerador, estado)
+        return self._versao, self._arquivo_estado
+
+    def _gravar_estado(self, gerador, estado):
+        anterior = self._arquivo_estado
+        self._versao = next(self._versoes)
+        os.makedirs(gerador.pasta_cache, exist_ok=True)
+        self._arquivo_estado = os.path.join(
+            gerador.pasta_cache, f"estado_geracao_{os.getpid()}_{self._versao}.bin"
+        )
+        with open(self._arquivo_estado, "wb") as f:
+            marshal.dump(estado, f)
+        self._estado = estado
+        if anterior:
+            _remover(anterior)
+
+    def fechar(self):
+        """Encerra os processos (dias na fila são descartados)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._fila is not None:
+            self._fila.close()
+            self._fila = None
+        if self._arquivo_estado:
+            _remover(self._arquivo_estado)
+            self._arquivo_estado = None
+        self._estado = None
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+
+def gerar_dias_em_paralelo(
+    gerador, dias, workers=None, ao_status=None, cancelamento=None, pool=None
+):
+    """Gera as ODs de `dias` a partir do projeto carregado em `gerador`
+
+    Retorna os resultados ({dia, sucesso, erro, ms}) na ordem de `dias`,
+    independente da ordem de conclusão; dias cancelados antes de começar
+    ficam de fora. `ao_status(dia, status, ms)` é chamado na thread que
+    chamou esta função. Com workers=1 ou até MAX_DIAS_NO_PROCESSO dias tudo
+    roda no processo atual; nos processos de trabalho (de `pool`, ou de um
+    pool temporário) o cancelamento só descarta os dias ainda na fila (os
+    que já começaram terminam, com gravação atômica).
+    """
+    dias = [str(dia) for dia in dias]
+    avisar = ao_status or (lambda dia, status, ms: None)
+    if workers is None:
+        workers = pool.workers if pool is not None else workers_padrao(len(dias))
+    workers = max(1, workers)
+
+    for dia in dias:
+        avisar(dia, STATUS_NA_FILA, None)
+
+    resultados = {}
+    if workers == 1 or len(dias) <= MAX_DIAS_NO_PROCESSO:
+        observador = _ObservadorStatus(avisar)
+        gerador.metricas.observadores.append(observador)
+        try:
+            for dia in dias:
+                try:
+                    resultados[dia] = _gerar_dia(gerador, observador, dia)
+                except GeracaoCancelada:
+                    break
+                _avisar_fim(avisar, resultados[dia])
+        finally:
+            gerador.metricas.observadores.remove(observador)
+    elif pool is not None:
+        with pool._lock:
+            _gerar_em_processos(gerador, dias, pool, avisar, cancelamento, resultados)
+    else:
+        pool = PoolGeracao(workers)
+        try:
+            _gerar_em_processos(gerador, dias, pool, avisar, cancelamento, resultados)
+        finally:
+            pool.fechar()
+
+    for dia in dias:
+        if dia not in resultados:
+            avisar(dia, STATUS_CANCELADO, None)
+    return [resultados[dia] for dia in dias if dia in resultados]
+
+
+def _avisar_fim(avisar, resultado):
+    status = STATUS_CONCLUIDO if resultado["sucesso"] else STATUS_FALHOU
+    avisar(resultado["dia"], status, resultado["ms"])
+
+
+def _gerar_em_processos(gerador, dias, pool, avisar, cancelamento, resultados):
+    """Distribui os dias no pool; o status final de cada dia sai daqui"""
+    versao, arquivo_estado = pool.preparar(gerador)
+    fila = pool._fila
+    _repassar_status(fila, lambda *evento: None, set())  # restos de outra geração
+    finalizados = set()
+    quebrado = False
+    futuros = {
+        pool._executor.submit(_gerar_dia_no_processo, versao, arquivo_estado, dia): dia
+        for dia in dias
+    }
+    pendentes = set(futuros)
+    while pendentes:
+        if cancelamento is not None and cancelamento.cancelado:
+            for futuro in pendentes:
+                futuro.cancel()
+        feitos, pendentes = wait(
+            pendentes, timeout=INTERVALO_ESPERA, return_when=FIRST_COMPLETED
+        )
+        _repassar_status(fila, avisar, finalizados)
+        for futuro in feitos:
+            if futuro.cancelled():
+                continue
+            dia = futuros[futuro]
+            try:
+                resultados[dia] = futuro.result()
+            except Exception as e:
+                quebrado = quebrado or isinstance(e, BrokenProcessPool)
+                resultados[dia] = {
+                    "dia": dia,
+                    "sucesso": False,
+                    "erro": f"processo de trabalho falhou: {e}",
+                    "ms": 0,
+                }
+            finalizados.add(dia)
+            _avisar_fim(avisar, resultados[dia])
+
+    # Um processo morto inutiliza o executor: o próximo uso cria outro
+    if quebrado:
+        pool.fechar()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Gerador de Corpus Sintético
+Cria pastas de projeto (arquivos/PLANO_FINAL.pdf + arquivos/DECUPAGEM.csv) no
+formato das produções reais, em tamanhos configuráveis, para benchmarks
+
+O PDF segue a mesma gramática de linhas que o GeradorOD lê (cabeçalho
+"DIÁRIA n:", atividades com horário, cenas "n INT|EXT ...", descrição com
+"Elenco:", "REC:" e "Fim do Dia"). A mesma semente gera os mesmos bytes.
+
+Uso:
+    python gerador_corpus.py PASTA [--tamanho pequeno|medio|grande] [--semente N]
+                             [--dias N] [--cenas-por-dia N] [--planos-por-cena N]
+                             [--elenco N]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+# Tamanhos de referência usados pelos benchmarks
+TAMANHOS = {
+    "pequeno": {"dias": 5, "cenas_por_dia": 4, "planos_por_cena": 4, "elenco": 6},
+    "medio": {"dias": 30, "cenas_por_dia": 6, "planos_por_cena": 6, "elenco": 15},
+    "grande": {"dias": 120, "cenas_por_dia": 8, "planos_por_cena": 8, "elenco": 40},
+}
+
+CABECALHO_DECUPAGEM = [
+    "DIA CRONOLOGICO",
+    "CENA",
+    "PLANOS",
+    "DESCRIÇÃO CENA",
+    "ELENCO",
+    "LOCAÇÃO / SET",
+    "OBSERVAÇÕES CONTITNUIDADE",
+]
+
+NOMES = [
+    "Eliéser", "Maria", "Lauro", "Joana", "Tião", "Dora", "Célia", "Raul",
+    "Bento", "Lúcia", "Otávio", "Inês", "Caio", "Rosa", "Álvaro", "Nina",
+]  # fmt: skip
+LOCACOES = [
+    "CASA ELIÉSER", "ESCOLA", "PADARIA", "PRAÇA", "HOSPITAL", "RODOVIÁRIA",
+    "FAZENDA", "ESTÚDIO", "BAR DO TIÃO", "IGREJA",
+]  # fmt: skip
+SETS = [
+    "QUARTO", "COZINHA", "SALA", "CORREDOR", "QUINTAL", "FACHADA",
+    "BANHEIRO", "RECEPÇÃO", "ESCRITÓRIO", "VARANDA",
+]  # fmt: skip
+ACOES = [
+    "conversa com", "espera por", "discute com", "observa", "abraça",
+    "procura", "despede-se de", "encontra",
+]  # fmt: skip
+ENQUADRAMENTOS = [
+    "PLANO GERAL", "PLANO MÉDIO", "CLOSE", "DETALHE", "PD", "CONTRAPLANO",
+    "PLANO CONJUNTO", "TRAVELLING",
+]  # fmt: skip
+OBSERVACOES = [
+    "Figurino do dia anterior", "Chuva na janela", "Relógio marcando 6h00",
+    "Copo pela metade", "Luz do fim de tarde", "Cama desarrumada",
+]  # fmt: skip
+PERIODOS = ["DIA", "NOITE", "MANHÃ", "TARDE"]
+DIAS_SEMANA = [
+    "Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira",
+    "Sexta-feira", "Sábado", "Domingo",
+]  # fmt: skip
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho",
+    "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+]  # fmt: skip
+
+# Layout das páginas do PDF (pontos, A4)
+LARGURA_PAGINA = 595
+ALTURA_PAGINA = 842
+MARGEM = 40
+ENTRELINHA = 14
+TAMANHO_FONTE = 9
+TAMANHO_TITULO = 16
+
+
+def _gerar_cenas(rng, total_cenas, planos_por_cena, elenco):
+    """Cria os dados de decupagem de cada cena"""
+    nomes = [
+        NOMES[i % len(NOMES)] + ("" if i < len(NOMES) else f" {i // len(NOMES) + 1}")
+        for i in range(elenco)
+    ]
+    cenas = {}
+    for numero in range(1, total_cenas + 1):
+        ids = sorted(rng.sample(range(1, elenco + 1), rng.randint(1, min(3, elenco))))
+        locacao = rng.choice(LOCACOES)
+        set_ = rng.choice(SETS)
+        personagem = nomes[ids[0] - 1]
+        alvo = nomes[ids[-1] - 1] if len(ids) > 1 else "a cidade"
+        cenas[numero] = {
+            "ambiente": rng.choice(["INT", "EXT"]),
+            "set": set_,
+            "locacao": locacao,
+            "periodo": rng.choice(PERIODOS),
+            "descricao": f"{personagem} {rng.choice(ACOES)} {alvo}",
+            "elenco_ids": ids,
+            "elenco_nomes": [nomes[i - 1] for i in ids],
+            "observacoes": rng.choice(OBSERVACOES),
+            "planos": [
+                f"{numero}{'' if p == 0 else f'.{p}'} - {rng.choice(ENQUADRAMENTOS)} "
+                f"{set_}"
+                for p in range(planos_por_cena)
+            ],
+            "tempo": f"{rng.randint(0, 2)}:{rng.choice(['00', '15', '30', '45'])}",
+            "paginas": f"{rng.randint(1, 7)}/8",
+        }
+    return cenas
+
+
+def _linhas_plano(rng, titulo, cenas, cenas_por_dia, inicio):
+    """Linhas do plano de filmagem: [(negrito, tamanho, texto)]"""
+    linhas = [
+        (True, TAMANHO_TITULO, titulo),
+        (False, TAMANHO_FONTE, f"PLANO DE FILMAGEM - ATUALIZADO: {inicio:%d/%m/%Y}"),
+    ]
+    for indice, (dia, numeros) in enumerate(cenas_por_dia.items()):
+        data = inicio + timedelta(days=indice)
+        metade = (len(numeros) + 1) // 2
+
+        def linhas_cenas(trecho):
+            for numero in trecho:
+                cena = cenas[numero]
+                elenco = ", ".join(str(i) for i in cena["elenco_ids"])
+                yield (
+                    False,
+                    TAMANHO_FONTE,
+                    f"{numero} {cena['ambiente']} {cena['set']} {cena['locacao']} "
+                    f"Tempo estimado: {cena['tempo']} {cena['paginas']}",
+                )
+                yield (
+                    False,
+                    TAMANHO_FONTE,
+                    f"{cena['periodo']} {cena['descricao']}. Elenco: {elenco} "
+                    f"{cena['locacao']} pgs.",
+                )
+                if rng.random() < 0.15:
+                    yield (
+                        False,
+                        TAMANHO_FONTE,
+                        f"REC: {numero}B - PASSAGEM DE TEMPO {cena['set']} 0:30",
+                    )
+
+        linhas.append(
+            (True, TAMANHO_FONTE, f"DIÁRIA {dia:02d}: {data:%d/%m} - 07h á 18h")
+        )
+        linhas.append((False, TAMANHO_FONTE, "07h00 - 07h30 CAFÉ DA MANHÃ :30"))
+        linhas.append((False, TAMANHO_FONTE, "07h30 - 09h00 - PREPARAÇÃO 01 1:30"))
+        linhas.extend(linhas_cenas(numeros[:metade]))
+        linhas.append((False, TAMANHO_FONTE, "12h00 - 13h00 - REFEIÇÃO 1:00"))
+        linhas.append((False, TAMANHO_FONTE, "13h00 - 14h00 - PREPARAÇÃO 02 1:00"))
+        linhas.extend(linhas_cenas(numeros[metade:]))
+        linhas.append((False, TAMANHO_FONTE, "17h00 - 18h00 DESPRODUÇÃO 1:00"))
+        linhas.append(
+            (
+                True,
+                TAMANHO_FONTE,
+                f"Fim do Dia # {dia}-- {DIAS_SEMANA[data.weekday()]}, {data.day} de "
+                f"{MESES[data.month - 1]} de {data.year} -- Total Págs.: "
+                f"{len(numeros)}",
+            )
+        )
+    return linhas
+
+
+def _texto_pdf(texto):
+    """String literal do PDF em WinAnsiEncoding"""
+    dados = texto.encode("cp1252", errors="replace")
+    dados = dados.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + dados + b")"
+
+
+def _paginar(linhas):
+    """Distribui as linhas em páginas e monta o conteúdo de cada uma"""
+    paginas = []
+    conteudo = []
+    y = ALTURA_PAGINA - MARGEM
+    for negrito, tamanho, texto in linhas:
+        if y < MARGEM:
+            paginas.append(b"".join(conteudo))
+            conteudo = []
+            y = ALTURA_PAGINA - MARGEM
+        fonte = b"/F2" if negrito else b"/F1"
+        conteudo.append(
+            b"BT %s %d Tf %d %d Td %s Tj ET\n"
+            % (fonte, tamanho, MARGEM, y, _texto_pdf(texto))
+        )
+        y -= ENTRELINHA + (tamanho - TAMANHO_FONTE)
+    if conteudo:
+        paginas.append(b"".join(conteudo))
+    return paginas
+
+
+def escrever_pdf(caminho, linhas):
+    """Grava um PDF mínimo (Helvetica, sem compressão) e retorna o nº de páginas"""
+    paginas = _paginar(linhas)
+    kids = " ".join(f"{5 + 2 * i} 0 R" for i in range(len(paginas)))
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(paginas)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    for i, conteudo in enumerate(paginas):
+        objetos.append(
+            f"<< /Type /Page /Parent 2 0 R "
+            f"/MediaBox [0 0 {LARGURA_PAGINA} {ALTURA_PAGINA}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+            f"/Contents {6 + 2 * i} 0 R >>".encode()
+        )
+        objetos.append(
+            b"<< /Length %d >>\nstream\n%sendstream" % (len(conteudo), conteudo)
+        )
+
+    saida = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    posicoes = []
+    for numero, objeto in enumerate(objetos, 1):
+        posicoes.append(len(saida))
+        saida += b"%d 0 obj\n%s\nendobj\n" % (numero, objeto)
+
+    inicio_xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    for posicao in posicoes:
+        saida += b"%010d 00000 n \n" % posicao
+    saida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objetos) + 1,
+        inicio_xref,
+    )
+
+    with open(caminho, "wb") as f:
+        f.write(saida)
+    return len(paginas)
+
+
+def escrever_decupagem(caminho, cenas):
+    """Grava a DECUPAGEM.csv: uma linha por cena e uma por plano adicional"""
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f, lineterminator="\n")
+        escritor.writerow(CABECALHO_DECUPAGEM)
+        for numero, cena in cenas.items():
+            escritor.writerow(
+                [
+                    f"DIA {numero % 7 + 1}",
+                    numero,
+                    cena["planos"][0] if cena["planos"] else "",
+                    f"{cena['descricao']}.",
+                    " / ".join(cena["elenco_nomes"]),
+                    f"{cena['locacao']} / {cena['set']}",
+                    cena["observacoes"],
+                ]
+            )
+            for plano in cena["planos"][1:]:
+                escritor.writerow(["", "", plano, "", "", "", ""])
+
+
+def gerar_corpus(
+    pasta,
+    dias=5,
+    cenas_por_dia=4,
+    planos_por_cena=4,
+    elenco=6,
+    semente=0,
+    titulo="CORPUS SINTÉTICO",
+):
+    """Gera a pasta de projeto e retorna um resumo do que foi criado"""
+    if min(dias, cenas_por_dia, planos_por_cena, elenco) < 1:
+        raise ValueError("Todos os tamanhos do corpus devem ser maiores que zero")
+
+    rng = random.Random(semente)
+    total_cenas = dias * cenas_por_dia
+    cenas = _gerar_cenas(rng, total_cenas, planos_por_cena, elenco)
+
+    # Ordem de filmagem não segue a numeração das cenas
+    ordem = list(cenas)
+    rng.shuffle(ordem)
+    distribuicao = {
+        dia: ordem[(dia - 1) * cenas_por_dia : dia * cenas_por_dia]
+        for dia in range(1, dias + 1)
+    }
+
+    pasta_arquivos = os.path.join(pasta, "arquivos")
+    os.makedirs(pasta_arquivos, exist_ok=True)
+    arquivo_plano = os.path.join(pasta_arquivos, "PLANO_FINAL.pdf")
+    arquivo_decupagem = os.path.join(pasta_arquivos, "DECUPAGEM.csv")
+
+    linhas = _linhas_plano(rng, titulo, cenas, distribuicao, date(2025, 8, 24))
+    paginas = escrever_pdf(arquivo_plano, linhas)
+    escrever_decupagem(arquivo_decupagem, cenas)
+
+    return {
+        "plano": arquivo_plano,
+        "decupagem": arquivo_decupagem,
+        "dias": dias,
+        "cenas": total_cenas,
+        "planos": total_cenas * planos_por_cena,
+        "paginas": paginas,
+        "linhas": len(linhas),
+        "cenas_por_dia": {
+            str(dia): [str(numero) for numero in numeros]
+            for dia, numeros in distribuicao.items()
+        },
+    }
+
+
+def main(argv=None):
+    """Linha de comando do gerador de corpus"""
+    parser = argparse.ArgumentParser(description="Gera um corpus sintético de produção")
+    parser.add_argument("pasta", help="pasta do projeto a criar")
+    parser.add_argument("--tamanho", choices=TAMANHOS, default="pequeno")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dias", type=int)
+    parser.add_argument("--cenas-por-dia", type=int)
+    parser.add_argument("--planos-por-cena", type=int)
+    parser.add_argument("--elenco", type=int)
+    args = parser.parse_args(argv)
+
+    parametros = dict(TAMANHOS[args.tamanho])
+    for nome in parametros:
+        valor = getattr(args, nome)
+        if valor is not None:
+            parametros[nome] = valor
+
+    resumo = gerar_corpus(args.pasta, semente=args.semente, **parametros)
+    print(
+        f"✅ Corpus gerado em {args.pasta}: {resumo['dias']} dias, "
+        f"{resumo['cenas']} cenas, {resumo['planos']} planos, "
+        f"{resumo['paginas']} páginas"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,45 +8,142 @@ import pandas as pd
 import json
 import os
 import re
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List
-import pdfplumber
+
+from extratores_pdf import criar_extrator
+from historico_revisoes import id_revisao
+from memoria_processo import formatar_mb, pico_rss_bytes
+from metricas_od import MetricasExecucao, medir_etapa
+from monitor_arquivos import MonitorArquivos
+from progresso_od import UNIDADE_DIARIA, UNIDADE_LINHA, UNIDADE_OD, UNIDADE_PAGINA
+from snapshot_projeto import (
+    calcular_digest_arquivo,
+    calcular_digests_fontes,
+    carregar_snapshot,
+    salvar_snapshot,
+)
+
+# Caminhos das fontes, relativos à pasta do projeto
+ARQUIVO_DECUPAGEM = "arquivos/DECUPAGEM.csv"
+ARQUIVO_PLANO = "arquivos/PLANO_FINAL.pdf"
+
+# Versão do índice de diárias gravado no cache de extração
+VERSAO_INDICE_PLANO = 1
 
 
 class GeradorOD:
-    def __init__(self):
+    def __init__(self, pasta_projeto=None, extrator_pdf=None):
         self.dados_decupagem = {}
         self.config = {}
         self.titulo_extraido = None
-
-        # Arquivos dinâmicos
-        self.arquivo_decupagem = "arquivos/DECUPAGEM.csv"
-        self.arquivo_plano = "arquivos/PLANO_FINAL.pdf"
-        self.arquivo_config = "config_dias_filmagem.json"
-        self.pasta_ods = "arquivos/ODs"
+        self.indices = {}
+        self.dia_parcial = None  # Diária carregada sozinha (caminho rápido)
+
+        # Arquivos dinâmicos (relativos à pasta do projeto, padrão: diretório atual)
+        self.pasta_projeto = pasta_projeto
+        self.arquivo_decupagem = self._caminho_projeto(ARQUIVO_DECUPAGEM)
+        self.arquivo_plano = self._caminho_projeto(ARQUIVO_PLANO)
+        self.arquivo_config = self._caminho_projeto("config_dias_filmagem.json")
+        self.pasta_ods = self._caminho_projeto("arquivos/ODs")
+        self.pasta_cache = self._caminho_projeto("arquivos/.cache")
+        self.arquivo_snapshot = os.path.join(self.pasta_cache, "projeto.odsnap")
+        self.arquivo_indice_plano = os.path.join(self.pasta_cache, "plano_indice.json")
+        self.arquivo_metricas = os.path.join(self.pasta_ods, "metricas_geracao.json")
+
+        # Backend de extração de texto do PDF (padrão: pdfplumber)
+        self.extrator_pdf = criar_extrator(extrator_pdf)
+
+        # Tempos por etapa, contagens e bytes da última operação
+        self.metricas = MetricasExecucao()
+
+        # Progresso fino e cancelamento cooperativo (ver progresso_od)
+        self.ao_progresso = None  # callback(unidade, atual, total, dia)
+        self.cancelamento = None  # TokenCancelamento
+
+        # Assinatura das fontes do projeto em memória (ver carregar_projeto)
+        self._fontes_carregadas = None
+        self._lock_carga = threading.Lock()
+
+        # Revisões já carregadas (HistoricoRevisoes, opcional) e os digests
+        # das fontes do projeto em memória (None: parcial ou sem o PDF)
+        self.historico = None
+        self.digests_carregados = None
 
         # Criar pasta de ODs se não existir
         os.makedirs(self.pasta_ods, exist_ok=True)
 
-    def _carregar_dados(self):
-        """Carrega dados da decupagem e plano de filmagem automaticamente"""
+    def _progresso(self, unidade, atual, total, dia=None):
+        """Avisa a conclusão de uma unidade de trabalho; também é ponto de cancelamento"""
+        if self.cancelamento is not None:
+            self.cancelamento.verificar()
+        if self.ao_progresso is not None:
+            self.ao_progresso(unidade, atual, total, dia)
+
+    def _caminho_projeto(self, caminho_relativo):
+        """Resolve um caminho relativo à pasta do projeto"""
+        if not self.pasta_projeto:
+            return caminho_relativo
+        return os.path.join(self.pasta_projeto, caminho_relativo)
+
+    @medir_etapa("carregar_dados")
+    def _carregar_dados(self, dia_num=None, digests=None):
+        """Carrega dados da decupagem e plano de filmagem automaticamente
+
+        Com `dia_num`, lê do PDF só as páginas dessa diária quando o índice de
+        diárias do cache permite; o projeto fica carregado apenas com esse dia.
+        `digests` (decupagem, plano) já calculados evitam refazer o SHA-256.
+        """
         print("🔍 Carregando dados do projeto atual...")
 
-        # Carregar decupagem
+        # Partida rápida: revisão já em memória ou snapshot binário, se as
+        # fontes não mudaram
+        if digests is None:
+            digests = calcular_digests_fontes(
+                self.arquivo_decupagem, self.arquivo_plano
+            )
+        self.digests_carregados = None
+        if self._carregar_do_historico(digests):
+            return True
+        if self._carregar_snapshot(digests):
+            self._registrar_revisao(digests, self.arquivo_snapshot)
+            return True
+
+        if not self._carregar_decupagem():
+            return False
+
+        if dia_num is not None and digests:
+            if self._carregar_plano_dia(dia_num, digests[1]):
+                return True
+
+        plano_ok = self._carregar_plano()
+
+        # Snapshot só é gravado quando as duas fontes foram lidas com sucesso
+        self._salvar_estado_carregado(digests if plano_ok else None)
+        return True
+
+    @medir_etapa("ler_csv")
+    def _carregar_decupagem(self):
+        """Lê DECUPAGEM.csv e atualiza os dados das cenas"""
         try:
             df = pd.read_csv(self.arquivo_decupagem, encoding="utf-8")
+            self.metricas.registrar_leitura(self.arquivo_decupagem)
+            self.metricas.definir("linhas_csv", len(df))
             self._processar_decupagem(df)
         except Exception as e:
             print(f"❌ Erro ao carregar decupagem: {e}")
             return False
+        return True
 
-        # Carregar plano de filmagem
+    def _carregar_plano(self):
+        """Lê PLANO_FINAL.pdf e recria a configuração (True se o PDF foi usado)"""
         try:
             cronograma = self._processar_plano_pdf(self.arquivo_plano)
             if cronograma:
                 self._criar_config_do_cronograma(cronograma)
-            else:
-                self._criar_config_padrao()
+                return True
+            self._criar_config_padrao()
         except Exception as e:
             print(f"❌ Erro ao carregar plano de filmagem: {e}")
             import traceback
@@ -54,16 +151,133 @@ class GeradorOD:
             traceback.print_exc()
             # Se não conseguir ler o PDF, usar configuração padrão
             self._criar_config_padrao()
+        return False
+
+    def _salvar_estado_carregado(self, digests):
+        """Grava o JSON de configuração, monta índices e atualiza snapshot e histórico"""
+        self._gravar_config()
+
+        print(
+            f"✅ Configuração gerada para {len(self.config.get('dias_filmagem', {}))} dias de filmagem"
+        )
+
+        self._construir_indices()
+        self.dia_parcial = None
+        self.digests_carregados = None
 
-        # Salvar configuração gerada
+        if digests:
+            try:
+                with self.metricas.etapa("salvar_snapshot"):
+                    salvar_snapshot(
+                        self.arquivo_snapshot, digests, self._dados_snapshot()
+                    )
+                self.metricas.registrar_gravacao(self.arquivo_snapshot)
+                snapshot = self.arquivo_snapshot
+            except OSError as e:
+                print(f"⚠️ Não foi possível gravar snapshot: {e}")
+                snapshot = None
+            self._registrar_revisao(digests, snapshot)
+
+    def _registrar_revisao(self, digests, snapshot=None):
+        """Marca o projeto em memória como a revisão `digests` e a registra no histórico"""
+        self.digests_carregados = digests
+        if self.historico is None:
+            return
+        try:
+            with self.metricas.etapa("registrar_revisao"):
+                self.historico.registrar(digests, self._dados_snapshot(), snapshot)
+        except OSError as e:
+            print(f"⚠️ Não foi possível registrar a revisão: {e}")
+
+    @medir_etapa("gravar_config")
+    def _gravar_config(self):
+        """Grava a configuração atual em config_dias_filmagem.json"""
         with open(self.arquivo_config, "w", encoding="utf-8") as f:
             json.dump(self.config, f, ensure_ascii=False, indent=2)
+        self.metricas.registrar_gravacao(self.arquivo_config)
+
+    def _dados_snapshot(self):
+        """Estado completo do projeto carregado, pronto para serializar"""
+        return {
+            "dados_decupagem": self.dados_decupagem,
+            "config": self.config,
+            "titulo_extraido": self.titulo_extraido,
+            "indices": self.indices,
+        }
 
+    def restaurar_estado(self, dados, digests=None):
+        """Aplica um estado obtido de _dados_snapshot (snapshot, histórico ou outro processo)
+
+        O estado deixa de corresponder à assinatura das fontes lidas antes:
+        o próximo carregar_projeto() confere as fontes de novo.
+        """
+        self.dados_decupagem = dados["dados_decupagem"]
+        self.config = dados["config"]
+        self.titulo_extraido = dados["titulo_extraido"]
+        self.indices = dados["indices"]
+        self.dia_parcial = None
+        self.digests_carregados = digests
+        self._fontes_carregadas = None
+        self._definir_contagens_projeto()
+
+    def _carregar_do_historico(self, digests):
+        """Restaura o projeto do histórico de revisões, se a revisão estiver lá"""
+        if self.historico is None or digests is None:
+            return False
+        with self.metricas.etapa("carregar_historico"):
+            dados = self.historico.obter(id_revisao(digests))
+        if dados is None:
+            return False
+        self.restaurar_estado(dados, digests)
         print(
-            f"✅ Configuração gerada para {len(self.config.get('dias_filmagem', {}))} dias de filmagem"
+            f"⚡ Projeto restaurado do histórico de revisões: {len(self.dados_decupagem)} cenas, "
+            f"{len(self.config.get('dias_filmagem', {}))} dias de filmagem"
         )
         return True
 
+    def _carregar_snapshot(self, digests):
+        """Restaura o projeto a partir do snapshot binário, se válido"""
+        with self.metricas.etapa("carregar_snapshot"):
+            dados = carregar_snapshot(self.arquivo_snapshot, digests)
+        if dados is None:
+            return False
+        self.metricas.registrar_leitura(self.arquivo_snapshot)
+        self.restaurar_estado(dados, digests)
+
+        # O JSON de configuração é apenas um artefato de saída
+        if not os.path.exists(self.arquivo_config):
+            self._gravar_config()
+
+        print(
+            f"⚡ Projeto restaurado do snapshot: {len(self.dados_decupagem)} cenas, "
+            f"{len(self.config.get('dias_filmagem', {}))} dias de filmagem"
+        )
+        return True
+
+    def _construir_indices(self):
+        """Monta índices cena -> dias e dia -> cenas a partir da configuração"""
+        cenas_por_dia = {}
+        dias_por_cena = {}
+        for dia_str, dia_config in self.config.get("dias_filmagem", {}).items():
+            cenas = [str(cena) for cena in dia_config.get("cenas", [])]
+            cenas_por_dia[dia_str] = cenas
+            for cena in cenas:
+                dias_por_cena.setdefault(cena, [])
+                if dia_str not in dias_por_cena[cena]:
+                    dias_por_cena[cena].append(dia_str)
+
+        self.indices = {"cenas_por_dia": cenas_por_dia, "dias_por_cena": dias_por_cena}
+        self._definir_contagens_projeto()
+
+    def _definir_contagens_projeto(self):
+        """Registra nas métricas o tamanho do projeto carregado"""
+        self.metricas.definir("cenas", len(self.dados_decupagem))
+        self.metricas.definir(
+            "planos",
+            sum(len(cena["planos"]) for cena in self.dados_decupagem.values()),
+        )
+        self.metricas.definir("dias", len(self.config.get("dias_filmagem", {})))
+
     def _processar_decupagem(self, df):
         """Processa DataFrame da decupagem para extrair dados das cenas"""
         decupagem = {}
@@ -131,183 +345,306 @@ class GeradorOD:
         print(f"🔍 Iniciando processamento do PDF: {arquivo_pdf}")
 
         try:
-            cronograma = {}
+            paginas = self._extrair_paginas_pdf(arquivo_pdf)
+            texto_completo = "".join(f"{texto}\n" for _, texto in paginas)
+
+            print(f"📝 Texto total extraído: {len(texto_completo)} caracteres")
+            print(f"🧠 Pico de memória do processo: {formatar_mb(pico_rss_bytes())}")
+
+            # Salvar texto para debug
+            debug_file = arquivo_pdf.replace(".pdf", "_debug_text.txt")
+            with open(debug_file, "w", encoding="utf-8") as f:
+                f.write(texto_completo)
+            self.metricas.registrar_gravacao(debug_file)
+            print(f"💾 Texto salvo para debug em: {debug_file}")
+
+            # Analisar linha por linha para extrair sequência completa
+            linhas, posicoes = self._linhas_das_paginas(paginas)
+            print(f"🔍 Analisando {len(linhas)} linhas do texto...")
+
+            # Extrair título do projeto da primeira linha não vazia
+            titulo_projeto = None
+            for linha in linhas:
+                linha_limpa = linha.strip()
+                if linha_limpa:
+                    titulo_projeto = linha_limpa
+                    print(f"📽️ Título do projeto extraído: '{titulo_projeto}'")
+                    break
+
+            # Armazenar título extraído
+            if titulo_projeto:
+                self.titulo_extraido = titulo_projeto
+
+            cronograma, limites = self._analisar_linhas_plano(linhas, posicoes)
+            self._salvar_indice_plano(arquivo_pdf, cronograma, limites)
+            self._imprimir_cronograma(cronograma)
+            return cronograma
 
-            with pdfplumber.open(arquivo_pdf) as pdf:
-                print(f"📄 PDF aberto com {len(pdf.pages)} páginas")
+        except Exception as e:
+            print(f"❌ Erro ao processar PDF: {str(e)}")
+            print("🔍 Traceback completo:")
+            import traceback
 
-                texto_completo = ""
-                for i, page in enumerate(pdf.pages):
-                    texto_pagina = page.extract_text()
+            traceback.print_exc()
+            return {}
+
+    @medir_etapa("extrair_pdf")
+    def _extrair_paginas_pdf(self, arquivo_pdf, paginas=None):
+        """Extrai o texto das páginas do PDF (todas ou só os índices pedidos)
+
+        Retorna [(índice da página, texto)], omitindo páginas sem texto.
+        """
+        extrator = self.extrator_pdf
+        resultado = []
+        documento = extrator.abrir(arquivo_pdf)
+        try:
+            total_paginas = extrator.total_paginas(documento)
+            print(f"📄 PDF aberto com {total_paginas} páginas ({extrator.nome})")
+            indices = range(total_paginas) if paginas is None else paginas
+
+            for n, i in enumerate(indices, 1):
+                texto_pagina = extrator.texto_pagina(documento, i)
+                print(
+                    f"📃 Página {i+1}: {len(texto_pagina) if texto_pagina else 0} caracteres extraídos"
+                )
+                if texto_pagina:
+                    resultado.append((i, texto_pagina))
+                self._progresso(UNIDADE_PAGINA, n, len(indices))
+        finally:
+            extrator.fechar(documento)
+        self.metricas.registrar_leitura(arquivo_pdf)
+        self.metricas.contar("paginas", len(indices))
+        return resultado
+
+    def _linhas_das_paginas(self, paginas):
+        """Quebra o texto das páginas em linhas com a posição (página, linha) de cada uma"""
+        linhas = []
+        posicoes = []
+        for indice_pagina, texto in paginas:
+            for indice_linha, linha in enumerate(texto.split("\n")):
+                linhas.append(linha)
+                posicoes.append((indice_pagina, indice_linha))
+        return linhas, posicoes
+
+    @medir_etapa("analisar_linhas")
+    def _analisar_linhas_plano(self, linhas, posicoes=None):
+        """Monta o cronograma por diária a partir das linhas do plano
+
+        Retorna (cronograma, limites): limites guarda, por diária, a posição da
+        linha do cabeçalho "DIÁRIA n:" e da última linha que pertence a ela.
+        """
+        cronograma = {}
+        limites = {}
+        dia_atual = None
+
+        for num_linha, linha in enumerate(linhas, 1):
+            linha_limpa = linha.strip()
+            if not linha_limpa:
+                continue
+            posicao = posicoes[num_linha - 1] if posicoes else None
+
+            # Detectar início de uma diária
+            match_diaria = re.search(
+                r"diária\s*(\d+)\s*[:：]", linha_limpa, re.IGNORECASE
+            )
+            if match_diaria:
+                dia_atual = int(match_diaria.group(1))
+                print(f"✅ Linha {num_linha}: Encontrado DIÁRIA {dia_atual}")
+                print(f"    Texto da linha: '{linha_limpa}'")
+
+                if dia_atual not in cronograma:
+                    cronograma[dia_atual] = []  # Lista ordenada de atividades
+                    limites[dia_atual] = {"inicio": posicao, "fim": posicao}
+                self._progresso(UNIDADE_DIARIA, num_linha, len(linhas), dia_atual)
+                continue
+
+            # Se estamos dentro de uma diária, capturar TUDO na ordem
+            if dia_atual and linha_limpa:
+                limites[dia_atual]["fim"] = posicao
+
+                # 1. Capturar atividades com horário (café, preparação, refeição, etc.)
+                match_horario = re.match(
+                    r"^(\d{2}h\d{2})\s*[-–—]\s*(\d{2}h\d{2})?\s*(.+)",
+                    linha_limpa,
+                )
+                if match_horario:
+                    horario_inicio = match_horario.group(1)
+                    horario_fim = match_horario.group(2) or ""
+                    atividade = match_horario.group(3).strip()
+
+                    item = {
+                        "tipo": "atividade_fixa",
+                        "horario_inicio": horario_inicio,
+                        "horario_fim": horario_fim,
+                        "atividade": atividade,
+                        "linha_original": linha_limpa,
+                    }
+                    cronograma[dia_atual].append(item)
                     print(
-                        f"📃 Página {i+1}: {len(texto_pagina) if texto_pagina else 0} caracteres extraídos"
+                        f"⏰ Linha {num_linha}: Atividade {horario_inicio}-{horario_fim}: {atividade}"
                     )
-                    if texto_pagina:
-                        texto_completo += texto_pagina + "\n"
-
-                print(f"📝 Texto total extraído: {len(texto_completo)} caracteres")
-
-                # Salvar texto para debug
-                debug_file = arquivo_pdf.replace(".pdf", "_debug_text.txt")
-                with open(debug_file, "w", encoding="utf-8") as f:
-                    f.write(texto_completo)
-                print(f"💾 Texto salvo para debug em: {debug_file}")
-
-                # Analisar linha por linha para extrair sequência completa
-                linhas = texto_completo.split("\n")
-                print(f"🔍 Analisando {len(linhas)} linhas do texto...")
-
-                # Extrair título do projeto da primeira linha não vazia
-                titulo_projeto = None
-                for linha in linhas:
-                    linha_limpa = linha.strip()
-                    if linha_limpa:
-                        titulo_projeto = linha_limpa
-                        print(f"📽️ Título do projeto extraído: '{titulo_projeto}'")
-                        break
-
-                # Armazenar título extraído
-                if titulo_projeto:
-                    self.titulo_extraido = titulo_projeto
-
-                dia_atual = None
-
-                for num_linha, linha in enumerate(linhas, 1):
-                    linha_original = linha
-                    linha_limpa = linha.strip()
-                    if not linha_limpa:
-                        continue
-
-                    # Detectar início de uma diária
-                    match_diaria = re.search(
-                        r"diária\s*(\d+)\s*[:：]", linha_limpa, re.IGNORECASE
+                    continue
+
+                # 2. Capturar cenas (formato: "3 INT QUARTO...")
+                match_cena = re.match(
+                    r"^(\d+)\s+(INT|EXT|REC)\s+(.+)", linha_limpa, re.IGNORECASE
+                )
+                if match_cena:
+                    numero_cena = int(match_cena.group(1))
+                    tipo_local = match_cena.group(2)
+                    descricao = match_cena.group(3)
+
+                    item = {
+                        "tipo": "cena",
+                        "numero": numero_cena,
+                        "tipo_local": tipo_local,
+                        "descricao": descricao,
+                        "horario_inicio": "",  # Sem horário específico
+                        "horario_fim": "",
+                        "linha_original": linha_limpa,
+                    }
+                    cronograma[dia_atual].append(item)
+                    print(
+                        f"🎬 Linha {num_linha}: Cena {numero_cena} ({tipo_local}) - {descricao[:50]}..."
                     )
-                    if match_diaria:
-                        dia_atual = int(match_diaria.group(1))
-                        print(f"✅ Linha {num_linha}: Encontrado DIÁRIA {dia_atual}")
-                        print(f"    Texto da linha: '{linha_limpa}'")
-
-                        if dia_atual not in cronograma:
-                            cronograma[dia_atual] = []  # Lista ordenada de atividades
-                        continue
-
-                    # Se estamos dentro de uma diária, capturar TUDO na ordem
-                    if dia_atual and linha_limpa:
-
-                        # 1. Capturar atividades com horário (café, preparação, refeição, etc.)
-                        match_horario = re.match(
-                            r"^(\d{2}h\d{2})\s*[-–—]\s*(\d{2}h\d{2})?\s*(.+)",
-                            linha_limpa,
-                        )
-                        if match_horario:
-                            horario_inicio = match_horario.group(1)
-                            horario_fim = match_horario.group(2) or ""
-                            atividade = match_horario.group(3).strip()
-
-                            item = {
-                                "tipo": "atividade_fixa",
-                                "horario_inicio": horario_inicio,
-                                "horario_fim": horario_fim,
-                                "atividade": atividade,
-                                "linha_original": linha_limpa,
-                            }
-                            cronograma[dia_atual].append(item)
-                            print(
-                                f"⏰ Linha {num_linha}: Atividade {horario_inicio}-{horario_fim}: {atividade}"
-                            )
-                            continue
-
-                        # 2. Capturar cenas (formato: "3 INT QUARTO...")
-                        match_cena = re.match(
-                            r"^(\d+)\s+(INT|EXT|REC)\s+(.+)", linha_limpa, re.IGNORECASE
-                        )
-                        if match_cena:
-                            numero_cena = int(match_cena.group(1))
-                            tipo_local = match_cena.group(2)
-                            descricao = match_cena.group(3)
-
-                            item = {
-                                "tipo": "cena",
-                                "numero": numero_cena,
-                                "tipo_local": tipo_local,
-                                "descricao": descricao,
-                                "horario_inicio": "",  # Sem horário específico
-                                "horario_fim": "",
-                                "linha_original": linha_limpa,
-                            }
-                            cronograma[dia_atual].append(item)
-                            print(
-                                f"🎬 Linha {num_linha}: Cena {numero_cena} ({tipo_local}) - {descricao[:50]}..."
-                            )
-                            continue
+                    continue
 
-                        # 3. Capturar descrições de cenas (linhas após as cenas)
-                        if (
-                            any(
-                                palavra in linha_limpa.upper()
-                                for palavra in ["DIA", "NOITE", "MANHÃ", "TARDE"]
-                            )
-                            and "ELENCO:" in linha_limpa.upper()
-                        ):
-                            # Esta é uma descrição de cena, adicionar como informação extra
-                            if (
-                                cronograma[dia_atual]
-                                and cronograma[dia_atual][-1]["tipo"] == "cena"
-                            ):
-                                cronograma[dia_atual][-1][
-                                    "descricao_detalhada"
-                                ] = linha_limpa
-                                print(
-                                    f"📝 Linha {num_linha}: Descrição detalhada da cena"
-                                )
-                            continue
-
-                        # 4. Capturar REC: (takes/passagens)
-                        if linha_limpa.upper().startswith("REC:"):
-                            item = {
-                                "tipo": "rec",
-                                "descricao": linha_limpa,
-                                "horario_inicio": "",
-                                "horario_fim": "",
-                                "linha_original": linha_limpa,
-                            }
-                            cronograma[dia_atual].append(item)
-                            print(f"📹 Linha {num_linha}: REC - {linha_limpa}")
-                            continue
-
-                        # 5. Detectar fim da diária
-                        if "fim do dia" in linha_limpa.lower():
-                            print(f"📝 Linha {num_linha}: Fim da diária {dia_atual}")
-                            dia_atual = None
-                            continue
-
-                print(f"📅 Cronograma completo extraído:")
-                for dia, atividades in cronograma.items():
-                    print(f"  📅 Dia {dia}: {len(atividades)} atividades")
-                    for i, ativ in enumerate(atividades):
-                        tipo_icon = {
-                            "atividade_fixa": "⏰",
-                            "cena": "🎬",
-                            "rec": "📹",
-                        }.get(ativ["tipo"], "📋")
-                        descricao = ativ.get(
-                            "atividade",
-                            ativ.get("descricao", f'Cena {ativ.get("numero", "?")}'),
-                        )
-                        print(
-                            f"    {i+1:2d}. {tipo_icon} {ativ.get('horario_inicio', '')} - {descricao}"
-                        )
-
-                return cronograma
+                # 3. Capturar descrições de cenas (linhas após as cenas)
+                if (
+                    any(
+                        palavra in linha_limpa.upper()
+                        for palavra in ["DIA", "NOITE", "MANHÃ", "TARDE"]
+                    )
+                    and "ELENCO:" in linha_limpa.upper()
+                ):
+                    # Esta é uma descrição de cena, adicionar como informação extra
+                    if (
+                        cronograma[dia_atual]
+                        and cronograma[dia_atual][-1]["tipo"] == "cena"
+                    ):
+                        cronograma[dia_atual][-1]["descricao_detalhada"] = linha_limpa
+                        print(f"📝 Linha {num_linha}: Descrição detalhada da cena")
+                    continue
+
+                # 4. Capturar REC: (takes/passagens)
+                if linha_limpa.upper().startswith("REC:"):
+                    item = {
+                        "tipo": "rec",
+                        "descricao": linha_limpa,
+                        "horario_inicio": "",
+                        "horario_fim": "",
+                        "linha_original": linha_limpa,
+                    }
+                    cronograma[dia_atual].append(item)
+                    print(f"📹 Linha {num_linha}: REC - {linha_limpa}")
+                    continue
+
+                # 5. Detectar fim da diária
+                if "fim do dia" in linha_limpa.lower():
+                    print(f"📝 Linha {num_linha}: Fim da diária {dia_atual}")
+                    dia_atual = None
+                    continue
+
+        return cronograma, limites
 
+    def _imprimir_cronograma(self, cronograma):
+        """Mostra o cronograma extraído, dia a dia"""
+        print(f"📅 Cronograma completo extraído:")
+        for dia, atividades in cronograma.items():
+            print(f"  📅 Dia {dia}: {len(atividades)} atividades")
+            for i, ativ in enumerate(atividades):
+                tipo_icon = {
+                    "atividade_fixa": "⏰",
+                    "cena": "🎬",
+                    "rec": "📹",
+                }.get(ativ["tipo"], "📋")
+                descricao = ativ.get(
+                    "atividade",
+                    ativ.get("descricao", f'Cena {ativ.get("numero", "?")}'),
+                )
+                print(
+                    f"    {i+1:2d}. {tipo_icon} {ativ.get('horario_inicio', '')} - {descricao}"
+                )
+
+    def _salvar_indice_plano(self, arquivo_pdf, cronograma, limites):
+        """Grava no cache de extração o índice de diárias (página/linha) do PDF"""
+        digest = calcular_digest_arquivo(arquivo_pdf)
+        if digest is None or not cronograma:
+            return
+
+        indice = {
+            "versao": VERSAO_INDICE_PLANO,
+            "digest_plano": digest.hex(),
+            "titulo": self.titulo_extraido,
+            "total_dias": len(cronograma),
+            "dias": {
+                str(dia): {"inicio": list(pos["inicio"]), "fim": list(pos["fim"])}
+                for dia, pos in limites.items()
+            },
+        }
+        try:
+            os.makedirs(self.pasta_cache, exist_ok=True)
+            temporario = self.arquivo_indice_plano + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(indice, f, ensure_ascii=False)
+            os.replace(temporario, self.arquivo_indice_plano)
+            self.metricas.registrar_gravacao(self.arquivo_indice_plano)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar índice de diárias: {e}")
+
+    def _carregar_indice_plano(self, digest_plano):
+        """Lê o índice de diárias, se ele corresponder ao PDF atual"""
+        try:
+            with open(self.arquivo_indice_plano, "r", encoding="utf-8") as f:
+                indice = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            indice.get("versao") != VERSAO_INDICE_PLANO
+            or indice.get("digest_plano") != digest_plano.hex()
+        ):
+            return None
+        return indice
+
+    def _carregar_plano_dia(self, dia_num, digest_plano):
+        """Lê do PDF só as páginas da diária pedida (False se o índice não a cobre)"""
+        indice = self._carregar_indice_plano(digest_plano)
+        limites = indice["dias"].get(str(dia_num)) if indice else None
+        if limites is None:
+            return False
+
+        inicio, fim = tuple(limites["inicio"]), tuple(limites["fim"])
+        try:
+            paginas = self._extrair_paginas_pdf(
+                self.arquivo_plano, range(inicio[0], fim[0] + 1)
+            )
         except Exception as e:
-            print(f"❌ Erro ao processar PDF: {str(e)}")
-            print("🔍 Traceback completo:")
-            import traceback
+            print(f"⚠️ Leitura parcial do plano falhou, lendo o PDF inteiro: {e}")
+            return False
 
-            traceback.print_exc()
-            return {}
+        linhas, posicoes = self._linhas_das_paginas(paginas)
+        linhas_dia = [
+            linha
+            for linha, posicao in zip(linhas, posicoes)
+            if inicio <= posicao <= fim
+        ]
+        cronograma, _ = self._analisar_linhas_plano(linhas_dia)
+        if int(dia_num) not in cronograma:
+            return False
+
+        self.titulo_extraido = indice["titulo"]
+        self._criar_config_do_cronograma({int(dia_num): cronograma[int(dia_num)]})
+        self.config["projeto"]["total_dias"] = indice["total_dias"]
+        self._construir_indices()
+        self.dia_parcial = str(dia_num)
+
+        print(
+            f"⚡ Diária {dia_num}: lidas só as páginas {inicio[0] + 1}-{fim[0] + 1} do plano"
+        )
+        return True
 
+    @medir_etapa("montar_config")
     def _criar_config_do_cronograma(self, cronograma):
         """Cria configuração a partir do cronograma extraído do PDF na ordem correta"""
         print(f"🔧 Criando configuração a partir do cronograma: {len(cronograma)} dias")
@@ -353,6 +690,7 @@ class GeradorOD:
             f"✅ Configuração criada com {len(self.config['dias_filmagem'])} dias de filmagem"
         )
 
+    @medir_etapa("montar_config")
     def _criar_config_padrao(self):
         """Cria configuração padrão baseada nas cenas disponíveis"""
         cenas_disponiveis = list(self.dados_decupagem.keys())
@@ -384,11 +722,75 @@ class GeradorOD:
 
         print(f"✅ Configuração padrão criada com {len(dias_config)} dias")
 
+    def carregar_projeto(self):
+        """Garante o projeto completo em memória, relendo as fontes só se mudaram
+
+        Uma carga anterior continua válida enquanto tamanho/mtime das fontes
+        não mudam; se mudarem, o SHA-256 decide (MonitorArquivos). Permite
+        gerar vários dias com uma única leitura do CSV e do PDF. Cada fonte
+        alterada é hasheada uma vez: a carga usa os digests do monitor.
+        """
+        with self._lock_carga:
+            fontes = self._fontes_carregadas
+            if fontes is None:
+                # Assinatura tirada antes da leitura: uma edição durante a
+                # carga invalida o projeto na próxima chamada
+                fontes = MonitorArquivos([self.arquivo_decupagem, self.arquivo_plano])
+            elif (
+                not fontes.verificar_agora()
+                and self.dia_parcial is None
+                and self.config.get("dias_filmagem")
+            ):
+                return True
+
+            # A verificação acima já avançou o monitor: até a carga terminar o
+            # projeto em memória não corresponde a ele (cancelamento relê tudo)
+            self._fontes_carregadas = None
+            if not self._carregar_dados(digests=fontes.digests()):
+                return False
+            self._fontes_carregadas = fontes
+            return True
+
+    def usar_revisao(self, revisao):
+        """Coloca em memória uma revisão do histórico, sem reler CSV/PDF
+
+        Até o próximo carregar_projeto() o projeto fica nessa revisão, mesmo
+        que os arquivos atuais sejam outros. False se a revisão não está
+        disponível (nem em memória nem em disco).
+        """
+        if self.historico is None:
+            return False
+        with self._lock_carga:
+            digests = self.historico.digests(revisao)
+            if digests is None:
+                return False
+            if self.digests_carregados == digests and self.dia_parcial is None:
+                return True
+            dados = self.historico.obter(revisao)
+            if dados is None:
+                return False
+            self.restaurar_estado(dados, digests)
+            return True
+
     def gerar_od_dia(self, dia_num):
         """Gera OD para um dia específico seguindo a ordem exata do PDF"""
-        if not self._carregar_dados():
+        self.metricas.reiniciar()
+        if not self._carregar_dados(dia_num):
             return False
 
+        return self.renderizar_od_dia(dia_num)
+
+    def renderizar_od_dia(self, dia_num):
+        """Gera a OD de um dia a partir dos dados já carregados (sem reler fontes)
+
+        Pode ser chamado de várias threads com o mesmo gerador: a renderização
+        segura o lock de carga, então nunca vê o projeto pela metade durante
+        um recarregar_fontes() ou usar_revisao().
+        """
+        with self._lock_carga:
+            return self._renderizar_od_dia(dia_num)
+
+    def _renderizar_od_dia(self, dia_num):
         dia_str = str(dia_num)
         print(f"🎬 Gerando OD do Dia {dia_num}...")
 
@@ -398,17 +800,55 @@ class GeradorOD:
 
         dia_config = self.config["dias_filmagem"][dia_str]
 
-        # Se tem cronograma completo do PDF, usar ele
-        if "cronograma_completo" in dia_config:
-            return self._gerar_od_do_cronograma(
+        with self.metricas.etapa("od_dia", dia=dia_num):
+            # Se tem cronograma completo do PDF, usar ele
+            if "cronograma_completo" in dia_config:
+                return self._gerar_od_do_cronograma(
+                    dia_num, dia_config["cronograma_completo"]
+                )
+            else:
+                # Fallback para o método antigo
+                return self._gerar_od_simples(dia_num, dia_config)
+
+    def montar_workbook_dia(self, dia_num):
+        """Monta a planilha da OD em memória (None se o dia não tem cronograma do PDF)
+
+        Como renderizar_od_dia(), segura o lock de carga enquanto monta.
+        """
+        with self._lock_carga:
+            dia_config = self.config.get("dias_filmagem", {}).get(str(dia_num))
+            if not dia_config or "cronograma_completo" not in dia_config:
+                return None
+            return self._montar_workbook_cronograma(
                 dia_num, dia_config["cronograma_completo"]
             )
-        else:
-            # Fallback para o método antigo
-            return self._gerar_od_simples(dia_num, dia_config)
 
     def _gerar_od_do_cronograma(self, dia_num, cronograma):
         """Gera OD seguindo exatamente a ordem do cronograma do PDF com formatação especificada"""
+        wb = self._montar_workbook_cronograma(dia_num, cronograma)
+
+        # Salvar arquivo: grava num temporário e troca de uma vez, para que um
+        # cancelamento ou erro nunca deixe uma OD pela metade
+        arquivo_od = f"{self.pasta_ods}/OD_Dia_{dia_num}.xlsx"
+        temporario = f"{arquivo_od}.tmp"
+        with self.metricas.etapa("salvar_xlsx"):
+            try:
+                wb.save(temporario)
+                os.replace(temporario, arquivo_od)
+            finally:
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+        self.metricas.registrar_gravacao(arquivo_od)
+        self.metricas.contar("ods")
+
+        print(f"📋 Cronograma: {len(cronograma)} atividades na ordem do PDF")
+        print(f"🎨 Formatação específica aplicada com planos detalhados")
+        print(f"✅ OD salva: {arquivo_od}")
+        return True
+
+    @medir_etapa("renderizar_dia")
+    def _montar_workbook_cronograma(self, dia_num, cronograma):
+        """Monta a planilha da OD na ordem exata do cronograma do PDF"""
         from openpyxl import Workbook
         from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
         from datetime import datetime
@@ -881,7 +1321,8 @@ class GeradorOD:
         linha_atual += 1
 
         # Preencher cronograma na ordem do PDF
-        for atividade in cronograma:
+        for numero_atividade, atividade in enumerate(cronograma, 1):
+            self._progresso(UNIDADE_LINHA, numero_atividade, len(cronograma), dia_num)
             # Definir cores por tipo de atividade
             if atividade["tipo"] == "atividade_fixa":
                 if "CAFÉ" in atividade["atividade"].upper():
@@ -1166,14 +1607,8 @@ class GeradorOD:
         ws.page_setup.orientation = ws.ORIENTATION_LANDSCAPE
         ws.page_setup.paperSize = ws.PAPERSIZE_A4
 
-        # Salvar arquivo
-        arquivo_od = f"{self.pasta_ods}/OD_Dia_{dia_num}.xlsx"
-        wb.save(arquivo_od)
-
-        print(f"📋 Cronograma: {len(cronograma)} atividades na ordem do PDF")
-        print(f"🎨 Formatação específica aplicada com planos detalhados")
-        print(f"✅ OD salva: {arquivo_od}")
-        return True
+        self.metricas.contar("linhas_planilha", ws.max_row)
+        return wb
 
     def _gerar_od_simples(self, dia_num, dia_config):
         """Fallback para gerar OD simples quando não há cronograma do PDF"""
@@ -1186,10 +1621,32 @@ class GeradorOD:
         return True
 
     def gerar_todas_ods(self):
-        """Gera ODs para todos os dias disponíveis na configuração"""
-        if not self._carregar_dados():
-            return False
+        """Gera ODs para todos os dias disponíveis na configuração
 
+        Ao final grava o relatório de métricas em arquivos/ODs/metricas_geracao.json.
+        """
+        self.metricas.reiniciar()
+        try:
+            with self.metricas.etapa("gerar_todas_ods"):
+                if not self._carregar_dados():
+                    return False
+                return self.renderizar_todas_ods()
+        finally:
+            self._gravar_relatorio_metricas()
+
+    def _gravar_relatorio_metricas(self):
+        """Grava o JSON de métricas da execução e imprime o resumo"""
+        print("\n📊 Métricas da execução:")
+        for linha in self.metricas.resumo():
+            print(linha)
+        try:
+            self.metricas.gravar_json(self.arquivo_metricas)
+            print(f"💾 Métricas salvas em: {self.arquivo_metricas}")
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar métricas: {e}")
+
+    def renderizar_todas_ods(self):
+        """Gera as ODs de todos os dias a partir dos dados já carregados"""
         dias_disponíveis = list(self.config["dias_filmagem"].keys())
         total_dias = len(dias_disponíveis)
 
@@ -1198,12 +1655,12 @@ class GeradorOD:
         sucessos = 0
         falhas = 0
 
-        for dia_str in dias_disponíveis:
+        for n, dia_str in enumerate(dias_disponíveis, 1):
             dia_num = int(dia_str)
             print(f"\n📅 Processando Dia {dia_num}...")
 
             try:
-                if self.gerar_od_dia(dia_num):
+                if self.renderizar_od_dia(dia_num):
                     sucessos += 1
                     print(f"✅ OD do Dia {dia_num} gerada com sucesso!")
                 else:
@@ -1212,6 +1669,7 @@ class GeradorOD:
             except Exception as e:
                 falhas += 1
                 print(f"❌ Erro ao gerar OD do Dia {dia_num}: {str(e)}")
+            self._progresso(UNIDADE_OD, n, total_dias, dia_num)
 
         print(f"\n📊 Resumo:")
         print(f"   ✅ Sucessos: {sucessos}")
@@ -1220,6 +1678,143 @@ class GeradorOD:
 
         return falhas == 0
 
+    def recarregar_fontes(self, alterados, fontes=None):
+        """Recarrega só as fontes alteradas e retorna os dias cuja OD mudou
+
+        Roda na thread do monitor: troca o projeto em memória sob o mesmo
+        lock de carregar_projeto() e usar_revisao(). Com `fontes` (o
+        MonitorArquivos que detectou a alteração) os digests dele são
+        reaproveitados e carregar_projeto() passa a partir da mesma verificação.
+        """
+        with self._lock_carga:
+            return self._recarregar_alterados(alterados, fontes)
+
+    def _recarregar_alterados(self, alterados, fontes=None):
+        alterados = {os.path.abspath(caminho) for caminho in alterados}
+        mudou_decupagem = os.path.abspath(self.arquivo_decupagem) in alterados
+        mudou_plano = os.path.abspath(self.arquivo_plano) in alterados
+        if not (mudou_decupagem or mudou_plano):
+            return []
+
+        digests = None
+        if fontes is not None:
+            digests = fontes.digests([self.arquivo_decupagem, self.arquivo_plano])
+
+        # Nada carregado ainda (ou só uma diária): carga completa, todos os dias são afetados
+        if not self.config.get("dias_filmagem") or self.dia_parcial is not None:
+            if not self._carregar_dados(digests=digests):
+                return []
+            self._acompanhar_fontes(fontes)
+            return list(self.config["dias_filmagem"].keys())
+
+        decupagem_anterior = self.dados_decupagem
+        config_anterior = self.config
+
+        if mudou_decupagem:
+            print("🔄 DECUPAGEM.csv alterada - recarregando decupagem...")
+            if not self._carregar_decupagem():
+                return []
+
+        # A configuração padrão depende da decupagem, então também é refeita
+        if mudou_plano or not self._config_do_pdf():
+            print("🔄 Reprocessando plano de filmagem...")
+            plano_ok = self._carregar_plano()
+        else:
+            plano_ok = True
+
+        if digests is None:
+            digests = calcular_digests_fontes(
+                self.arquivo_decupagem, self.arquivo_plano
+            )
+        self._salvar_estado_carregado(digests if plano_ok else None)
+        self._acompanhar_fontes(fontes)
+
+        dias = self.dias_afetados(decupagem_anterior, config_anterior)
+        removidos = set(config_anterior.get("dias_filmagem", {})) - set(
+            self.config["dias_filmagem"]
+        )
+        if removidos:
+            print(
+                f"⚠️ Dias removidos do plano (ODs antigas mantidas): {', '.join(sorted(removidos))}"
+            )
+        print(f"📅 Dias afetados: {', '.join(dias) if dias else 'nenhum'}")
+        return dias
+
+    def _acompanhar_fontes(self, fontes):
+        """Projeto recarregado: carregar_projeto() parte da verificação de `fontes`"""
+        if fontes is not None:
+            self._fontes_carregadas = MonitorArquivos(
+                [self.arquivo_decupagem, self.arquivo_plano], base=fontes
+            )
+
+    def _config_do_pdf(self):
+        """Indica se a configuração atual veio do cronograma do PDF"""
+        dias = self.config.get("dias_filmagem", {})
+        return bool(dias) and all(
+            "cronograma_completo" in dia_config for dia_config in dias.values()
+        )
+
+    def dias_afetados(self, decupagem_anterior, config_anterior):
+        """Compara o projeto carregado com um estado anterior e lista os dias a regenerar"""
+        dias_atuais = self.config.get("dias_filmagem", {})
+        dias_anteriores = config_anterior.get("dias_filmagem", {})
+
+        # Cabeçalho de toda OD usa título, diretor e total de dias
+        if self.config.get("projeto") != config_anterior.get("projeto"):
+            return list(dias_atuais.keys())
+
+        cenas_alteradas = {
+            cena
+            for cena in set(decupagem_anterior) | set(self.dados_decupagem)
+            if decupagem_anterior.get(cena) != self.dados_decupagem.get(cena)
+        }
+
+        afetados = []
+        for dia_str, dia_config in dias_atuais.items():
+            cenas_dia = {str(cena) for cena in dia_config.get("cenas", [])}
+            if dia_config != dias_anteriores.get(dia_str) or (
+                cenas_dia & cenas_alteradas
+            ):
+                afetados.append(dia_str)
+        return afetados
+
+    def observar_alteracoes(self, intervalo=1.0, parar=None):
+        """Modo observação: regenera as ODs afetadas sempre que as fontes mudam"""
+
+        def ao_alterar(alterados):
+            for dia_str in self.recarregar_fontes(alterados, monitor):
+                self.renderizar_od_dia(int(dia_str))
+
+        # Assinatura tirada antes da geração inicial: uma edição durante ela
+        # é regenerada logo depois, em vez de virar a referência do monitor
+        monitor = MonitorArquivos(
+            [self.arquivo_decupagem, self.arquivo_plano],
+            ao_alterar,
+            intervalo=intervalo,
+        )
+        if not self.gerar_todas_ods():
+            print("⚠️ Geração inicial com falhas - continuando a observar")
+
+        alterados = monitor.verificar_agora()
+        if alterados:
+            print("🔄 Fontes alteradas durante a geração inicial")
+            ao_alterar(alterados)
+        monitor.iniciar()
+        print(
+            f"👁️ Observando {self.arquivo_decupagem} e {self.arquivo_plano} "
+            f"({monitor.backend}) - Ctrl+C para sair"
+        )
+
+        parar = parar or threading.Event()
+        try:
+            while not parar.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            print("\n⏹️ Observação encerrada")
+        finally:
+            monitor.parar()
+        return True
+
 
 # Alias para compatibilidade
 GeradorODCompleto = GeradorOD
@@ -5,16 +5,77 @@ Aplica YAGNI - apenas funcionalidades essenciais
 Detecta automaticamente se deve usar GUI ou linha de comando
 """
 
+import multiprocessing
+import signal
 import sys
 import os
-from gerador_od_completo import GeradorODCompleto
+from functools import partial
+from progresso_od import UNIDADE_OD, GeracaoCancelada, TokenCancelamento
+
+# Opções de perfil de desempenho, aceitas em qualquer posição
+OPCOES_PERFIL = ("--profile", "--profile-stacks")
+OPCAO_TRACE = "--trace"
+OPCAO_MEMORIA = "--memory-report"
+
+USO = """Sistema de Geracao de OD
+
+Uso:
+  GeradorOD.exe [dia]     # Gera OD de um dia especifico
+  GeradorOD.exe all       # Gera todas as ODs
+  GeradorOD.exe lote PASTA [PASTA ...]  # ODs de varios projetos
+  GeradorOD.exe servidor [--porta N]    # Servico local HTTP/JSON
+
+Exemplos:
+  GeradorOD.exe 1
+  GeradorOD.exe 3
+  GeradorOD.exe all
+
+Opcoes:
+  --watch                 # Regenera ODs afetadas quando os arquivos mudam
+  --profile               # Grava perfil de desempenho em arquivos/perfis
+  --profile-stacks        # Perfil + pilhas para flame graph
+  --trace                 # Trace de etapas (Chrome/Perfetto) em arquivos/perfis
+  --memory-report         # Pico e memória retida por etapa em arquivos/perfis
+  --help, -h, help        # Mostra esta mensagem"""
+
+
+def _imprimir_progresso(unidade, atual, total, dia):
+    """Linha de progresso por OD concluída (o detalhe fino já sai no log)"""
+    if unidade == UNIDADE_OD:
+        print(f"⏳ [{atual}/{total}] Dia {dia} concluído")
+
+
+def _cancelar_com_ctrl_c(gerador):
+    """Primeiro Ctrl+C cancela entre unidades de trabalho; o segundo força a saída
+
+    Retorna o tratador de SIGINT anterior, para ser restaurado no fim.
+    """
+    token = TokenCancelamento()
+    gerador.cancelamento = token
+    gerador.ao_progresso = _imprimir_progresso
+
+    def ao_interromper(sinal, frame):
+        print("\n⏹️ Cancelando... (Ctrl+C de novo para forçar a saída)")
+        token.cancelar()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    return signal.signal(signal.SIGINT, ao_interromper)
 
 
 def main():
     """Interface que detecta se deve usar GUI ou linha de comando"""
+    perfil = any(opcao in sys.argv for opcao in OPCOES_PERFIL)
+    pilhas = "--profile-stacks" in sys.argv
+    trace = OPCAO_TRACE in sys.argv
+    memoria = OPCAO_MEMORIA in sys.argv
+    argumentos = [
+        arg
+        for arg in sys.argv[1:]
+        if arg not in OPCOES_PERFIL + (OPCAO_TRACE, OPCAO_MEMORIA)
+    ]
 
     # Se executado sem argumentos, abrir GUI
-    if len(sys.argv) < 2:
+    if not argumentos:
         try:
             # Tentar importar e executar GUI
             from gerar_od_gui import GeradorODGUI
@@ -24,57 +85,101 @@ def main():
             return
         except ImportError:
             # Se não conseguir importar GUI, mostrar ajuda da linha de comando
-            print("Sistema de Geracao de OD")
-            print("\nUso:")
-            print("  GeradorOD.exe [dia]     # Gera OD de um dia especifico")
-            print("  GeradorOD.exe all       # Gera todas as ODs")
-            print("\nExemplos:")
-            print("  GeradorOD.exe 1")
-            print("  GeradorOD.exe 3")
-            print("  GeradorOD.exe all")
-            print("\nOpcoes:")
-            print("  --help, -h, help        # Mostra esta mensagem")
+            print(USO)
             print(
                 "\nNota: Para usar a interface grafica, instale: pip install customtkinter pillow"
             )
             return
 
     # Processamento via linha de comando
-    comando = sys.argv[1].lower()
+    comando = argumentos[0].lower()
 
     # Verificar se é pedido de ajuda
     if comando in ["--help", "-h", "help"]:
-        print("Sistema de Geracao de OD")
-        print("\nUso:")
-        print("  GeradorOD.exe [dia]     # Gera OD de um dia especifico")
-        print("  GeradorOD.exe all       # Gera todas as ODs")
-        print("\nExemplos:")
-        print("  GeradorOD.exe 1")
-        print("  GeradorOD.exe 3")
-        print("  GeradorOD.exe all")
-        print("\nOpcoes:")
-        print("  --help, -h, help        # Mostra esta mensagem")
+        print(USO)
         return
 
+    # Geração em lote de várias pastas de produção
+    if comando == "lote":
+        from lote_od import main as main_lote
+
+        sys.exit(main_lote(argumentos[1:] + ([OPCAO_TRACE] if trace else [])))
+
+    # Serviço local que mantém os projetos carregados em memória
+    if comando == "servidor":
+        from servidor_od import main as main_servidor
+
+        sys.exit(main_servidor(argumentos[1:]))
+
+    # Importado só aqui: a interface abre sem esperar pandas/openpyxl
+    from gerador_od_completo import GeradorODCompleto
+
+    tratador_sigint = None
     try:
         gerador = GeradorODCompleto()
+        if comando != "--watch":
+            tratador_sigint = _cancelar_com_ctrl_c(gerador)
+
+        def executar():
+            if comando == "--watch":
+                gerador.observar_alteracoes()
+            elif comando == "all":
+                print("Gerando todas as ODs...")
+                gerador.gerar_todas_ods()
+                print("Todas as ODs geradas com sucesso!")
+            else:
+                dia = int(comando)
+                print(f"Gerando OD do Dia {dia}...")
+                gerador.gerar_od_dia(dia)
+                print(f"OD do Dia {dia} gerada com sucesso!")
+
+        tarefa = executar
+        if perfil:
+            from perfil_od import executar_com_perfil
+
+            nome = {"all": "perfil_todas", "--watch": "perfil_watch"}.get(
+                comando, f"perfil_dia_{comando}"
+            )
+            tarefa = partial(executar_com_perfil, executar, nome=nome, pilhas=pilhas)
 
-        if comando == "all":
-            print("Gerando todas as ODs...")
-            gerador.gerar_todas_ods()
-            print("Todas as ODs geradas com sucesso!")
+        if memoria:
+            from memoria_processo import MonitorMemoria, executar_com_relatorio_memoria
+
+            monitor = MonitorMemoria()
+            gerador.metricas.observadores.append(monitor)
+            nome_memoria = {"all": "memoria_todas", "--watch": "memoria_watch"}.get(
+                comando, f"memoria_dia_{comando}"
+            )
+            tarefa = partial(
+                executar_com_relatorio_memoria, tarefa, monitor, nome=nome_memoria
+            )
+
+        if trace:
+            from rastreamento_od import RastreadorEventos, executar_com_trace
+
+            rastreador = RastreadorEventos()
+            rastreador.nomear_processo("gerar_od")
+            gerador.metricas.observadores.append(rastreador)
+            nome_trace = {"all": "trace_todas", "--watch": "trace_watch"}.get(
+                comando, f"trace_dia_{comando}"
+            )
+            executar_com_trace(tarefa, rastreador, nome=nome_trace)
         else:
-            dia = int(comando)
-            print(f"Gerando OD do Dia {dia}...")
-            gerador.gerar_od_dia(dia)
-            print(f"OD do Dia {dia} gerada com sucesso!")
+            tarefa()
 
+    except GeracaoCancelada:
+        print("⏹️ Geração cancelada: as ODs já gravadas continuam íntegras")
     except ValueError:
         print("Erro: Digite um numero valido ou 'all'")
         print("Use 'GeradorOD.exe --help' para ver as opcoes disponíveis")
     except Exception as e:
         print(f"Erro: {str(e)}")
+    finally:
+        if tratador_sigint is not None:
+            signal.signal(signal.SIGINT, tratador_sigint)
 
 
 if __name__ == "__main__":
+    # Necessário para processos de trabalho no executável congelado
+    multiprocessing.freeze_support()
     main()
@@ -6,12 +6,82 @@ Utiliza CustomTkinter para uma aparência moderna e profissional
 
 import sys
 import os
+import functools
+import multiprocessing
+import queue
 import threading
-import customtkinter as ctk
-from tkinter import messagebox, filedialog
-from pathlib import Path
-import json
-from gerador_od_completo import GeradorODCompleto
+import time
+
+# Referência da inicialização (primeira pintura / interativa), tomada antes
+# dos imports de interface
+INICIO_IMPORTACAO = time.perf_counter()
+
+import customtkinter as ctk  # noqa: E402
+import tkinter as tk  # noqa: E402
+from tkinter import messagebox, filedialog  # noqa: E402
+from pathlib import Path  # noqa: E402
+import json  # noqa: E402
+from datetime import datetime  # noqa: E402
+from geracao_paralela import (  # noqa: E402
+    STATUS_CANCELADO,
+    STATUS_CONCLUIDO,
+    STATUS_FALHOU,
+    STATUS_GRAVANDO,
+    STATUS_NA_FILA,
+    STATUS_RENDERIZANDO,
+    PoolGeracao,
+    gerar_dias_em_paralelo,
+)
+from historico_revisoes import (  # noqa: E402
+    MAX_EM_MEMORIA_PADRAO,
+    ORCAMENTO_PADRAO_MB,
+    HistoricoRevisoes,
+)
+from limpeza_ods import arquivar_pasta_ods, excluir_ods, listar_ods  # noqa: E402
+from monitor_arquivos import MonitorArquivos  # noqa: E402
+from perfil_od import executar_com_perfil  # noqa: E402
+from previa_od import faixa_visivel, linhas_previa  # noqa: E402
+from registro_log import LINHAS_VISIVEIS, RegistroLog  # noqa: E402
+from progresso_od import (  # noqa: E402
+    UNIDADE_DIARIA,
+    UNIDADE_LINHA,
+    UNIDADE_PAGINA,
+    GeracaoCancelada,
+    TokenCancelamento,
+)
+
+# Intervalo em que os eventos das threads de trabalho chegam à interface
+INTERVALO_INTERFACE_MS = 33  # ~30 quadros por segundo
+
+# Texto da linha de status de cada dia na geração
+TEXTO_STATUS_DIA = {
+    STATUS_NA_FILA: "⏳ na fila",
+    STATUS_RENDERIZANDO: "🎨 renderizando",
+    STATUS_GRAVANDO: "💾 gravando",
+    STATUS_CONCLUIDO: "✅ concluída",
+    STATUS_FALHOU: "❌ falhou",
+    STATUS_CANCELADO: "⏹️ cancelada",
+}
+
+# Arquivos de entrada do projeto (relativos à pasta de trabalho)
+ARQUIVO_DECUPAGEM_GUI = "arquivos/DECUPAGEM.csv"
+ARQUIVO_PLANO_GUI = "arquivos/PLANO_FINAL.pdf"
+ARQUIVOS_ENTRADA = (ARQUIVO_DECUPAGEM_GUI, ARQUIVO_PLANO_GUI)
+PASTA_ODS_GUI = "arquivos/ODs"
+PASTA_ARQUIVO_ODS_GUI = "arquivos/ODs_arquivo"
+PASTA_REVISOES_GUI = "arquivos/.cache/revisoes"
+ROTULO_REVISAO_ATUAL = "📄 Atual (arquivos)"
+INTERVALO_STATUS_ARQUIVOS = 2.0  # segundos entre consultas os.stat (sem inotify)
+
+# Prévia do cronograma: altura fixa por linha (permite desenhar só as visíveis)
+ALTURA_LINHA_PREVIA = 22
+CORES_PREVIA = {
+    "atividade_fixa": "#0056b3",
+    "cena": "#212529",
+    "rec": "#e8590c",
+    "detalhe": "#6c757d",
+    "plano": "#495057",
+}
 
 # Configurações do tema moderno
 ctk.set_appearance_mode("light")  # "light" ou "dark"
@@ -74,14 +144,206 @@ class ToastNotification:
             pass
 
 
+class ListaVirtual:
+    """Lista rolável que só desenha as linhas visíveis
+
+    As linhas viram itens de texto de um Canvas; itens que saem da janela
+    visível são reaproveitados para as que entram, então o custo de rolar
+    não depende do tamanho do dia.
+    """
+
+    def __init__(self, parent, altura_linha=ALTURA_LINHA_PREVIA):
+        self.altura_linha = altura_linha
+        self.linhas = []
+        self._itens = {}  # índice da linha -> (item da hora, item do texto)
+        self._livres = []
+
+        self.canvas = tk.Canvas(
+            parent,
+            bg="#ffffff",
+            highlightthickness=0,
+            yscrollincrement=altura_linha,
+        )
+        self.scrollbar = ctk.CTkScrollbar(parent, command=self._rolar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", lambda evento: self.redesenhar())
+        self.canvas.bind("<MouseWheel>", self._roda_mouse)
+        self.canvas.bind(
+            "<Button-4>", lambda evento: self._rolar("scroll", -3, "units")
+        )
+        self.canvas.bind("<Button-5>", lambda evento: self._rolar("scroll", 3, "units"))
+
+    def mostrar(self, linhas):
+        """Troca o conteúdo e volta ao topo"""
+        self.linhas = linhas
+        for indice in list(self._itens):
+            self._liberar(indice)
+        self.canvas.configure(scrollregion=(0, 0, 0, len(linhas) * self.altura_linha))
+        self.canvas.yview_moveto(0)
+        self.redesenhar()
+
+    def _rolar(self, *args):
+        self.canvas.yview(*args)
+        self.redesenhar()
+
+    def _roda_mouse(self, evento):
+        self._rolar("scroll", -1 if evento.delta > 0 else 1, "units")
+
+    def _liberar(self, indice):
+        itens = self._itens.pop(indice)
+        for item in itens:
+            self.canvas.itemconfigure(item, state="hidden")
+        self._livres.append(itens)
+
+    def redesenhar(self):
+        """Posiciona itens só para as linhas da janela visível"""
+        inicio, fim = faixa_visivel(
+            self.canvas.canvasy(0),
+            self.canvas.winfo_height(),
+            self.altura_linha,
+            len(self.linhas),
+        )
+        for indice in [i for i in self._itens if not inicio <= i < fim]:
+            self._liberar(indice)
+
+        for indice in range(inicio, fim):
+            if indice in self._itens:
+                continue
+            if self._livres:
+                itens = self._livres.pop()
+            else:
+                itens = (
+                    self.canvas.create_text(0, 0, anchor="w", font=("Consolas", 10)),
+                    self.canvas.create_text(0, 0, anchor="w", font=("Consolas", 10)),
+                )
+            hora, texto, tipo = self.linhas[indice]
+            y = indice * self.altura_linha + self.altura_linha // 2
+            cor = CORES_PREVIA.get(tipo, "#212529")
+            self.canvas.coords(itens[0], 8, y)
+            self.canvas.itemconfigure(itens[0], text=hora, fill=cor, state="normal")
+            self.canvas.coords(itens[1], 100, y)
+            self.canvas.itemconfigure(itens[1], text=texto, fill=cor, state="normal")
+            self._itens[indice] = itens
+
+
+class JanelaPrevia:
+    """Janela com o cronograma de um dia, lido do projeto já carregado"""
+
+    def __init__(self, app, dia):
+        self.app = app
+        self.janela = ctk.CTkToplevel(app.root)
+        self.janela.title("🔎 Prévia do cronograma")
+        self.janela.geometry("640x520")
+        self.janela.grid_columnconfigure(0, weight=1)
+        self.janela.grid_rowconfigure(2, weight=1)
+
+        topo = ctk.CTkFrame(self.janela, fg_color="transparent")
+        topo.grid(row=0, column=0, columnspan=2, sticky="ew", padx=15, pady=(15, 5))
+        ctk.CTkLabel(
+            topo, text="📅 Dia:", font=ctk.CTkFont(size=13, weight="bold")
+        ).grid(row=0, column=0, padx=(0, 10))
+        self.dia_var = ctk.StringVar(value=str(dia))
+        ctk.CTkOptionMenu(
+            topo,
+            values=list(app.dias_disponiveis),
+            variable=self.dia_var,
+            command=self.mostrar_dia,
+            width=90,
+        ).grid(row=0, column=1)
+
+        self.info_label = ctk.CTkLabel(
+            self.janela, text="", font=ctk.CTkFont(size=11), text_color="#6c757d"
+        )
+        self.info_label.grid(row=1, column=0, columnspan=2, sticky="w", padx=15)
+
+        self.lista = ListaVirtual(self.janela)
+        self.lista.canvas.grid(row=2, column=0, sticky="nsew", padx=(15, 0), pady=15)
+        self.lista.scrollbar.grid(row=2, column=1, sticky="ns", padx=(0, 15), pady=15)
+
+        self.mostrar_dia(dia)
+
+    def mostrar_dia(self, dia):
+        """Lê o cronograma em segundo plano (o projeto pode precisar recarregar)"""
+        self.info_label.configure(text=f"⏳ Carregando Dia {dia}...")
+        threading.Thread(target=self._ler_dia, args=(dia,), daemon=True).start()
+
+    def _ler_dia(self, dia):
+        try:
+            gerador = self.app._obter_gerador()
+            if not self.app._carregar_projeto_selecionado(gerador):
+                raise RuntimeError("falha ao carregar os dados do projeto")
+            linhas = linhas_previa(gerador, dia)
+            erro = None
+        except GeracaoCancelada:
+            linhas, erro = [], "leitura interrompida pelo cancelamento da geração"
+        except Exception as e:
+            linhas, erro = [], str(e)
+        self.app._na_interface(lambda: self._exibir(dia, linhas, erro))
+
+    def _exibir(self, dia, linhas, erro):
+        if not self.janela.winfo_exists():
+            return  # janela fechada enquanto o dia carregava
+        if dia != self.dia_var.get():
+            return  # outro dia foi escolhido enquanto este carregava
+        if erro:
+            self.info_label.configure(text=f"❌ {erro}")
+        else:
+            self.info_label.configure(text=f"Dia {dia}: {len(linhas)} linhas")
+        self.lista.mostrar(linhas)
+
+
 class GeradorODGUI:
-    def __init__(self):
+    def __init__(
+        self,
+        linhas_log=LINHAS_VISIVEIS,
+        inicio=None,
+        orcamento_revisoes_mb=ORCAMENTO_PADRAO_MB,
+        revisoes_em_memoria=MAX_EM_MEMORIA_PADRAO,
+    ):
+        # Marcos da inicialização, em ms desde `inicio` (ver _marcar_inicio)
+        self._inicio = INICIO_IMPORTACAO if inicio is None else inicio
+        self.marcos_inicio = {}
         self.root = ctk.CTk()
+        # Ponte de eventos: threads de trabalho só enfileiram, a thread da
+        # interface aplica tudo a cada quadro (ver _drenar_eventos)
+        self._eventos = queue.Queue()
+        # Log na tela limitado às últimas linhas; histórico em arquivos/logs
+        self.registro_log = RegistroLog(linhas_visiveis=linhas_log)
         self.setup_window()
-        self.gerador = GeradorODCompleto()
+        # Gerador criado sob demanda, fora da thread da interface: importar
+        # pandas/openpyxl leva segundos no executável onefile
+        self.gerador = None
+        self._lock_gerador = threading.Lock()
+        # Últimas revisões carregadas: trocar entre elas não relê CSV/PDF
+        self.historico = HistoricoRevisoes(
+            PASTA_REVISOES_GUI,
+            orcamento_bytes=orcamento_revisoes_mb * 1024 * 1024,
+            max_em_memoria=revisoes_em_memoria,
+        )
+        self.revisao_selecionada = None  # None: arquivos atuais
+        self._revisoes_menu = {}  # rótulo -> id da revisão
+        # Progresso fino e botão "Cancelar" da geração em andamento
+        self.cancelamento = TokenCancelamento()
+        self._posicao_geracao = (0, 1)  # (dias concluídos, total de dias)
+        # Geração ou limpeza em andamento: só _reabilitar_botoes libera "Gerar"
+        self._ocupado = False
+        # Processos de trabalho criados na primeira geração e mantidos até
+        # a janela fechar (pandas/openpyxl importados uma vez por processo)
+        self.pool_geracao = PoolGeracao()
+        # Leitura do plano em segundo plano (pandas + PDF podem levar segundos)
+        self._carregando_dias = False
+        self._recarregar_dias = False
         self.dias_disponiveis = []
+        self.monitor = None
+        # Status dos arquivos de entrada (ver _atualizar_status_arquivos)
+        self.monitor_entrada = None
+        self._status_arquivos = None
         self.criar_interface()
-        self.verificar_arquivos_iniciais()
+
+        # Primeira pintura com o que está visível; o resto vem no próximo ciclo
+        self.root.update_idletasks()
+        self._marcar_inicio("primeira_pintura")
+        self.root.after(0, self._concluir_interface)
 
     def setup_window(self):
         """Configura a janela principal"""
@@ -100,10 +362,42 @@ class GeradorODGUI:
         self.root.grid_rowconfigure(1, weight=1)
 
     def criar_interface(self):
-        """Cria toda a interface gráfica"""
+        """Cria a parte da interface necessária para a primeira pintura"""
         self.criar_cabecalho()
         self.criar_area_principal()
+
+    def _concluir_interface(self):
+        """Depois da primeira pintura: área de progresso, rodapé e leitura dos dados"""
+        self.criar_area_progresso(self.main_frame)
         self.criar_rodape()
+        self._drenar_eventos()
+        # Verificação e carga dos dados só quando a janela estiver ociosa
+        self.root.after_idle(self.verificar_arquivos_iniciais)
+
+    def _marcar_inicio(self, marco):
+        """Registra um marco da inicialização (só a primeira ocorrência)"""
+        if marco in self.marcos_inicio:
+            return
+        self.marcos_inicio[marco] = (time.perf_counter() - self._inicio) * 1000
+        if marco == "interativa":
+            self.log(
+                f"⏱️ Inicialização: primeira pintura em "
+                f"{self.marcos_inicio.get('primeira_pintura', 0):.0f} ms, "
+                f"interativa em {self.marcos_inicio['interativa']:.0f} ms"
+            )
+
+    def _obter_gerador(self):
+        """Gerador do projeto, criado no primeiro uso"""
+        if self.gerador is None:
+            with self._lock_gerador:
+                if self.gerador is None:
+                    from gerador_od_completo import GeradorODCompleto
+
+                    gerador = GeradorODCompleto()
+                    gerador.ao_progresso = self._ao_progresso
+                    gerador.historico = self.historico
+                    self.gerador = gerador
+        return self.gerador
 
     def criar_cabecalho(self):
         """Cria o cabeçalho com título e logo"""
@@ -139,6 +433,7 @@ class GeradorODGUI:
         main_frame = ctk.CTkFrame(self.root, corner_radius=10, fg_color="#ffffff")
         main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(10, 10))
         main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame = main_frame
 
         # Warning sobre arquivos necessários
         self.criar_aviso_arquivos(main_frame)
@@ -152,8 +447,7 @@ class GeradorODGUI:
         # Botões de ação
         self.criar_botoes_acao(main_frame)
 
-        # Área de progresso
-        self.criar_area_progresso(main_frame)
+        # Área de progresso: construída depois da primeira pintura
 
     def criar_aviso_arquivos(self, parent):
         """Cria o aviso sobre arquivos necessários"""
@@ -276,6 +570,23 @@ class GeradorODGUI:
         self.dias_vars = {}
         self.dias_checkboxes = {}
 
+        # Revisão do plano usada na prévia e na geração
+        revisao_frame = ctk.CTkFrame(dias_frame, fg_color="transparent")
+        revisao_frame.grid(row=3, column=0, pady=(0, 15))
+        ctk.CTkLabel(
+            revisao_frame,
+            text="🗂️ Revisão:",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color="#212529",
+        ).grid(row=0, column=0, padx=(0, 10))
+        self.revisao_menu = ctk.CTkOptionMenu(
+            revisao_frame,
+            values=[ROTULO_REVISAO_ATUAL],
+            command=self.on_revisao_changed,
+            width=260,
+        )
+        self.revisao_menu.grid(row=0, column=1)
+
     def criar_botoes_acao(self, parent):
         """Cria os botões de ação principal"""
         botoes_frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -308,6 +619,46 @@ class GeradorODGUI:
         )
         self.btn_limpar.grid(row=0, column=1, padx=(10, 0), sticky="ew")
 
+        # Modo observação: regenera automaticamente os dias afetados
+        self.observacao_var = ctk.BooleanVar(value=False)
+        self.observacao_checkbox = ctk.CTkCheckBox(
+            botoes_frame,
+            text="👁️ Regenerar automaticamente quando os arquivos mudarem",
+            variable=self.observacao_var,
+            command=self.on_observacao_changed,
+            font=ctk.CTkFont(size=12),
+            text_color="#212529",
+            fg_color="#007bff",
+            hover_color="#0056b3",
+        )
+        self.observacao_checkbox.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+
+        # Debug: grava perfil de desempenho da próxima geração em arquivos/perfis
+        self.perfil_var = ctk.BooleanVar(value=False)
+        self.perfil_checkbox = ctk.CTkCheckBox(
+            botoes_frame,
+            text="🐞 Gravar perfil de desempenho (debug)",
+            variable=self.perfil_var,
+            font=ctk.CTkFont(size=12),
+            text_color="#212529",
+            fg_color="#6c757d",
+            hover_color="#5a6268",
+        )
+        self.perfil_checkbox.grid(row=2, column=0, columnspan=2, pady=(5, 0))
+
+        # Conferir a ordem do dia sem gerar a planilha
+        self.btn_previa = ctk.CTkButton(
+            botoes_frame,
+            text="🔎 Prévia do cronograma",
+            command=self.abrir_previa,
+            height=32,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            fg_color="#17a2b8",
+            hover_color="#138496",
+            text_color="#ffffff",
+        )
+        self.btn_previa.grid(row=3, column=0, columnspan=2, pady=(10, 0), sticky="ew")
+
     def criar_area_progresso(self, parent):
         """Cria a área de progresso e logs"""
         progress_frame = ctk.CTkFrame(parent, corner_radius=8, fg_color="#f8f9fa")
@@ -331,6 +682,53 @@ class GeradorODGUI:
         self.progress_bar.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
         self.progress_bar.set(0)
 
+        # Unidade em andamento (página, linha do cronograma) e cancelamento
+        status_frame = ctk.CTkFrame(progress_frame, fg_color="transparent")
+        status_frame.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="ew")
+        status_frame.grid_columnconfigure(0, weight=1)
+
+        self.progresso_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#6c757d",
+            anchor="w",
+        )
+        self.progresso_label.grid(row=0, column=0, sticky="ew")
+
+        self.btn_cancelar = ctk.CTkButton(
+            status_frame,
+            text="⏹️ Cancelar",
+            command=self.cancelar_geracao,
+            width=110,
+            height=28,
+            state="disabled",
+            fg_color="#6c757d",
+            hover_color="#5a6268",
+            text_color="#ffffff",
+        )
+        self.btn_cancelar.grid(row=0, column=1, padx=(10, 0))
+
+        self.btn_salvar_log = ctk.CTkButton(
+            status_frame,
+            text="💾 Salvar log",
+            command=self.salvar_log_completo,
+            width=110,
+            height=28,
+            fg_color="#6c757d",
+            hover_color="#5a6268",
+            text_color="#ffffff",
+        )
+        self.btn_salvar_log.grid(row=0, column=2, padx=(10, 0))
+
+        # Uma linha por dia da geração em andamento (status e tempo)
+        self.status_dias_frame = ctk.CTkScrollableFrame(
+            progress_frame, height=90, fg_color="#ffffff"
+        )
+        self.status_dias_frame.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.status_dias_frame.grid_columnconfigure(0, weight=1)
+        self.status_dias_labels = {}
+
         # Área de texto para logs
         self.log_text = ctk.CTkTextbox(
             progress_frame,
@@ -340,7 +738,7 @@ class GeradorODGUI:
             fg_color="#ffffff",
             text_color="#212529",
         )
-        self.log_text.grid(row=2, column=0, padx=20, pady=(0, 15), sticky="nsew")
+        self.log_text.grid(row=4, column=0, padx=20, pady=(0, 15), sticky="nsew")
 
     def criar_rodape(self):
         """Cria o rodapé"""
@@ -360,124 +758,229 @@ class GeradorODGUI:
         footer_label.grid(row=0, column=0, pady=15)
 
     def verificar_arquivos_iniciais(self):
-        """Verifica arquivos na inicialização"""
+        """Verifica arquivos na inicialização e passa a observá-los"""
         self.log("🚀 Sistema iniciado - verificando arquivos...")
         self.verificar_arquivos()
+        # O monitor calcula os digests iniciais: fora da thread da interface
+        threading.Thread(target=self._iniciar_monitor_entrada, daemon=True).start()
+
+    def _iniciar_monitor_entrada(self):
+        """Observa os arquivos de entrada (inotify ou os.stat a cada poucos segundos)"""
+        monitor = MonitorArquivos(
+            ARQUIVOS_ENTRADA,
+            lambda alterados: self._na_interface(
+                lambda: self._ao_mudar_arquivos_entrada(alterados)
+            ),
+            intervalo=INTERVALO_STATUS_ARQUIVOS,
+        )
+        monitor.iniciar()
+        self.monitor_entrada = monitor
 
-    def verificar_arquivos_com_toast(self):
-        """Verifica arquivos e exibe toast com resultado"""
-        self.log("🔍 Verificando arquivos necessários...")
+    def _existencia_arquivos(self):
+        return {caminho: os.path.exists(caminho) for caminho in ARQUIVOS_ENTRADA}
 
-        # Verificar DECUPAGEM.csv
-        decupagem_existe = os.path.exists("arquivos/DECUPAGEM.csv")
-        if decupagem_existe:
-            self.decupagem_status.configure(
-                text="✅ DECUPAGEM.csv", text_color="#28a745"
-            )
-            self.log("✅ DECUPAGEM.csv encontrado")
-        else:
-            self.decupagem_status.configure(
-                text="❌ DECUPAGEM.csv", text_color="#dc3545"
+    def _atualizar_status_arquivos(self, existencia):
+        """Atualiza rótulos e botão de gerar só quando a existência muda"""
+        if existencia == self._status_arquivos:
+            return
+        self._status_arquivos = existencia
+
+        rotulos = {
+            ARQUIVO_DECUPAGEM_GUI: self.decupagem_status,
+            ARQUIVO_PLANO_GUI: self.plano_status,
+        }
+        for caminho, rotulo in rotulos.items():
+            nome = os.path.basename(caminho)
+            if existencia[caminho]:
+                rotulo.configure(text=f"✅ {nome}", text_color="#28a745")
+                self.log(f"✅ {nome} encontrado")
+            else:
+                rotulo.configure(text=f"❌ {nome}", text_color="#dc3545")
+                self.log(f"❌ {nome} não encontrado")
+
+        self._atualizar_botao_gerar()
+        if not all(existencia.values()):
+            self.log(
+                "⚠️ Arquivos necessários não encontrados - botão de gerar desabilitado"
             )
-            self.log("❌ DECUPAGEM.csv não encontrado")
+            self._marcar_inicio("interativa")
 
-        # Verificar PLANO_FINAL.pdf
-        plano_existe = os.path.exists("arquivos/PLANO_FINAL.pdf")
-        if plano_existe:
-            self.plano_status.configure(text="✅ PLANO_FINAL.pdf", text_color="#28a745")
-            self.log("✅ PLANO_FINAL.pdf encontrado")
+    def _atualizar_botao_gerar(self):
+        """Habilita "Gerar" só sem tarefa em andamento e sem arquivo faltando"""
+        faltando = self._status_arquivos is not None and not all(
+            self._status_arquivos.values()
+        )
+        if self._ocupado or faltando:
+            self.btn_gerar.configure(state="disabled")
         else:
-            self.plano_status.configure(text="❌ PLANO_FINAL.pdf", text_color="#dc3545")
-            self.log("❌ PLANO_FINAL.pdf não encontrado")
-
-        # Atualizar botão gerar
-        arquivos_ok = decupagem_existe and plano_existe
-        if arquivos_ok:
             self.btn_gerar.configure(state="normal")
+
+    def _ao_mudar_arquivos_entrada(self, alterados):
+        """Conteúdo de um arquivo de entrada mudou (ou ele surgiu/sumiu)"""
+        nomes = ", ".join(sorted(os.path.basename(caminho) for caminho in alterados))
+        self.log(f"📂 Arquivos de entrada alterados: {nomes}")
+        self._atualizar_status_arquivos(self._existencia_arquivos())
+        # No modo observação o monitor de regeneração já recarrega o projeto
+        if all(self._status_arquivos.values()) and not self.observacao_var.get():
             self.carregar_dias_disponiveis()
-            # Toast de sucesso
+
+    def verificar_arquivos_com_toast(self):
+        """Botão "Verificar Arquivos": sem custo se nada mudou desde a última vez"""
+        if self.monitor_entrada is None:
+            self.verificar_arquivos()
+        else:
+            # os.stat dos arquivos; o SHA-256 só se tamanho/mtime mudaram
+            alterados = self.monitor_entrada.verificar_agora()
+            if alterados:
+                self._ao_mudar_arquivos_entrada(alterados)
+
+        faltando = [
+            os.path.basename(caminho)
+            for caminho, existe in self._status_arquivos.items()
+            if not existe
+        ]
+        if faltando:
             ToastNotification(
                 self.root,
-                "✅ Todos os arquivos foram encontrados!\nSistema pronto para gerar ODs.",
-                "success",
+                f"❌ Arquivos não encontrados:\n{', '.join(faltando)}",
+                "error",
             )
         else:
-            self.btn_gerar.configure(state="disabled")
-            self.log(
-                "⚠️ Arquivos necessários não encontrados - botão de gerar desabilitado"
-            )
-            # Toast de erro
-            arquivos_faltando = []
-            if not decupagem_existe:
-                arquivos_faltando.append("DECUPAGEM.csv")
-            if not plano_existe:
-                arquivos_faltando.append("PLANO_FINAL.pdf")
-
             ToastNotification(
                 self.root,
-                f"❌ Arquivos não encontrados:\n{', '.join(arquivos_faltando)}",
-                "error",
+                "✅ Todos os arquivos foram encontrados!\nSistema pronto para gerar ODs.",
+                "success",
             )
 
     def verificar_arquivos(self):
-        """Verifica se os arquivos necessários existem (sem toast)"""
+        """Verifica se os arquivos necessários existem e carrega os dias"""
         self.log("🔍 Verificando arquivos necessários...")
+        self._status_arquivos = None
+        self._atualizar_status_arquivos(self._existencia_arquivos())
+        if all(self._status_arquivos.values()):
+            self.carregar_dias_disponiveis()
 
-        # Verificar DECUPAGEM.csv
-        decupagem_existe = os.path.exists("arquivos/DECUPAGEM.csv")
-        if decupagem_existe:
-            self.decupagem_status.configure(
-                text="✅ DECUPAGEM.csv", text_color="#28a745"
-            )
-            self.log("✅ DECUPAGEM.csv encontrado")
-        else:
-            self.decupagem_status.configure(
-                text="❌ DECUPAGEM.csv", text_color="#dc3545"
-            )
-            self.log("❌ DECUPAGEM.csv não encontrado")
+    def carregar_dias_disponiveis(self):
+        """Carrega os dias disponíveis do plano em segundo plano
 
-        # Verificar PLANO_FINAL.pdf
-        plano_existe = os.path.exists("arquivos/PLANO_FINAL.pdf")
-        if plano_existe:
-            self.plano_status.configure(text="✅ PLANO_FINAL.pdf", text_color="#28a745")
-            self.log("✅ PLANO_FINAL.pdf encontrado")
-        else:
-            self.plano_status.configure(text="❌ PLANO_FINAL.pdf", text_color="#dc3545")
-            self.log("❌ PLANO_FINAL.pdf não encontrado")
+        A janela continua responsiva; os checkboxes são preenchidos quando a
+        leitura termina. Um pedido durante a leitura é atendido logo depois.
+        """
+        if self._carregando_dias:
+            self._recarregar_dias = True
+            return
 
-        # Atualizar botão gerar
-        arquivos_ok = decupagem_existe and plano_existe
-        if arquivos_ok:
-            self.btn_gerar.configure(state="normal")
-            self.carregar_dias_disponiveis()
+        self._carregando_dias = True
+        self._recarregar_dias = False
+        self.log("📅 Carregando dias disponíveis do plano...")
+        self.mostrar_carregando_dias()
+        self.btn_gerar.configure(state="disabled")
+
+        thread = threading.Thread(target=self._ler_dias_do_plano, daemon=True)
+        thread.start()
+
+    def _ler_dias_do_plano(self):
+        """Executado em segundo plano: lê decupagem e plano pelo gerador"""
+        dias = []
+        erro = None
+        revisoes = []
+        try:
+            gerador = self._obter_gerador()
+            if self._carregar_projeto_selecionado(gerador):
+                dias = list(gerador.config["dias_filmagem"].keys())
+            else:
+                erro = "Erro ao carregar dados do plano"
+            revisoes = self.historico.listar()
+        except GeracaoCancelada:
+            erro = "Leitura do plano interrompida pelo cancelamento da geração"
+        except Exception as e:
+            erro = f"Erro ao carregar dias: {str(e)}"
+
+        self._na_interface(lambda: self._ao_carregar_dias(dias, erro, revisoes))
+
+    def _carregar_projeto_selecionado(self, gerador):
+        """Projeto da revisão escolhida em memória (fora da thread da interface)"""
+        revisao = self.revisao_selecionada
+        if revisao is None:
+            return gerador.carregar_projeto()
+        return gerador.usar_revisao(revisao)
+
+    def _ao_carregar_dias(self, dias, erro, revisoes=()):
+        """De volta à thread da interface: preenche a seleção de dias"""
+        self._carregando_dias = False
+        self._atualizar_revisoes(revisoes)
+        if erro:
+            self.log(f"❌ {erro}")
         else:
-            self.btn_gerar.configure(state="disabled")
+            self.dias_disponiveis = dias
             self.log(
-                "⚠️ Arquivos necessários não encontrados - botão de gerar desabilitado"
+                f"📅 {len(self.dias_disponiveis)} dias encontrados: {', '.join(self.dias_disponiveis)}"
             )
+        self.criar_checkboxes_dias()
+        self._atualizar_botao_gerar()
+        self._marcar_inicio("interativa")
 
-    def carregar_dias_disponiveis(self):
-        """Carrega os dias disponíveis do plano de filmagem"""
-        try:
-            self.log("📅 Carregando dias disponíveis do plano...")
+        if self._recarregar_dias:
+            self.carregar_dias_disponiveis()
 
-            # Carregar dados usando o gerador
-            if self.gerador._carregar_dados():
-                self.dias_disponiveis = list(
-                    self.gerador.config["dias_filmagem"].keys()
-                )
-                self.log(
-                    f"📅 {len(self.dias_disponiveis)} dias encontrados: {', '.join(self.dias_disponiveis)}"
-                )
-                self.criar_checkboxes_dias()
-            else:
-                self.log("❌ Erro ao carregar dados do plano")
+    def _atualizar_revisoes(self, revisoes):
+        """Preenche o seletor com as revisões do histórico (mais recente primeiro)"""
+        self._revisoes_menu = {ROTULO_REVISAO_ATUAL: None}
+        for revisao in revisoes:
+            carregada_em = datetime.fromisoformat(revisao["carregada_em"])
+            rotulo = (
+                f"🕘 {carregada_em:%d/%m %H:%M} · {revisao['dias']} dias · "
+                f"{revisao['id'][:6]}"
+            )
+            self._revisoes_menu[rotulo] = revisao["id"]
+        self.revisao_menu.configure(values=list(self._revisoes_menu))
+
+        rotulo_atual = ROTULO_REVISAO_ATUAL
+        for rotulo, revisao in self._revisoes_menu.items():
+            if revisao is not None and revisao == self.revisao_selecionada:
+                rotulo_atual = rotulo
+        if rotulo_atual == ROTULO_REVISAO_ATUAL:
+            self.revisao_selecionada = None  # revisão saiu do histórico
+        self.revisao_menu.set(rotulo_atual)
+
+    def on_revisao_changed(self, rotulo):
+        """Troca a revisão usada na prévia e na geração (sem reler CSV/PDF)"""
+        revisao = self._revisoes_menu.get(rotulo)
+        if revisao == self.revisao_selecionada:
+            return
+        self.revisao_selecionada = revisao
+        if revisao is None:
+            self.log("🗂️ Revisão: arquivos atuais")
+        else:
+            memoria = "memória" if self.historico.em_memoria(revisao) else "disco"
+            self.log(f"🗂️ Revisão: {rotulo} (da {memoria})")
+        self.carregar_dias_disponiveis()
 
-        except Exception as e:
-            self.log(f"❌ Erro ao carregar dias: {str(e)}")
+    def mostrar_carregando_dias(self):
+        """Estado de carregamento no painel de seleção de dias"""
+        for widget in self.dias_checkboxes_frame.winfo_children():
+            widget.destroy()
+        # dias_vars fica: a seleção volta em criar_checkboxes_dias
+        self.dias_checkboxes.clear()
+
+        carregando = ctk.CTkLabel(
+            self.dias_checkboxes_frame,
+            text="⏳ Lendo o plano de filmagem...",
+            font=ctk.CTkFont(size=12),
+            text_color="#6c757d",
+        )
+        carregando.grid(row=0, column=0, columnspan=3, pady=5)
 
     def criar_checkboxes_dias(self):
-        """Cria checkboxes para cada dia disponível"""
+        """Cria checkboxes para cada dia disponível
+
+        Recriados também por recargas automáticas (monitor, revisão,
+        observação): dias marcados que continuam no plano seguem marcados e
+        o estado acompanha "Todos os dias".
+        """
+        marcados = {dia for dia, var in self.dias_vars.items() if var.get()}
+        estado = "disabled" if self.todos_dias_var.get() else "normal"
+
         # Limpar checkboxes existentes
         for widget in self.dias_checkboxes_frame.winfo_children():
             widget.destroy()
@@ -487,7 +990,7 @@ class GeradorODGUI:
 
         # Criar checkboxes para cada dia
         for i, dia in enumerate(self.dias_disponiveis):
-            var = ctk.BooleanVar(value=False)
+            var = ctk.BooleanVar(value=dia in marcados)
             self.dias_vars[dia] = var
 
             checkbox = ctk.CTkCheckBox(
@@ -499,7 +1002,7 @@ class GeradorODGUI:
                 text_color="#212529",
                 fg_color="#007bff",
                 hover_color="#0056b3",
-                state="disabled",  # Inicialmente desabilitado (todos os dias selecionado)
+                state=estado,  # Desabilitado com "Todos os dias" marcado
             )
 
             # Organizar em grid (3 colunas)
@@ -532,6 +1035,87 @@ class GeradorODGUI:
         if algum_selecionado:
             self.todos_dias_var.set(False)
 
+    def on_observacao_changed(self):
+        """Liga/desliga o monitoramento de DECUPAGEM.csv e PLANO_FINAL.pdf"""
+        if self.observacao_var.get():
+            # A observação regenera a partir dos arquivos atuais
+            self.revisao_menu.configure(state="disabled")
+            if self.revisao_selecionada is not None:
+                self.revisao_menu.set(ROTULO_REVISAO_ATUAL)
+                self.on_revisao_changed(ROTULO_REVISAO_ATUAL)
+            # Sem alternar de novo até o monitor existir
+            self.observacao_checkbox.configure(state="disabled")
+            self.log("👁️ Iniciando observação de arquivos...")
+            threading.Thread(target=self._preparar_observacao, daemon=True).start()
+        else:
+            if self.monitor:
+                self.monitor.parar()
+                self.monitor = None
+            self.revisao_menu.configure(state="normal")
+            self.log("⏹️ Observação de arquivos desativada")
+
+    def _preparar_observacao(self):
+        """Executado em segundo plano: cria o gerador e os digests iniciais do monitor"""
+        monitor = None
+        erro = None
+        try:
+            gerador = self._obter_gerador()
+            monitor = MonitorArquivos(
+                [gerador.arquivo_decupagem, gerador.arquivo_plano]
+            )
+            # A recarga reaproveita os digests que o monitor acabou de calcular
+            monitor.ao_alterar = functools.partial(
+                self._ao_alterar_arquivos, fontes=monitor
+            )
+        except Exception as e:
+            erro = f"Erro ao iniciar a observação: {str(e)}"
+
+        self._na_interface(lambda: self._ao_preparar_observacao(monitor, erro))
+
+    def _ao_preparar_observacao(self, monitor, erro):
+        """De volta à thread da interface: inicia o monitor preparado"""
+        self.observacao_checkbox.configure(state="normal")
+        if erro:
+            self.log(f"❌ {erro}")
+            self.observacao_var.set(False)
+            self.revisao_menu.configure(state="normal")
+            return
+
+        self.monitor = monitor
+        self.monitor.iniciar()
+        self.log(f"👁️ Observação de arquivos ativada ({self.monitor.backend})")
+
+    def _ao_alterar_arquivos(self, alterados, fontes=None):
+        """Executado na thread do monitor: regenera apenas os dias afetados"""
+        nomes = ", ".join(sorted(os.path.basename(caminho) for caminho in alterados))
+        self.log(f"🔄 Alteração detectada: {nomes}")
+
+        gerador = self._obter_gerador()
+        try:
+            dias = gerador.recarregar_fontes(alterados, fontes)
+            if not dias:
+                self.log("✅ Nenhuma OD afetada pela alteração")
+                return
+
+            for dia in dias:
+                if gerador.renderizar_od_dia(int(dia)):
+                    self.log(f"✅ OD do Dia {dia} regenerada")
+                else:
+                    self.log(f"❌ Falha ao regenerar OD do Dia {dia}")
+        except GeracaoCancelada:
+            # Geração manual cancelada enquanto a observação usava o gerador
+            self.log("⏹️ Regeneração interrompida pelo cancelamento")
+            return
+
+        # Dias podem ter sido incluídos ou removidos do plano
+        dias_disponiveis = list(gerador.config["dias_filmagem"].keys())
+        self._na_interface(lambda: self._ao_recarregar_fontes(dias_disponiveis))
+
+    def _ao_recarregar_fontes(self, dias):
+        """De volta à thread da interface: atualiza os dias após a observação"""
+        self.dias_disponiveis = dias
+        self.criar_checkboxes_dias()
+
     def abrir_pasta_arquivos(self):
         """Abre a pasta arquivos no explorador"""
         try:
@@ -546,38 +1130,127 @@ class GeradorODGUI:
             self.log(f"❌ Erro ao abrir pasta: {str(e)}")
             messagebox.showerror("Erro", f"Não foi possível abrir a pasta: {str(e)}")
 
+    def abrir_previa(self):
+        """Abre a prévia do primeiro dia selecionado (sem montar planilha)"""
+        if not self.dias_disponiveis:
+            messagebox.showinfo("Info", "Nenhum dia carregado para mostrar.")
+            return
+        selecionados = [dia for dia, var in self.dias_vars.items() if var.get()]
+        JanelaPrevia(self, (selecionados or self.dias_disponiveis)[0])
+
     def limpar_ods(self):
-        """Remove todas as ODs existentes"""
-        try:
-            pasta_ods = Path("arquivos/ODs")
-            if not pasta_ods.exists():
-                messagebox.showinfo("Info", "Nenhuma OD encontrada para limpar.")
-                return
+        """Levanta as ODs existentes em segundo plano e pede confirmação"""
+        self._bloquear_botoes()
+        self._definir_status("🔎 Procurando ODs...")
+        threading.Thread(target=self._levantar_ods, daemon=True).start()
+
+    def _bloquear_botoes(self):
+        """Desabilita as ações que mexem nos arquivos enquanto uma roda"""
+        self._ocupado = True
+        self.btn_gerar.configure(state="disabled")
+        self.btn_limpar.configure(state="disabled")
+        self.btn_verificar.configure(state="disabled")
+        self.revisao_menu.configure(state="disabled")
 
-            arquivos_od = list(pasta_ods.glob("OD_Dia_*.xlsx"))
-            if not arquivos_od:
-                messagebox.showinfo("Info", "Nenhuma OD encontrada para limpar.")
-                return
+    def _levantar_ods(self):
+        """Lista as ODs da pasta de saída (fora da thread da interface)"""
+        try:
+            arquivos_od = listar_ods(PASTA_ODS_GUI)
+        except Exception as e:
+            self._falha_limpeza(e)
+            self._na_interface(self._reabilitar_botoes)
+            return
+        self._definir_status("")
+        self._na_interface(lambda: self._confirmar_limpeza(arquivos_od))
+
+    def _confirmar_limpeza(self, arquivos_od):
+        """Pergunta entre arquivar e excluir as ODs encontradas"""
+        if not arquivos_od:
+            messagebox.showinfo("Info", "Nenhuma OD encontrada para limpar.")
+            self._reabilitar_botoes()
+            return
 
-            resposta = messagebox.askyesno(
-                "Confirmar Limpeza",
-                f"Tem certeza que deseja remover {len(arquivos_od)} arquivo(s) de OD existente(s)?",
-            )
+        # Só "Sim" nas duas perguntas exclui: "Não" nunca apaga nada
+        arquivar = messagebox.askyesnocancel(
+            "Limpar ODs",
+            f"{len(arquivos_od)} arquivo(s) de OD encontrado(s).\n\n"
+            f"Sim: arquivar a pasta inteira (ODs, métricas e logs da geração) "
+            f"em {PASTA_ARQUIVO_ODS_GUI}/\n"
+            "Não: excluir as ODs (métricas e logs ficam na pasta)\n"
+            "Cancelar: manter tudo",
+        )
+        if arquivar is None:
+            self._reabilitar_botoes()
+            return
+        if not arquivar and not messagebox.askyesno(
+            "Confirmar Exclusão",
+            f"Excluir definitivamente {len(arquivos_od)} arquivo(s) de OD?\n\n"
+            "Esta ação não pode ser desfeita.",
+            icon=messagebox.WARNING,
+            default=messagebox.NO,
+        ):
+            self._reabilitar_botoes()
+            return
 
-            if resposta:
-                for arquivo in arquivos_od:
-                    arquivo.unlink()
-                    self.log(f"🗑️ Removido: {arquivo.name}")
+        threading.Thread(
+            target=self._executar_limpeza, args=(arquivos_od, arquivar), daemon=True
+        ).start()
 
-                self.log(f"✅ {len(arquivos_od)} arquivo(s) de OD removido(s)")
-                messagebox.showinfo(
-                    "Sucesso",
-                    f"{len(arquivos_od)} arquivo(s) de OD removido(s) com sucesso!",
+    def _executar_limpeza(self, arquivos_od, arquivar):
+        """Arquiva (um rename) ou exclui as ODs, com progresso na interface"""
+        total = len(arquivos_od)
+        try:
+            if arquivar:
+                self._definir_status("📦 Arquivando ODs...")
+                destino = arquivar_pasta_ods(PASTA_ODS_GUI, PASTA_ARQUIVO_ODS_GUI)
+                self.log(f"📦 {total} arquivo(s) de OD arquivado(s) em {destino}")
+                self._na_interface(
+                    lambda: messagebox.showinfo(
+                        "Sucesso",
+                        f"{total} arquivo(s) de OD arquivado(s) em:\n{destino}",
+                    )
                 )
+                return
+
+            def ao_progresso(atual, total):
+                self._definir_progresso(atual / total)
+                self._definir_status(f"🗑️ Removendo ODs: {atual}/{total}")
 
+            removidos, erros = excluir_ods(arquivos_od, ao_progresso)
+            for arquivo, erro in erros:
+                self.log(
+                    f"❌ Não foi possível remover {os.path.basename(arquivo)}: {erro}"
+                )
+            self.log(f"✅ {removidos} arquivo(s) de OD removido(s)")
+            if erros:
+                self._na_interface(
+                    lambda: messagebox.showwarning(
+                        "Concluído com Avisos",
+                        f"✅ {removidos} OD(s) removida(s)\n"
+                        f"❌ {len(erros)} não removida(s)\n\nVerifique o log para detalhes.",
+                    )
+                )
+            else:
+                self._na_interface(
+                    lambda: messagebox.showinfo(
+                        "Sucesso",
+                        f"{removidos} arquivo(s) de OD removido(s) com sucesso!",
+                    )
+                )
         except Exception as e:
-            self.log(f"❌ Erro ao limpar ODs: {str(e)}")
-            messagebox.showerror("Erro", f"Erro ao limpar ODs: {str(e)}")
+            self._falha_limpeza(e)
+        finally:
+            self._definir_status("")
+            self._na_interface(self._reabilitar_botoes)
+
+    def _falha_limpeza(self, e):
+        """Registra o erro da limpeza e avisa na interface"""
+        erro = str(e)
+        self.log(f"❌ Erro ao limpar ODs: {erro}")
+        self._definir_status("")
+        self._na_interface(
+            lambda: messagebox.showerror("Erro", f"Erro ao limpar ODs: {erro}")
+        )
 
     def gerar_ods(self):
         """Gera as ODs selecionadas"""
@@ -594,9 +1267,10 @@ class GeradorODGUI:
 
         self.log(f"🎬 Iniciando geração de ODs para: {', '.join(dias_para_gerar)}")
 
-        # Desabilitar botões durante geração
-        self.btn_gerar.configure(state="disabled")
-        self.btn_limpar.configure(state="disabled")
+        # Desabilitar botões durante geração (sem recarga no meio)
+        self._bloquear_botoes()
+        self.cancelamento.reiniciar()
+        self.btn_cancelar.configure(state="normal")
 
         # Executar geração em thread separada
         thread = threading.Thread(
@@ -608,29 +1282,35 @@ class GeradorODGUI:
         """Executa a geração das ODs em thread separada"""
         try:
             total_dias = len(dias_para_gerar)
-            sucessos = 0
-            falhas = 0
-
-            self.progress_bar.set(0)
-
-            for i, dia in enumerate(dias_para_gerar):
-                self.log(f"📅 Processando Dia {dia}...")
-
-                try:
-                    if self.gerador.gerar_od_dia(int(dia)):
-                        sucessos += 1
-                        self.log(f"✅ OD do Dia {dia} gerada com sucesso!")
-                    else:
-                        falhas += 1
-                        self.log(f"❌ Falha ao gerar OD do Dia {dia}")
-
-                except Exception as e:
-                    falhas += 1
-                    self.log(f"❌ Erro ao gerar OD do Dia {dia}: {str(e)}")
+            # Token só durante esta geração: leituras em segundo plano e a
+            # observação usam o mesmo gerador e não devem ser canceladas
+            self._obter_gerador().cancelamento = self.cancelamento
 
-                # Atualizar progresso
-                progresso = (i + 1) / total_dias
-                self.progress_bar.set(progresso)
+            if self.perfil_var.get():
+                # O perfil só enxerga este processo: nada de processos de trabalho
+                self.log(
+                    "🐞 Perfil ativo: dias gerados neste processo, sem paralelismo"
+                )
+                (sucessos, falhas), arquivos = executar_com_perfil(
+                    functools.partial(self._gerar_dias, dias_para_gerar, workers=1),
+                    nome="perfil_gui",
+                    pilhas=True,
+                )
+                self.log("📈 Perfil de desempenho gravado:")
+                for caminho in arquivos.values():
+                    self.log(f"   {caminho}")
+            else:
+                sucessos, falhas = self._gerar_dias(dias_para_gerar)
+
+            if self.cancelamento.cancelado:
+                self.log(f"\n⏹️ Geração cancelada: {sucessos} OD(s) gerada(s)")
+                self._na_interface(
+                    lambda: messagebox.showinfo(
+                        "Cancelado",
+                        f"Geração cancelada.\n✅ {sucessos} OD(s) gerada(s) antes do cancelamento.",
+                    )
+                )
+                return
 
             # Resultado final
             self.log(f"\n📊 Geração concluída:")
@@ -640,33 +1320,252 @@ class GeradorODGUI:
 
             # Mostrar resultado
             if falhas == 0:
-                messagebox.showinfo(
-                    "Sucesso!", f"Todas as {sucessos} ODs foram geradas com sucesso! 🎉"
+                self._na_interface(
+                    lambda: messagebox.showinfo(
+                        "Sucesso!",
+                        f"Todas as {sucessos} ODs foram geradas com sucesso! 🎉",
+                    )
                 )
             else:
-                messagebox.showwarning(
-                    "Concluído com Avisos",
-                    f"Geração concluída:\n✅ {sucessos} sucessos\n❌ {falhas} falhas\n\nVerifique o log para detalhes.",
+                self._na_interface(
+                    lambda: messagebox.showwarning(
+                        "Concluído com Avisos",
+                        f"Geração concluída:\n✅ {sucessos} sucessos\n❌ {falhas} falhas\n\nVerifique o log para detalhes.",
+                    )
                 )
 
         except Exception as e:
             self.log(f"❌ Erro geral na geração: {str(e)}")
-            messagebox.showerror("Erro", f"Erro durante a geração: {str(e)}")
+            erro = str(e)
+            self._na_interface(
+                lambda: messagebox.showerror("Erro", f"Erro durante a geração: {erro}")
+            )
 
         finally:
-            # Reabilitar botões
-            self.btn_gerar.configure(state="normal")
-            self.btn_limpar.configure(state="normal")
+            if self.gerador is not None:
+                self.gerador.cancelamento = None
+            self._definir_status("")
+            self._na_interface(self._reabilitar_botoes)
+            self.cancelamento.reiniciar()
+
+    def _reabilitar_botoes(self):
+        """Volta os botões ao estado de espera após uma geração ou limpeza"""
+        self._ocupado = False
+        self._atualizar_botao_gerar()
+        self.btn_limpar.configure(state="normal")
+        self.btn_verificar.configure(state="normal")
+        if not self.observacao_var.get():
+            self.revisao_menu.configure(state="normal")
+        self.btn_cancelar.configure(state="disabled")
+
+    def cancelar_geracao(self):
+        """Pede o cancelamento; a OD em andamento é descartada, as gravadas ficam"""
+        self.cancelamento.cancelar()
+        self.btn_cancelar.configure(state="disabled")
+        self.log("⏹️ Cancelando geração...")
+
+    def salvar_log_completo(self):
+        """Salva o histórico completo do log (não só as linhas na tela)"""
+        destino = filedialog.asksaveasfilename(
+            title="Salvar log completo",
+            defaultextension=".log",
+            initialfile=f"log_od_{datetime.now():%Y%m%d_%H%M%S}.log",
+            filetypes=[("Arquivos de log", "*.log"), ("Todos os arquivos", "*.*")],
+        )
+        if not destino:
+            return
+        try:
+            total = self.registro_log.salvar_completo(destino)
+            self.log(f"💾 Log completo salvo ({total} linhas): {destino}")
+        except OSError as e:
+            self.log(f"❌ Erro ao salvar log: {str(e)}")
+            messagebox.showerror("Erro", f"Não foi possível salvar o log: {str(e)}")
+
+    def _ao_progresso(self, unidade, atual, total, dia):
+        """Callback de progresso do gerador: página, diária e linha do cronograma"""
+        if unidade == UNIDADE_PAGINA:
+            self._definir_status(f"📄 Lendo página {atual}/{total} do plano")
+        elif unidade == UNIDADE_DIARIA:
+            self._definir_status(f"🔍 Analisando diária {dia} do plano")
+        elif unidade == UNIDADE_LINHA:
+            self._definir_status(f"📝 Dia {dia}: linha {atual}/{total} do cronograma")
+            concluidos, total_dias = self._posicao_geracao
+            self._definir_progresso((concluidos + atual / total) / total_dias)
+
+    def _gerar_dias(self, dias_para_gerar, workers=None):
+        """Gera as ODs dos dias, atualizando log e progresso; retorna (sucessos, falhas)
+
+        Com workers=1 tudo roda neste processo, sem o pool de processos.
+        """
+        total_dias = len(dias_para_gerar)
+        sucessos = 0
+        falhas = 0
+
+        self._definir_progresso(0)
+
+        # Projeto lido uma vez (ou reaproveitado da listagem dos dias) para
+        # todos os dias selecionados
+        gerador = self._obter_gerador()
+        gerador.metricas.reiniciar()
+        try:
+            carregado = self._carregar_projeto_selecionado(gerador)
+        except GeracaoCancelada:
+            self.log("⏹️ Leitura do projeto interrompida")
+            return sucessos, falhas
+        if not carregado:
+            self.log("❌ Falha ao carregar os dados do projeto")
+            return sucessos, total_dias
+        if self.revisao_selecionada is not None:
+            self.log(f"🗂️ Gerando a partir da revisão {self.revisao_selecionada}")
+
+        # Dias distribuídos entre processos (um núcleo fica para a interface)
+        self._posicao_geracao = (0, total_dias)
+        self._na_interface(lambda: self._mostrar_status_dias(dias_para_gerar))
+        finalizados = []
+
+        def ao_status(dia, status, ms):
+            self._definir_status_dia(dia, status, ms)
+            if status in (STATUS_CONCLUIDO, STATUS_FALHOU):
+                finalizados.append(dia)
+                self._posicao_geracao = (len(finalizados), total_dias)
+                self._definir_progresso(len(finalizados) / total_dias)
+
+        resultados = gerar_dias_em_paralelo(
+            self.gerador,
+            dias_para_gerar,
+            workers=workers,
+            ao_status=ao_status,
+            cancelamento=self.cancelamento,
+            pool=self.pool_geracao,
+        )
+
+        # Resultado na ordem dos dias selecionados, não na de conclusão
+        for resultado in resultados:
+            dia = resultado["dia"]
+            if resultado["sucesso"]:
+                sucessos += 1
+                self.log(f"✅ OD do Dia {dia} gerada ({resultado['ms']} ms)")
+            else:
+                falhas += 1
+                self.log(f"❌ Falha ao gerar OD do Dia {dia}: {resultado['erro']}")
+
+        if len(resultados) < total_dias:
+            self.log(
+                f"⏹️ {total_dias - len(resultados)} dia(s) não gerado(s); "
+                "as ODs já gravadas continuam íntegras"
+            )
+
+        return sucessos, falhas
+
+    def _mostrar_status_dias(self, dias):
+        """Recria a lista de status com uma linha por dia"""
+        for widget in self.status_dias_frame.winfo_children():
+            widget.destroy()
+        self.status_dias_labels = {}
+        for linha, dia in enumerate(dias):
+            label = ctk.CTkLabel(
+                self.status_dias_frame,
+                text=self._texto_status_dia(dia, STATUS_NA_FILA, None),
+                font=ctk.CTkFont(family="Consolas", size=11),
+                text_color="#212529",
+                anchor="w",
+            )
+            label.grid(row=linha, column=0, sticky="ew", padx=5)
+            self.status_dias_labels[str(dia)] = label
+
+    @staticmethod
+    def _texto_status_dia(dia, status, ms):
+        texto = f"Dia {dia:>3}  {TEXTO_STATUS_DIA.get(status, status)}"
+        if ms is not None:
+            texto += f" ({ms} ms)"
+        return texto
 
     def log(self, mensagem):
-        """Adiciona mensagem ao log"""
-        self.log_text.insert("end", f"{mensagem}\n")
-        self.log_text.see("end")
-        self.root.update_idletasks()
+        """Adiciona mensagem ao log (seguro a partir de qualquer thread)"""
+        self._eventos.put(("log", mensagem))
+
+    def _definir_progresso(self, fracao):
+        """Atualiza a barra de progresso (seguro a partir de qualquer thread)"""
+        self._eventos.put(("progresso", fracao))
+
+    def _definir_status(self, texto):
+        """Atualiza a linha de status (seguro a partir de qualquer thread)"""
+        self._eventos.put(("status", texto))
+
+    def _definir_status_dia(self, dia, status, ms):
+        """Atualiza a linha de um dia (seguro a partir de qualquer thread)"""
+        self._eventos.put(("dia", (str(dia), status, ms)))
+
+    def _na_interface(self, funcao):
+        """Agenda `funcao` para rodar na thread da interface"""
+        self._eventos.put(("chamar", funcao))
+
+    def _drenar_eventos(self):
+        """Aplica os eventos pendentes, uma vez por quadro
+
+        Linhas de log chegam ao widget num único insert (e as mais antigas
+        saem, mantendo o widget com no máximo registro_log.linhas_visiveis
+        linhas); de progresso, status e da linha de cada dia vale só o último
+        valor do quadro.
+        """
+        linhas = []
+        progresso = None
+        status = None
+        status_dias = {}
+        chamadas = []
+        while True:
+            try:
+                tipo, valor = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == "log":
+                linhas.append(valor)
+            elif tipo == "progresso":
+                progresso = valor
+            elif tipo == "status":
+                status = valor
+            elif tipo == "dia":
+                dia, status_dia, ms = valor
+                status_dias[dia] = (status_dia, ms)
+            else:
+                chamadas.append(valor)
+
+        try:
+            if linhas:
+                texto, descartar = self.registro_log.adicionar(linhas)
+                if descartar:
+                    # Linhas antigas saem da tela (continuam no arquivo)
+                    self.log_text.delete("1.0", f"{descartar + 1}.0")
+                self.log_text.insert("end", texto)
+                self.log_text.see("end")
+            if progresso is not None:
+                self.progress_bar.set(progresso)
+            if status is not None:
+                self.progresso_label.configure(text=status)
+            for chamada in chamadas:
+                # Uma chamada com erro (ex.: janela já fechada) não derruba as
+                # demais do quadro, como a que reabilita os botões
+                try:
+                    chamada()
+                except Exception as e:
+                    self.log(f"❌ Erro ao atualizar a interface: {str(e)}")
+            # Depois das chamadas, que podem ter criado as linhas dos dias
+            for dia, (status_dia, ms) in status_dias.items():
+                label = self.status_dias_labels.get(dia)
+                if label is not None:
+                    label.configure(text=self._texto_status_dia(dia, status_dia, ms))
+        finally:
+            self.root.after(INTERVALO_INTERFACE_MS, self._drenar_eventos)
 
     def run(self):
         """Inicia a aplicação"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.monitor_entrada:
+                self.monitor_entrada.parar()
+            self.pool_geracao.fechar()
+            self.registro_log.fechar()
 
 
 def main():
@@ -681,4 +1580,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
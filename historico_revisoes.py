@@ -0,0 +1,195 @@
+"""
+Histórico de Revisões do Projeto
+Últimas revisões carregadas (uma por par de digests das fontes), mantidas em
+memória num cache LRU limitado por quantidade e por orçamento de bytes, com
+um snapshot binário por revisão em disco. Trocar de revisão não relê CSV/PDF:
+vem da memória ou, se já foi descartada de lá, do snapshot da revisão.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from snapshot_projeto import carregar_snapshot, salvar_snapshot
+
+ORCAMENTO_PADRAO_MB = 64
+MAX_EM_MEMORIA_PADRAO = 5
+MAX_EM_DISCO_PADRAO = 20
+
+
+def id_revisao(digests):
+    """Identificador curto da revisão a partir dos digests (decupagem, plano)"""
+    return f"{digests[0].hex()[:12]}-{digests[1].hex()[:12]}"
+
+
+def tamanho_em_memoria(objeto):
+    """Estimativa dos bytes ocupados por um estado do projeto (dict/list aninhados)"""
+    vistos = set()
+    pendentes = [objeto]
+    total = 0
+    while pendentes:
+        atual = pendentes.pop()
+        if id(atual) in vistos:
+            continue
+        vistos.add(id(atual))
+        total += sys.getsizeof(atual)
+        if isinstance(atual, dict):
+            pendentes.extend(atual.keys())
+            pendentes.extend(atual.values())
+        elif isinstance(atual, (list, tuple, set, frozenset)):
+            pendentes.extend(atual)
+    return total
+
+
+class HistoricoRevisoes:
+    """Revisões do projeto já carregadas, da mais recente para a mais antiga
+
+    Em memória ficam no máximo `max_em_memoria` estados, somando até
+    `orcamento_bytes`; os menos usados saem primeiro. Em disco ficam as
+    últimas `max_em_disco` revisões (snapshot + índice JSON na `pasta`).
+    Os estados guardados são compartilhados com o gerador e tratados como
+    somente leitura (cada carga monta dicionários novos).
+    """
+
+    def __init__(
+        self,
+        pasta,
+        orcamento_bytes=ORCAMENTO_PADRAO_MB * 1024 * 1024,
+        max_em_memoria=MAX_EM_MEMORIA_PADRAO,
+        max_em_disco=MAX_EM_DISCO_PADRAO,
+    ):
+        self.pasta = pasta
+        self.arquivo_indice = os.path.join(pasta, "revisoes.json")
+        self.orcamento_bytes = orcamento_bytes
+        self.max_em_memoria = max(1, max_em_memoria)
+        self.max_em_disco = max(1, max_em_disco)
+        self._memoria = OrderedDict()  # id -> (dados, bytes)
+        self._revisoes = None  # índice lido do disco no primeiro uso
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_em_memoria(self):
+        with self._lock:
+            return sum(tamanho for _, tamanho in self._memoria.values())
+
+    def em_memoria(self, revisao):
+        with self._lock:
+            return revisao in self._memoria
+
+    def listar(self):
+        """Revisões conhecidas, da carregada mais recentemente para a mais antiga"""
+        with self._lock:
+            return [dict(revisao) for revisao in self._indice()]
+
+    def digests(self, revisao):
+        """Digests (decupagem, plano) da revisão, ou None se desconhecida"""
+        with self._lock:
+            meta = self._meta(revisao)
+        if meta is None:
+            return None
+        return bytes.fromhex(meta["decupagem"]), bytes.fromhex(meta["plano"])
+
+    def registrar(self, digests, dados, snapshot=None):
+        """Registra o estado carregado das fontes com `digests`; retorna o id
+
+        `snapshot` é o snapshot do projeto já gravado para esses digests: a
+        revisão em disco vira um link para ele em vez de serializar de novo.
+        """
+        revisao = id_revisao(digests)
+        projeto = dados["config"].get("projeto", {})
+        meta = {
+            "id": revisao,
+            "decupagem": digests[0].hex(),
+            "plano": digests[1].hex(),
+            "carregada_em": datetime.now().isoformat(timespec="seconds"),
+            "titulo": projeto.get("titulo", ""),
+            "dias": len(dados["config"].get("dias_filmagem", {})),
+            "cenas": len(dados["dados_decupagem"]),
+        }
+
+        with self._lock:
+            caminho = self._caminho(revisao)
+            if not os.path.exists(caminho):
+                self._gravar_snapshot(caminho, digests, dados, snapshot)
+
+            revisoes = [r for r in self._indice() if r["id"] != revisao]
+            revisoes.insert(0, meta)
+            for antiga in revisoes[self.max_em_disco :]:
+                self._memoria.pop(antiga["id"], None)
+                try:
+                    os.remove(self._caminho(antiga["id"]))
+                except OSError:
+                    pass
+            self._revisoes = revisoes[: self.max_em_disco]
+            self._gravar_indice()
+            self._guardar(revisao, dados)
+        return revisao
+
+    def obter(self, revisao):
+        """Estado da revisão (memória ou snapshot em disco); None se indisponível"""
+        with self._lock:
+            if revisao in self._memoria:
+                self._memoria.move_to_end(revisao)
+                return self._memoria[revisao][0]
+            meta = self._meta(revisao)
+            if meta is None:
+                return None
+
+            digests = bytes.fromhex(meta["decupagem"]), bytes.fromhex(meta["plano"])
+            dados = carregar_snapshot(self._caminho(revisao), digests)
+            if dados is None:
+                return None
+            self._guardar(revisao, dados)
+            return dados
+
+    def _guardar(self, revisao, dados):
+        """Coloca o estado no LRU e descarta os menos usados acima dos limites"""
+        tamanho = tamanho_em_memoria(dados)
+        self._memoria.pop(revisao, None)
+        if tamanho > self.orcamento_bytes:
+            return  # maior que o orçamento inteiro: fica só em disco
+        self._memoria[revisao] = (dados, tamanho)
+        total = sum(t for _, t in self._memoria.values())
+        while len(self._memoria) > self.max_em_memoria or total > self.orcamento_bytes:
+            _, (_, liberado) = self._memoria.popitem(last=False)
+            total -= liberado
+
+    def _gravar_snapshot(self, caminho, digests, dados, snapshot):
+        # O snapshot do projeto é sempre substituído por rename, então o
+        # link continua apontando para o conteúdo desta revisão
+        if snapshot and os.path.exists(snapshot):
+            os.makedirs(self.pasta, exist_ok=True)
+            try:
+                os.link(snapshot, caminho)
+                return
+            except OSError:
+                pass
+        salvar_snapshot(caminho, digests, dados)
+
+    def _caminho(self, revisao):
+        return os.path.join(self.pasta, f"{revisao}.odsnap")
+
+    def _meta(self, revisao):
+        for meta in self._indice():
+            if meta["id"] == revisao:
+                return meta
+        return None
+
+    def _indice(self):
+        if self._revisoes is None:
+            try:
+                with open(self.arquivo_indice, "r", encoding="utf-8") as f:
+                    self._revisoes = json.load(f)
+            except (OSError, ValueError):
+                self._revisoes = []
+        return self._revisoes
+
+    def _gravar_indice(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{self.arquivo_indice}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self._revisoes, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.arquivo_indice)
@@ -0,0 +1,61 @@
+"""
+Limpeza da Pasta de ODs
+Levantamento, exclusão e arquivamento das ODs geradas. Feito para rodar fora
+da thread da interface: a pasta pode ter centenas de ODs ou estar na rede.
+"""
+
+import os
+import re
+from datetime import datetime
+
+PADRAO_OD = re.compile(r"^OD_Dia_.+\.xlsx$")
+PASTA_ARQUIVO_PADRAO = "arquivos/ODs_arquivo"
+
+
+def listar_ods(pasta_ods):
+    """Caminhos das ODs (OD_Dia_*.xlsx) da pasta, em ordem; [] se não existir"""
+    try:
+        with os.scandir(pasta_ods) as entradas:
+            nomes = [
+                entrada.name
+                for entrada in entradas
+                if PADRAO_OD.match(entrada.name) and entrada.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    return [os.path.join(pasta_ods, nome) for nome in sorted(nomes)]
+
+
+def excluir_ods(arquivos, ao_progresso=None):
+    """Remove os arquivos um a um; retorna (removidos, [(arquivo, erro)])"""
+    removidos = 0
+    erros = []
+    for indice, arquivo in enumerate(arquivos, start=1):
+        try:
+            os.remove(arquivo)
+            removidos += 1
+        except OSError as e:
+            erros.append((arquivo, str(e)))
+        if ao_progresso:
+            ao_progresso(indice, len(arquivos))
+    return removidos, erros
+
+
+def arquivar_pasta_ods(pasta_ods, pasta_arquivo=PASTA_ARQUIVO_PADRAO, agora=None):
+    """Move a pasta de ODs inteira para um arquivo datado e recria a pasta vazia
+
+    Um único rename, independente do número de ODs. `pasta_arquivo` deve
+    ficar no mesmo disco que `pasta_ods`. Retorna o caminho do arquivo.
+    """
+    agora = agora or datetime.now()
+    os.makedirs(pasta_arquivo, exist_ok=True)
+    base = os.path.join(pasta_arquivo, f"ODs_{agora:%Y-%m-%d_%H%M%S}")
+    destino = base
+    sufixo = 2
+    while os.path.exists(destino):
+        destino = f"{base}_{sufixo}"
+        sufixo += 1
+
+    os.rename(pasta_ods, destino)
+    os.makedirs(pasta_ods, exist_ok=True)
+    return destino
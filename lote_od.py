@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Geração em Lote de ODs
+Processa várias pastas de produção (cada uma com seu arquivos/) em uma única
+execução, distribuindo os projetos entre processos de trabalho
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+NOME_LOG_PROJETO = "geracao_lote.log"
+
+
+def _processar_projeto(pasta_projeto, rastrear=False):
+    """Carrega um projeto e gera todas as ODs (executado no processo de trabalho)
+
+    A saída detalhada do gerador vai para arquivos/ODs/geracao_lote.log do
+    próprio projeto, para não misturar o log de projetos em paralelo. Com
+    `rastrear`, os spans das etapas voltam em resultado["trace"].
+    """
+    from gerador_od_completo import GeradorOD
+    from rastreamento_od import RastreadorEventos
+
+    inicio = time.perf_counter()
+    resultado = {
+        "projeto": pasta_projeto,
+        "sucesso": False,
+        "dias": 0,
+        "segundos": 0.0,
+        "erro": None,
+        "log": None,
+        "metricas": None,
+        "trace": None,
+    }
+    rastreador = RastreadorEventos() if rastrear else None
+
+    try:
+        gerador = GeradorOD(pasta_projeto=pasta_projeto)
+        resultado["log"] = os.path.join(gerador.pasta_ods, NOME_LOG_PROJETO)
+
+        with open(resultado["log"], "w", encoding="utf-8") as log:
+            with contextlib.redirect_stdout(log):
+                if rastreador:
+                    rastreador.nomear_processo(f"processo {os.getpid()}")
+                    gerador.metricas.observadores.append(rastreador)
+                    with rastreador.span("projeto", projeto=pasta_projeto):
+                        resultado["sucesso"] = gerador.gerar_todas_ods()
+                else:
+                    resultado["sucesso"] = gerador.gerar_todas_ods()
+
+        resultado["dias"] = len(gerador.config.get("dias_filmagem", {}))
+        resultado["metricas"] = gerador.metricas.como_dict()
+        if not resultado["sucesso"]:
+            resultado["erro"] = "falha na geração (veja o log do projeto)"
+    except Exception as e:
+        resultado["erro"] = str(e)
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    if rastreador:
+        resultado["trace"] = rastreador.eventos
+    return resultado
+
+
+def gerar_lote(pastas_projeto, workers=None, ao_concluir=None, rastrear=False):
+    """Gera as ODs de vários projetos e retorna os resultados na ordem de entrada
+
+    workers=1 processa tudo no processo atual; caso contrário os projetos são
+    distribuídos entre até `workers` processos (padrão: núcleos disponíveis).
+    """
+    pastas_projeto = list(pastas_projeto)
+    if workers is None:
+        workers = min(len(pastas_projeto), os.cpu_count() or 1)
+    workers = max(1, workers)
+
+    resultados = {}
+    if workers == 1 or len(pastas_projeto) <= 1:
+        for pasta in pastas_projeto:
+            resultados[pasta] = _processar_projeto(pasta, rastrear)
+            if ao_concluir:
+                ao_concluir(resultados[pasta])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futuros = {
+                executor.submit(_processar_projeto, pasta, rastrear): pasta
+                for pasta in pastas_projeto
+            }
+            for futuro in as_completed(futuros):
+                pasta = futuros[futuro]
+                try:
+                    resultados[pasta] = futuro.result()
+                except Exception as e:
+                    resultados[pasta] = {
+                        "projeto": pasta,
+                        "sucesso": False,
+                        "dias": 0,
+                        "segundos": 0.0,
+                        "erro": f"processo de trabalho falhou: {e}",
+                        "log": None,
+                        "metricas": None,
+                        "trace": None,
+                    }
+                if ao_concluir:
+                    ao_concluir(resultados[pasta])
+
+    return [resultados[pasta] for pasta in pastas_projeto]
+
+
+def imprimir_resumo(resultados, segundos_total):
+    """Mostra o resumo único de tempos e falhas do lote"""
+    print("\n📊 Resumo do lote:")
+    print(f"{'Projeto':<40}{'Dias':>6}{'Tempo (s)':>12}  Status")
+    for resultado in resultados:
+        status = "✅" if resultado["sucesso"] else f"❌ {resultado['erro']}"
+        print(
+            f"{resultado['projeto']:<40}{resultado['dias']:>6}"
+            f"{resultado['segundos']:>12.2f}  {status}"
+        )
+
+    falhas = sum(1 for resultado in resultados if not resultado["sucesso"])
+    print(f"\n   ✅ Sucessos: {len(resultados) - falhas}")
+    print(f"   ❌ Falhas: {falhas}")
+    print(f"   ⏱️ Tempo total: {segundos_total:.2f}s")
+
+
+def main(argv=None):
+    """Linha de comando da geração em lote"""
+    parser = argparse.ArgumentParser(
+        description="Gera as ODs de várias pastas de produção em uma execução"
+    )
+    parser.add_argument(
+        "projetos", nargs="+", help="pastas de projeto (cada uma com arquivos/)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="processos em paralelo (padrão: núcleos disponíveis; 1 = sequencial)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="grava trace de execução (Chrome/Perfetto) em arquivos/perfis",
+    )
+    args = parser.parse_args(argv)
+
+    pastas = []
+    for pasta in args.projetos:
+        if os.path.isdir(pasta):
+            pastas.append(os.path.abspath(pasta))
+        else:
+            print(f"⚠️ Pasta ignorada (não existe): {pasta}")
+
+    if not pastas:
+        print("❌ Nenhuma pasta de projeto válida")
+        return 1
+
+    print(f"🎬 Gerando ODs de {len(pastas)} projeto(s)...")
+    inicio = time.perf_counter()
+
+    def executar():
+        return gerar_lote(
+            pastas,
+            workers=args.workers,
+            ao_concluir=lambda r: print(
+                f"{'✅' if r['sucesso'] else '❌'} {r['projeto']} ({r['segundos']:.2f}s)"
+            ),
+            rastrear=args.trace,
+        )
+
+    if args.trace:
+        from rastreamento_od import RastreadorEventos, executar_com_trace
+
+        rastreador = RastreadorEventos()
+        rastreador.nomear_processo("lote")
+
+        def executar_rastreado():
+            resultados = executar()
+            for resultado in resultados:
+                rastreador.adicionar(resultado.get("trace"))
+            return resultados
+
+        resultados, _ = executar_com_trace(
+            executar_rastreado, rastreador, nome="trace_lote"
+        )
+    else:
+        resultados = executar()
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+
+    return 0 if all(resultado["sucesso"] for resultado in resultados) else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Memória do Processo
+Memória residente (RSS) do processo atual, sem dependências externas.
+Usa GetProcessMemoryInfo no Windows e getrusage / /proc nos demais sistemas.
+
+MonitorMemoria mede cada etapa da geração com tracemalloc e amostras de RSS
+(modo --memory-report), para saber qual componente consome a memória.
+"""
+
+import ctypes
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+PASTA_RELATORIOS = "arquivos/perfis"
+INTERVALO_AMOSTRAGEM_RSS = 0.01  # segundos
+TOP_ALOCACOES = 5
+MINIMO_BYTES_RESUMO = 64 * 1024  # locais menores ficam só no JSON
+
+
+class _ContadoresMemoria(ctypes.Structure):
+    """PROCESS_MEMORY_COUNTERS (psapi.h)"""
+
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def _contadores_windows():
+    """Contadores de memória do processo no Windows (None se indisponível)"""
+    contadores = _ContadoresMemoria()
+    contadores.cb = ctypes.sizeof(contadores)
+    try:
+        kernel32 = ctypes.WinDLL("kernel32")
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        processo = kernel32.GetCurrentProcess()
+        ok = kernel32.K32GetProcessMemoryInfo(
+            ctypes.c_void_p(processo), ctypes.byref(contadores), contadores.cb
+        )
+    except (AttributeError, OSError):
+        return None
+    return contadores if ok else None
+
+
+def pico_rss_bytes():
+    """Pico de RSS do processo em bytes (None se a plataforma não informar)"""
+    if sys.platform == "win32":
+        contadores = _contadores_windows()
+        return contadores.PeakWorkingSetSize if contadores else None
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def rss_atual_bytes():
+    """RSS atual do processo em bytes (None se a plataforma não informar)"""
+    if sys.platform == "win32":
+        contadores = _contadores_windows()
+        return contadores.WorkingSetSize if contadores else None
+
+    try:
+        with open("/proc/self/statm", "r") as f:
+            paginas_residentes = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return paginas_residentes * os.sysconf("SC_PAGE_SIZE")
+
+
+def formatar_mb(quantidade_bytes):
+    """Texto curto em MB para os logs ("?" se desconhecido)"""
+    if quantidade_bytes is None:
+        return "?"
+    return f"{quantidade_bytes / (1024 * 1024):.1f} MB"
+
+
+def _tracos():
+    """Memória viva por local de alocação: {(arquivo, linha): bytes}
+
+    Agrupada por linha com a API pública (Snapshot.statistics); comparar os
+    dicionários é bem mais rápido que Snapshot.compare_to, que leva segundos
+    com as centenas de milhares de alocações dos imports de pandas/openpyxl.
+    """
+    return {
+        (stat.traceback[0].filename, stat.traceback[0].lineno): stat.size
+        for stat in tracemalloc.take_snapshot().statistics("lineno")
+    }
+
+
+def _alocacoes_novas(anteriores, atuais, top):
+    """Locais (arquivo:linha) cuja memória viva mais cresceu entre os dois levantamentos"""
+    por_local = Counter()
+    for (arquivo, linha), tamanho in atuais.items():
+        crescimento = tamanho - anteriores.get((arquivo, linha), 0)
+        if crescimento > 0 and arquivo not in (tracemalloc.__file__, __file__):
+            por_local[f"{arquivo}:{linha}"] = crescimento
+    return por_local.most_common(top)
+
+
+class _MedicaoEtapa:
+    """Estado de uma etapa em andamento"""
+
+    def __init__(self, nome, detalhar):
+        self.nome = nome
+        antes = tracemalloc.get_traced_memory()[0]
+        self.tracos = _tracos() if detalhar else None
+        # Os traços também ocupam memória rastreada: entram na linha de base
+        # desta etapa e são descontados do pico repassado à etapa externa
+        self.traced_entrada = tracemalloc.get_traced_memory()[0]
+        self.custo_tracos = self.traced_entrada - antes
+        self.pico_traced = self.traced_entrada
+        self.pico_rss = rss_atual_bytes()
+
+
+class MonitorMemoria:
+    """Pico e memória retida por etapa (tracemalloc + RSS amostrado)
+
+    Observador das etapas de MetricasExecucao: cada etapa vira uma medição.
+    Os locais de alocação são levantados só na primeira chamada de cada etapa
+    (as ODs de cada dia repetem o mesmo código). Feito para execuções em uma
+    thread (o tracemalloc é global ao processo).
+    """
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM_RSS, top=TOP_ALOCACOES):
+        self.intervalo = intervalo
+        self.top = top
+        self.etapas = {}
+        self._pilha = []
+        self._detalhadas = set()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._iniciou_tracemalloc = False
+
+    def iniciar(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._amostrar_rss, daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def _amostrar_rss(self):
+        while not self._parar.wait(self.intervalo):
+            rss = rss_atual_bytes()
+            if rss is None:
+                continue
+            with self._lock:
+                for medicao in self._pilha:
+                    medicao.pico_rss = max(medicao.pico_rss or 0, rss)
+
+    @contextmanager
+    def span(self, nome, **args):
+        """Mede o bloco como uma etapa (interface de observador das métricas)"""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        # O pico do tracemalloc é reiniciado a cada etapa; o da etapa externa
+        # é preservado na medição dela antes de reiniciar
+        pico = tracemalloc.get_traced_memory()[1]
+        with self._lock:
+            if self._pilha:
+                externa = self._pilha[-1]
+                externa.pico_traced = max(externa.pico_traced, pico)
+        detalhar = self.top > 0 and nome not in self._detalhadas
+        self._detalhadas.add(nome)
+        medicao = _MedicaoEtapa(nome, detalhar)
+        with self._lock:
+            self._pilha.append(medicao)
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self._concluir(medicao)
+
+    def _concluir(self, medicao):
+        atual, pico = tracemalloc.get_traced_memory()
+        medicao.pico_traced = max(medicao.pico_traced, pico)
+        rss = rss_atual_bytes()
+        alocacoes = None
+        if medicao.tracos is not None:
+            alocacoes = _alocacoes_novas(medicao.tracos, _tracos(), self.top)
+            medicao.tracos = None
+
+        with self._lock:
+            self._pilha.remove(medicao)
+            if self._pilha:
+                externa = self._pilha[-1]
+                externa.pico_traced = max(
+                    externa.pico_traced, medicao.pico_traced - medicao.custo_tracos
+                )
+                externa.pico_rss = max(externa.pico_rss or 0, medicao.pico_rss or 0)
+
+            pico_etapa = medicao.pico_traced - medicao.traced_entrada
+            dados = self.etapas.setdefault(
+                medicao.nome,
+                {
+                    "vezes": 0,
+                    "pico_bytes": 0,
+                    "retido_bytes": 0,
+                    "pico_rss_bytes": None,
+                    "top_alocacoes": [],
+                },
+            )
+            dados["vezes"] += 1
+            dados["retido_bytes"] += atual - medicao.traced_entrada
+            if rss is not None:
+                dados["pico_rss_bytes"] = max(
+                    dados["pico_rss_bytes"] or 0, medicao.pico_rss or 0, rss
+                )
+            dados["pico_bytes"] = max(dados["pico_bytes"], pico_etapa)
+            if alocacoes is not None:
+                dados["top_alocacoes"] = [
+                    {"local": local, "bytes": tamanho} for local, tamanho in alocacoes
+                ]
+
+        # Traços já liberados não contam no pico da etapa externa
+        tracemalloc.reset_peak()
+
+    def como_dict(self):
+        """Relatório por etapa, pronto para JSON"""
+        with self._lock:
+            return {
+                "pico_rss_processo_bytes": pico_rss_bytes(),
+                "etapas": {nome: dict(dados) for nome, dados in self.etapas.items()},
+            }
+
+    def resumo(self):
+        """Linhas para o log: etapas da que mais exigiu memória para a que menos"""
+        relatorio = self.como_dict()
+        linhas = [
+            f"🧠 Pico de RSS do processo: "
+            f"{formatar_mb(relatorio['pico_rss_processo_bytes'])}",
+            f"   {'Etapa':<20}{'pico':>11}{'retido':>11}{'RSS pico':>11}",
+        ]
+        for nome, dados in sorted(
+            relatorio["etapas"].items(), key=lambda item: -item[1]["pico_bytes"]
+        ):
+            linhas.append(
+                f"   {nome:<20}{formatar_mb(dados['pico_bytes']):>11}"
+                f"{formatar_mb(dados['retido_bytes']):>11}"
+                f"{formatar_mb(dados['pico_rss_bytes']):>11}"
+            )
+            for alocacao in dados["top_alocacoes"]:
+                if alocacao["bytes"] < MINIMO_BYTES_RESUMO:
+                    continue
+                linhas.append(
+                    f"      {formatar_mb(alocacao['bytes']):>9}  {alocacao['local']}"
+                )
+        return linhas
+
+
+def executar_com_relatorio_memoria(
+    funcao, monitor, nome="memoria", pasta=PASTA_RELATORIOS
+):
+    """Executa `funcao()` com o monitor ligado e grava o relatório em JSON
+
+    Retorna (resultado, caminho do relatório). O relatório também é gravado
+    se a função levantar uma exceção.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"{nome}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    monitor.iniciar()
+    try:
+        with monitor.span(nome):
+            resultado = funcao()
+    finally:
+        monitor.parar()
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(monitor.como_dict(), f, ensure_ascii=False, indent=2)
+        print("\n📉 Relatório de memória por etapa:")
+        for linha in monitor.resumo():
+            print(linha)
+        print(f"💾 Relatório de memória salvo em: {caminho}")
+    return resultado, caminho
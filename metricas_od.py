@@ -0,0 +1,138 @@
+"""
+Métricas de Execução
+Tempos por etapa, contagens e bytes lidos/gravados de um GeradorOD, para ver
+onde o tempo vai em cada projeto sem precisar de um profiler
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+
+class MetricasExecucao:
+    """Acumula métricas estruturadas de uma execução (seguro entre threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Objetos com span(nome, **args) avisados de cada etapa (trace, memória)
+        self.observadores = []
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Zera as métricas e marca o início de uma nova execução"""
+        with self._lock:
+            self.inicio = datetime.now()
+            self._inicio_relogio = time.perf_counter()
+            self.etapas = {}
+            self.contagens = {}
+            self.bytes_lidos = 0
+            self.bytes_gravados = 0
+
+    @contextmanager
+    def etapa(self, nome, **args):
+        """Mede a duração do bloco e acumula na etapa `nome`
+
+        Cada observador ligado também recebe o bloco como um span.
+        """
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as pilha:
+                for observador in list(self.observadores):
+                    pilha.enter_context(observador.span(nome, **args))
+                yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                etapa = self.etapas.setdefault(nome, {"segundos": 0.0, "vezes": 0})
+                etapa["segundos"] += duracao
+                etapa["vezes"] += 1
+
+    def contar(self, nome, quantidade=1):
+        """Soma `quantidade` ao contador `nome`"""
+        with self._lock:
+            self.contagens[nome] = self.contagens.get(nome, 0) + quantidade
+
+    def definir(self, nome, valor):
+        """Define o valor atual do contador `nome` (ex.: cenas do projeto)"""
+        with self._lock:
+            self.contagens[nome] = valor
+
+    def registrar_leitura(self, caminho):
+        """Soma o tamanho do arquivo aos bytes lidos"""
+        tamanho = _tamanho(caminho)
+        with self._lock:
+            self.bytes_lidos += tamanho
+
+    def registrar_gravacao(self, caminho):
+        """Soma o tamanho do arquivo aos bytes gravados"""
+        tamanho = _tamanho(caminho)
+        with self._lock:
+            self.bytes_gravados += tamanho
+
+    def como_dict(self):
+        """Relatório das métricas, pronto para JSON"""
+        with self._lock:
+            return {
+                "inicio": self.inicio.isoformat(timespec="seconds"),
+                "duracao_total_s": round(time.perf_counter() - self._inicio_relogio, 4),
+                "etapas": {
+                    nome: {
+                        "segundos": round(dados["segundos"], 4),
+                        "vezes": dados["vezes"],
+                    }
+                    for nome, dados in self.etapas.items()
+                },
+                "contagens": dict(self.contagens),
+                "bytes": {"lidos": self.bytes_lidos, "gravados": self.bytes_gravados},
+            }
+
+    def gravar_json(self, caminho):
+        """Grava o relatório em JSON"""
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, ensure_ascii=False, indent=2)
+
+    def resumo(self):
+        """Linhas curtas para o log: etapas da mais lenta para a mais rápida"""
+        relatorio = self.como_dict()
+        linhas = [f"⏱️ Tempo total: {relatorio['duracao_total_s']:.2f}s"]
+        for nome, dados in sorted(
+            relatorio["etapas"].items(), key=lambda item: -item[1]["segundos"]
+        ):
+            linhas.append(f"   {nome}: {dados['segundos']:.3f}s ({dados['vezes']}x)")
+        if relatorio["contagens"]:
+            linhas.append(
+                "   "
+                + ", ".join(
+                    f"{nome}={valor}" for nome, valor in relatorio["contagens"].items()
+                )
+            )
+        linhas.append(
+            f"   bytes lidos={relatorio['bytes']['lidos']}, "
+            f"gravados={relatorio['bytes']['gravados']}"
+        )
+        return linhas
+
+
+def medir_etapa(nome):
+    """Decorador de métodos: acumula cada chamada na etapa `nome` de self.metricas"""
+
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def medido(self, *args, **kwargs):
+            with self.metricas.etapa(nome):
+                return metodo(self, *args, **kwargs)
+
+        return medido
+
+    return decorador
+
+
+def _tamanho(caminho):
+    try:
+        return os.path.getsize(caminho)
+    except OSError:
+        return 0
@@ -0,0 +1,249 @@
+"""
+Monitor de Arquivos de Entrada
+Observa DECUPAGEM.csv e PLANO_FINAL.pdf e avisa quando o conteúdo muda.
+Usa inotify no Linux e consulta periódica (os.stat) nos demais sistemas
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from progresso_od import GeracaoCancelada
+from snapshot_projeto import calcular_digest_arquivo
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+MASCARA_INOTIFY = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+EVENTO_INOTIFY = struct.Struct("iIII")
+
+
+def assinatura_arquivo(caminho):
+    """Tamanho e mtime do arquivo (None se não existir)"""
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+
+class _ObservadorInotify:
+    """Espera eventos do kernel nas pastas dos arquivos observados"""
+
+    def __init__(self, caminhos):
+        libc_nome = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_nome, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+
+        self._nomes = {os.path.basename(caminho) for caminho in caminhos}
+        # Observar a pasta: editores costumam salvar via arquivo temporário + rename
+        for pasta in {os.path.dirname(caminho) or "." for caminho in caminhos}:
+            if (
+                self._libc.inotify_add_watch(
+                    self._fd, os.fsencode(pasta), MASCARA_INOTIFY
+                )
+                < 0
+            ):
+                erro = ctypes.get_errno()
+                self.fechar()
+                raise OSError(erro, f"inotify_add_watch falhou para {pasta}")
+
+    def aguardar(self, timeout):
+        """Retorna True se algum arquivo observado teve evento dentro do timeout"""
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if not prontos:
+            return False
+
+        try:
+            dados = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        relevante = False
+        posicao = 0
+        while posicao + EVENTO_INOTIFY.size <= len(dados):
+            _, _, _, tamanho = EVENTO_INOTIFY.unpack_from(dados, posicao)
+            inicio_nome = posicao + EVENTO_INOTIFY.size
+            nome = dados[inicio_nome : inicio_nome + tamanho].rstrip(b"\0")
+            if os.fsdecode(nome) in self._nomes:
+                relevante = True
+            posicao = inicio_nome + tamanho
+        return relevante
+
+    def fechar(self):
+        """Libera o descritor do inotify"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class MonitorArquivos:
+    """Detecta mudanças reais de conteúdo em um conjunto de arquivos
+
+    A checagem é em duas etapas: tamanho/mtime (barato) e, só quando eles
+    mudam, o SHA-256 do conteúdo. `ao_alterar` recebe o conjunto de caminhos
+    cujo conteúdo mudou, depois que as escritas se estabilizam (debounce).
+    Com `base` (outro monitor dos mesmos caminhos) a última verificação dele
+    é reaproveitada em vez de recalcular o SHA-256.
+    """
+
+    def __init__(
+        self,
+        caminhos,
+        ao_alterar=None,
+        intervalo=1.0,
+        espera_estabilizar=0.5,
+        usar_inotify=True,
+        base=None,
+    ):
+        self.caminhos = list(caminhos)
+        self.ao_alterar = ao_alterar
+        self.intervalo = intervalo
+        self.espera_estabilizar = espera_estabilizar
+        self.usar_inotify = usar_inotify and sys.platform.startswith("linux")
+        self.backend = None
+
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._assinaturas = {}
+        self._digests = {}
+        if base is not None:
+            with base._lock:
+                self._assinaturas.update(base._assinaturas)
+                self._digests.update(base._digests)
+        for caminho in self.caminhos:
+            if caminho not in self._digests:
+                self._assinaturas[caminho] = assinatura_arquivo(caminho)
+                self._digests[caminho] = calcular_digest_arquivo(caminho)
+
+    def existe(self, caminho):
+        """Indica se o arquivo existia na última verificação"""
+        return self._assinaturas.get(caminho) is not None
+
+    def digests(self, caminhos=None):
+        """Digests da última verificação, na ordem de `caminhos` (padrão: todos)
+
+        None se algum arquivo não existia; nada é relido do disco.
+        """
+        with self._lock:
+            digests = tuple(
+                self._digests.get(caminho) for caminho in caminhos or self.caminhos
+            )
+        return None if None in digests else digests
+
+    def stat_alterado(self):
+        """Checagem barata: algum tamanho/mtime diferente do último visto?"""
+        return any(
+            assinatura_arquivo(caminho) != self._assinaturas.get(caminho)
+            for caminho in self.caminhos
+        )
+
+    def verificar_agora(self):
+        """Retorna os caminhos cujo conteúdo mudou desde a última verificação"""
+        alterados = set()
+        with self._lock:
+            for caminho in self.caminhos:
+                assinatura = assinatura_arquivo(caminho)
+                if assinatura == self._assinaturas.get(caminho):
+                    continue
+
+                self._assinaturas[caminho] = assinatura
+                digest = calcular_digest_arquivo(caminho)
+                if digest != self._digests.get(caminho):
+                    self._digests[caminho] = digest
+                    alterados.add(caminho)
+        return alterados
+
+    def iniciar(self):
+        """Inicia a observação em uma thread em segundo plano"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        observador = None
+        if self.usar_inotify:
+            try:
+                observador = _ObservadorInotify(self.caminhos)
+            except (OSError, AttributeError) as e:
+                print(f"⚠️ inotify indisponível ({e}) - usando consulta periódica")
+        self.backend = "inotify" if observador else "polling"
+
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._executar, args=(observador,), daemon=True
+        )
+        self._thread.start()
+
+    def parar(self, timeout=5.0):
+        """Interrompe a observação"""
+        self._parar.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def ativo(self):
+        """Indica se a thread de observação está rodando"""
+        return bool(self._thread and self._thread.is_alive())
+
+    def _executar(self, observador):
+        """Laço da thread: espera sinal de mudança, aguarda estabilizar e notifica"""
+        try:
+            while not self._parar.is_set():
+                if observador:
+                    houve_evento = observador.aguardar(self.intervalo)
+                else:
+                    self._parar.wait(self.intervalo)
+                    houve_evento = self.stat_alterado()
+
+                if not houve_evento or self._parar.is_set():
+                    continue
+
+                self._aguardar_estabilizar(observador)
+                alterados = self.verificar_agora()
+                if alterados and self.ao_alterar and not self._parar.is_set():
+                    try:
+                        self.ao_alterar(alterados)
+                    except GeracaoCancelada:
+                        # Cancelamento de uma geração não encerra a observação
+                        print("⏹️ Processamento da alteração cancelado")
+                    except Exception as e:
+                        print(f"❌ Erro ao processar alteração de arquivos: {e}")
+        finally:
+            if observador:
+                observador.fechar()
+
+    def _aguardar_estabilizar(self, observador):
+        """Debounce: espera até não haver novas escritas por espera_estabilizar"""
+        while not self._parar.is_set():
+            if observador:
+                if not observador.aguardar(self.espera_estabilizar):
+                    return
+            else:
+                antes = [assinatura_arquivo(caminho) for caminho in self.caminhos]
+                self._parar.wait(self.espera_estabilizar)
+                depois = [assinatura_arquivo(caminho) for caminho in self.caminhos]
+                if antes == depois:
+                    return
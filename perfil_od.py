@@ -0,0 +1,116 @@
+"""
+Perfil de Execução
+Roda uma tarefa sob cProfile e grava os relatórios em arquivos/perfis/,
+prontos para serem enviados por quem não tem ambiente de desenvolvimento:
+
+    <nome>.pstats   perfil completo (pstats, snakeviz, ...)
+    <nome>.txt      top-N funções por tempo acumulado e por tempo próprio
+    <nome>.folded   opcional: pilhas amostradas no formato "collapsed"
+                    (flamegraph.pl, speedscope)
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+
+PASTA_PERFIS = "arquivos/perfis"
+TOP_PADRAO = 40
+INTERVALO_AMOSTRAGEM = 0.005  # segundos
+
+
+class AmostradorPilhas:
+    """Amostra periodicamente a pilha de uma thread e conta as pilhas iguais"""
+
+    def __init__(self, thread_id=None, intervalo=INTERVALO_AMOSTRAGEM):
+        self.thread_id = thread_id or threading.get_ident()
+        self.intervalo = intervalo
+        self.contagens = Counter()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            pilha = []
+            while frame is not None:
+                codigo = frame.f_code
+                pilha.append(
+                    f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}"
+                    f":{codigo.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.contagens[";".join(reversed(pilha))] += 1
+
+    def gravar(self, caminho):
+        """Grava as pilhas no formato collapsed: "raiz;...;folha contagem" """
+        with open(caminho, "w", encoding="utf-8") as f:
+            for pilha, contagem in sorted(self.contagens.items()):
+                f.write(f"{pilha} {contagem}\n")
+
+
+def _resumo_texto(perfil, top):
+    """Top-N por tempo acumulado e por tempo próprio"""
+    saida = io.StringIO()
+    estatisticas = pstats.Stats(perfil, stream=saida).strip_dirs()
+    saida.write(f"=== Top {top} por tempo acumulado ===\n")
+    estatisticas.sort_stats("cumulative").print_stats(top)
+    saida.write(f"\n=== Top {top} por tempo próprio ===\n")
+    estatisticas.sort_stats("tottime").print_stats(top)
+    return saida.getvalue()
+
+
+def executar_com_perfil(
+    funcao, nome="execucao", pasta=PASTA_PERFIS, top=TOP_PADRAO, pilhas=False
+):
+    """Executa `funcao()` sob cProfile e grava os relatórios
+
+    Retorna (resultado, arquivos), onde arquivos é {tipo: caminho}. Os
+    relatórios também são gravados se a função levantar uma exceção.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    base = os.path.join(pasta, f"{nome}_{datetime.now():%Y%m%d_%H%M%S}")
+    arquivos = {"pstats": f"{base}.pstats", "resumo": f"{base}.txt"}
+
+    perfil = cProfile.Profile()
+    amostrador = AmostradorPilhas() if pilhas else None
+
+    if amostrador:
+        amostrador.iniciar()
+    perfil.enable()
+    try:
+        resultado = funcao()
+    finally:
+        perfil.disable()
+        if amostrador:
+            amostrador.parar()
+
+        perfil.dump_stats(arquivos["pstats"])
+        with open(arquivos["resumo"], "w", encoding="utf-8") as f:
+            f.write(_resumo_texto(perfil, top))
+        if amostrador:
+            arquivos["pilhas"] = f"{base}.folded"
+            amostrador.gravar(arquivos["pilhas"])
+
+        print("📈 Perfil de execução gravado:")
+        for caminho in arquivos.values():
+            print(f"   {caminho}")
+
+    return resultado, arquivos
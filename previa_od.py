@@ -0,0 +1,70 @@
+"""
+Prévia do Cronograma
+Linhas da ordem do dia (atividades, cenas com locação/elenco/planos, RECs)
+montadas direto do projeto carregado, sem construir planilha, e o cálculo da
+faixa visível usado pela lista virtualizada da interface.
+"""
+
+ICONES_PREVIA = {"atividade_fixa": "⏰", "cena": "🎬", "rec": "📹"}
+MARGEM_LINHAS = 2  # linhas desenhadas além das bordas visíveis
+
+
+def _texto_valido(valor):
+    return bool(valor) and valor != "nan"
+
+
+def linhas_previa(gerador, dia):
+    """Linhas (hora, texto, tipo) do cronograma do dia; [] se o dia não existe
+
+    Cada cena ocupa uma linha de cabeçalho, uma de locação/elenco e uma por
+    plano da decupagem. Dias sem cronograma do PDF listam só as cenas.
+    """
+    dia_config = gerador.config.get("dias_filmagem", {}).get(str(dia))
+    if not dia_config:
+        return []
+
+    itens = dia_config.get("cronograma_completo") or [
+        {"tipo": "cena", "numero": numero} for numero in dia_config.get("cenas", [])
+    ]
+
+    linhas = []
+    for item in itens:
+        tipo = item["tipo"]
+        hora = item.get("horario_inicio", "")
+        if item.get("horario_fim"):
+            hora = f"{hora}-{item['horario_fim']}"
+
+        if tipo != "cena":
+            descricao = item.get("atividade", item.get("descricao", ""))
+            linhas.append((hora, f"{ICONES_PREVIA.get(tipo, '📋')} {descricao}", tipo))
+            continue
+
+        cena = gerador.dados_decupagem.get(str(item["numero"]), {})
+        titulo = " ".join(
+            parte
+            for parte in (
+                f"🎬 Cena {item['numero']}",
+                item.get("tipo_local", ""),
+                item.get("descricao", cena.get("descricao", "")),
+            )
+            if _texto_valido(parte)
+        )
+        linhas.append((hora, titulo, "cena"))
+
+        detalhes = [
+            f"{rotulo}: {cena[chave]}"
+            for chave, rotulo in (("locacao", "Locação"), ("elenco", "Elenco"))
+            if _texto_valido(cena.get(chave, ""))
+        ]
+        if detalhes:
+            linhas.append(("", "     " + " | ".join(detalhes), "detalhe"))
+        for plano in cena.get("planos", []):
+            linhas.append(("", f"     • {plano['planos']}", "plano"))
+    return linhas
+
+
+def faixa_visivel(topo, altura_visivel, altura_linha, total, margem=MARGEM_LINHAS):
+    """Índices [inicio, fim) das linhas a desenhar para a janela visível"""
+    inicio = max(0, int(topo // altura_linha) - margem)
+    fim = min(total, int((topo + altura_visivel) // altura_linha) + 1 + margem)
+    return inicio, max(inicio, fim)
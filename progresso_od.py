@@ -0,0 +1,45 @@
+"""
+Progresso e Cancelamento
+Token de cancelamento cooperativo para gerações longas. O GeradorOD consulta o
+token entre unidades de trabalho (página extraída, diária analisada, linha do
+cronograma, OD gravada) e avisa o progresso de cada uma pelo callback
+ao_progresso(unidade, atual, total, dia).
+"""
+
+import threading
+
+# Unidades de trabalho avisadas pelo GeradorOD
+UNIDADE_PAGINA = "pagina"  # página do PDF extraída (atual/total de páginas)
+UNIDADE_DIARIA = "diaria"  # diária encontrada no plano (atual/total de linhas)
+UNIDADE_LINHA = "linha"  # linha do cronograma desenhada na planilha de um dia
+UNIDADE_OD = "od"  # OD de um dia concluída
+
+
+class GeracaoCancelada(BaseException):
+    """Geração interrompida a pedido do usuário
+
+    Herda de BaseException (como KeyboardInterrupt) para atravessar os
+    `except Exception` que tratam falhas de um dia ou de uma fonte.
+    """
+
+
+class TokenCancelamento:
+    """Pedido de cancelamento compartilhado entre a interface e a geração"""
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        self._evento.set()
+
+    def reiniciar(self):
+        self._evento.clear()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+    def verificar(self):
+        """Levanta GeracaoCancelada se o cancelamento foi pedido"""
+        if self._evento.is_set():
+            raise GeracaoCancelada("geração cancelada pelo usuário")
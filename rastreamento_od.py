@@ -0,0 +1,117 @@
+"""
+Rastreamento de Execução
+Grava as etapas da geração como spans aninhados no formato trace-event do
+Chrome/Perfetto (abrir em https://ui.perfetto.dev ou chrome://tracing).
+
+Cada span leva o pid e o id da thread, então num lote em paralelo dá para ver
+onde os processos de trabalho se sobrepõem e onde a execução fica serial.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+PASTA_TRACES = "arquivos/perfis"
+
+# Relógio monotônico alinhado ao relógio de parede uma vez por processo:
+# spans aninhados ficam consistentes e processos diferentes são comparáveis
+_ORIGEM_PAREDE_US = time.time_ns() / 1000
+_ORIGEM_MONOTONICO_NS = time.perf_counter_ns()
+
+
+def _agora_us():
+    return _ORIGEM_PAREDE_US + (time.perf_counter_ns() - _ORIGEM_MONOTONICO_NS) / 1000
+
+
+class RastreadorEventos:
+    """Coleta spans ("complete events") de um ou mais threads/processos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.eventos = []
+        self._threads_nomeadas = set()
+
+    def nomear_processo(self, nome):
+        """Nome exibido para o processo atual na linha do tempo"""
+        with self._lock:
+            self.eventos.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": {"name": nome},
+                }
+            )
+
+    @contextmanager
+    def span(self, nome, categoria="od", **args):
+        """Registra a duração do bloco como um span da thread atual"""
+        inicio = _agora_us()
+        try:
+            yield
+        finally:
+            evento = {
+                "name": nome,
+                "cat": categoria,
+                "ph": "X",
+                "ts": round(inicio, 3),
+                "dur": round(_agora_us() - inicio, 3),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                evento["args"] = {chave: str(valor) for chave, valor in args.items()}
+            self._registrar(evento)
+
+    def _registrar(self, evento):
+        with self._lock:
+            chave_thread = (evento["pid"], evento["tid"])
+            if chave_thread not in self._threads_nomeadas:
+                self._threads_nomeadas.add(chave_thread)
+                self.eventos.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": evento["pid"],
+                        "tid": evento["tid"],
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            self.eventos.append(evento)
+
+    def adicionar(self, eventos):
+        """Junta eventos coletados em outro processo (ex.: processos do lote)"""
+        with self._lock:
+            self.eventos.extend(eventos or [])
+
+    def como_dict(self):
+        """Documento trace-event pronto para JSON"""
+        with self._lock:
+            return {"traceEvents": list(self.eventos), "displayTimeUnit": "ms"}
+
+    def gravar(self, caminho):
+        """Grava o trace em JSON"""
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, ensure_ascii=False)
+
+
+def executar_com_trace(funcao, rastreador, nome="trace", pasta=PASTA_TRACES):
+    """Executa `funcao()` e grava os spans coletados por `rastreador`
+
+    Retorna (resultado, caminho do trace). O trace também é gravado se a
+    função levantar uma exceção.
+    """
+    caminho = os.path.join(pasta, f"{nome}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    try:
+        with rastreador.span(nome):
+            resultado = funcao()
+    finally:
+        rastreador.gravar(caminho)
+        print(f"🧭 Trace de execução gravado em: {caminho}")
+        print("   (abrir em https://ui.perfetto.dev ou chrome://tracing)")
+    return resultado, caminho
@@ -0,0 +1,91 @@
+"""
+Registro de Log
+Log da interface com custo constante: só as últimas linhas ficam na memória
+(e no widget), e o histórico completo vai para um arquivo rotativo em disco.
+"""
+
+import logging
+import os
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+PASTA_LOGS = "arquivos/logs"
+LINHAS_VISIVEIS = 1000
+TAMANHO_MAXIMO_ARQUIVO = 1024 * 1024  # bytes por arquivo antes de rotacionar
+ARQUIVOS_ANTIGOS = 5  # gui.log.1 ... gui.log.5
+
+
+class RegistroLog:
+    """Buffer circular das linhas recentes + arquivo de log rotativo
+
+    `adicionar` devolve o texto a inserir no widget e quantas linhas do topo
+    do widget devem ser descartadas para que ele nunca passe de
+    `linhas_visiveis` linhas.
+    """
+
+    def __init__(
+        self,
+        arquivo=os.path.join(PASTA_LOGS, "gui.log"),
+        linhas_visiveis=LINHAS_VISIVEIS,
+        tamanho_maximo=TAMANHO_MAXIMO_ARQUIVO,
+        arquivos_antigos=ARQUIVOS_ANTIGOS,
+    ):
+        self.arquivo = arquivo
+        self.linhas = deque(maxlen=max(1, linhas_visiveis))
+        self.arquivos_antigos = arquivos_antigos
+
+        os.makedirs(os.path.dirname(arquivo) or ".", exist_ok=True)
+        self._handler = RotatingFileHandler(
+            arquivo,
+            maxBytes=tamanho_maximo,
+            backupCount=arquivos_antigos,
+            encoding="utf-8",
+        )
+        self._handler.setFormatter(
+            logging.Formatter("%(asctime)s %(message)s", "%Y-%m-%d %H:%M:%S")
+        )
+        # Logger exclusivo desta instância, fora da hierarquia do root
+        self._logger = logging.Logger(f"od.gui.{id(self)}", logging.INFO)
+        self._logger.addHandler(self._handler)
+
+    @property
+    def linhas_visiveis(self):
+        return self.linhas.maxlen
+
+    def adicionar(self, mensagens):
+        """Registra as mensagens; retorna (texto para o widget, linhas a descartar)"""
+        novas = "\n".join(mensagens).split("\n")
+        for linha in novas:
+            self._logger.info(linha)
+
+        anteriores = len(self.linhas)
+        self.linhas.extend(novas)
+        # Um lote maior que a janela só mostra o seu final
+        exibidas = novas[-self.linhas.maxlen :]
+        descartar = max(0, anteriores + len(exibidas) - self.linhas.maxlen)
+        return "\n".join(exibidas) + "\n", descartar
+
+    def arquivos(self):
+        """Arquivos do log em disco, do mais antigo para o mais recente"""
+        antigos = [
+            f"{self.arquivo}.{indice}"
+            for indice in range(self.arquivos_antigos, 0, -1)
+            if os.path.exists(f"{self.arquivo}.{indice}")
+        ]
+        return antigos + [self.arquivo]
+
+    def salvar_completo(self, destino):
+        """Junta os arquivos rotacionados em `destino`; retorna o nº de linhas"""
+        self._handler.flush()
+        total = 0
+        with open(destino, "w", encoding="utf-8") as saida:
+            for caminho in self.arquivos():
+                with open(caminho, "r", encoding="utf-8") as entrada:
+                    for linha in entrada:
+                        saida.write(linha)
+                        total += 1
+        return total
+
+    def fechar(self):
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
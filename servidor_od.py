@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Serviço Local de OD (HTTP/JSON)
+Mantém projetos já processados em memória e atende pedidos de listagem de dias,
+resumo de um dia e planilha .xlsx de um dia, sem iniciar um processo por pedido
+
+Rotas (todas aceitam ?projeto=<pasta relativa à raiz do serviço>):
+    GET /saude
+    GET /dias
+    GET /dias/<n>
+    GET /dias/<n>/xlsx
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from gerador_od_completo import ARQUIVO_DECUPAGEM, ARQUIVO_PLANO, GeradorOD
+from monitor_arquivos import assinatura_arquivo
+from snapshot_projeto import calcular_digests_fontes
+
+PORTA_PADRAO = 8765
+MAX_PROJETOS_PADRAO = 4
+TIPO_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ErroServico(Exception):
+    """Erro com status HTTP associado"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class CacheProjetos:
+    """Projetos carregados em memória, por pasta e digest das fontes (LRU)
+
+    Quando as fontes mudam o digest muda e o projeto é recarregado. O SHA-256
+    só é recalculado quando tamanho/mtime das fontes mudam; nos demais
+    pedidos basta um os.stat. O número de projetos em memória é limitado
+    por `max_projetos`; os digests de uma pasta saem junto com o projeto.
+    """
+
+    def __init__(self, max_projetos=MAX_PROJETOS_PADRAO):
+        self.max_projetos = max(1, max_projetos)
+        self._projetos = OrderedDict()
+        self._lock = threading.Lock()
+        self._locks_carga = {}
+        self._digests = {}  # pasta -> (assinatura das fontes, digests)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._projetos)
+
+    def obter(self, pasta):
+        """Retorna o GeradorOD carregado do projeto, carregando se necessário"""
+        pasta = os.path.abspath(pasta)
+        digests = self._digests_fontes(pasta)
+        if digests is None:
+            raise ErroServico(404, f"Arquivos do projeto não encontrados em {pasta}")
+        chave = (pasta, digests)
+
+        with self._lock:
+            if chave in self._projetos:
+                self._projetos.move_to_end(chave)
+                return self._projetos[chave]
+            lock_carga = self._locks_carga.setdefault(chave, threading.Lock())
+
+        # Um único carregamento por projeto, mesmo com pedidos simultâneos
+        with lock_carga:
+            with self._lock:
+                if chave in self._projetos:
+                    self._projetos.move_to_end(chave)
+                    return self._projetos[chave]
+
+            try:
+                gerador = GeradorOD(pasta_projeto=pasta)
+                if not gerador.carregar_projeto():
+                    raise ErroServico(500, "Falha ao carregar o projeto")
+
+                with self._lock:
+                    # Versões antigas da mesma pasta deixam de ser úteis
+                    for antiga in [c for c in self._projetos if c[0] == pasta]:
+                        del self._projetos[antiga]
+                    self._projetos[chave] = gerador
+                    while len(self._projetos) > self.max_projetos:
+                        (removida, _), _ = self._projetos.popitem(last=False)
+                        self._digests.pop(removida, None)
+            finally:
+                with self._lock:
+                    self._locks_carga.pop(chave, None)
+                    # Carga falhou: nada em memória para esta pasta
+                    if not any(c[0] == pasta for c in self._projetos):
+                        self._digests.pop(pasta, None)
+            return gerador
+
+    def _digests_fontes(self, pasta):
+        """Digests das fontes da pasta, reaproveitados enquanto tamanho/mtime não mudam"""
+        fontes = [
+            os.path.join(pasta, ARQUIVO_DECUPAGEM),
+            os.path.join(pasta, ARQUIVO_PLANO),
+        ]
+        assinatura = tuple(assinatura_arquivo(caminho) for caminho in fontes)
+        if None in assinatura:
+            return None
+
+        with self._lock:
+            conhecido = self._digests.get(pasta)
+        if conhecido is not None and conhecido[0] == assinatura:
+            return conhecido[1]
+
+        digests = calcular_digests_fontes(*fontes)
+        if digests is not None:
+            with self._lock:
+                self._digests[pasta] = (assinatura, digests)
+        return digests
+
+
+def listar_dias(gerador):
+    """Resumo curto de todos os dias do projeto"""
+    dias = []
+    for dia_str, dia_config in gerador.config["dias_filmagem"].items():
+        dias.append(
+            {
+                "dia": int(dia_str),
+                "cenas": dia_config.get("cenas", []),
+                "atividades": len(dia_config.get("cronograma_completo", [])),
+            }
+        )
+    return {
+        "titulo": gerador.config["projeto"]["titulo"],
+        "total_dias": gerador.config["projeto"]["total_dias"],
+        "dias": dias,
+    }
+
+
+def resumo_dia(gerador, dia_str):
+    """Cronograma do dia com os dados de decupagem de cada cena"""
+    dia_config = gerador.config["dias_filmagem"].get(dia_str)
+    if dia_config is None:
+        raise ErroServico(404, f"Dia {dia_str} não encontrado")
+
+    cronograma = []
+    for item in dia_config.get("cronograma_completo", []):
+        entrada = {
+            "tipo": item["tipo"],
+            "horario_inicio": item.get("horario_inicio", ""),
+            "horario_fim": item.get("horario_fim", ""),
+            "descricao": item.get("atividade", item.get("descricao", "")),
+        }
+        if item["tipo"] == "cena":
+            cena = gerador.dados_decupagem.get(str(item["numero"]), {})
+            entrada.update(
+                {
+                    "numero": item["numero"],
+                    "locacao": cena.get("locacao", ""),
+                    "elenco": cena.get("elenco", ""),
+                    "planos": [p.get("planos", "") for p in cena.get("planos", [])],
+                }
+            )
+        cronograma.append(entrada)
+
+    return {
+        "dia": int(dia_str),
+        "titulo": gerador.config["projeto"]["titulo"],
+        "total_dias": gerador.config["projeto"]["total_dias"],
+        "cenas": dia_config.get("cenas", []),
+        "cronograma": cronograma,
+    }
+
+
+def planilha_dia(gerador, dia_str):
+    """Bytes da planilha .xlsx do dia, montada em memória"""
+    if dia_str not in gerador.config["dias_filmagem"]:
+        raise ErroServico(404, f"Dia {dia_str} não encontrado")
+
+    wb = gerador.montar_workbook_dia(dia_str)
+    if wb is None:
+        raise ErroServico(409, f"Dia {dia_str} sem cronograma do PDF")
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+class ManipuladorOD(BaseHTTPRequestHandler):
+    """Atende as rotas do serviço"""
+
+    server_version = "ServidorOD/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        partes = [parte for parte in url.path.split("/") if parte]
+        parametros = parse_qs(url.query)
+
+        try:
+            if partes == ["saude"]:
+                self._responder_json(
+                    200, {"status": "ok", "projetos_em_cache": len(self.server.cache)}
+                )
+                return
+
+            if not partes or partes[0] != "dias" or len(partes) > 3:
+                raise ErroServico(404, "Rota não encontrada")
+
+            gerador = self.server.cache.obter(self._pasta_projeto(parametros))
+
+            if len(partes) == 1:
+                self._responder_json(200, listar_dias(gerador))
+                return
+
+            dia_str = partes[1]
+            if not dia_str.isdigit():
+                raise ErroServico(400, "Número do dia inválido")
+            dia_str = str(int(dia_str))
+
+            if len(partes) == 2:
+                self._responder_json(200, resumo_dia(gerador, dia_str))
+            elif partes[2] == "xlsx":
+                conteudo = planilha_dia(gerador, dia_str)
+                self._responder(
+                    200,
+                    conteudo,
+                    TIPO_XLSX,
+                    {
+                        "Content-Disposition": f'attachment; filename="OD_Dia_{dia_str}.xlsx"'
+                    },
+                )
+            else:
+                raise ErroServico(404, "Rota não encontrada")
+
+        except ErroServico as e:
+            self._responder_json(e.status, {"erro": str(e)})
+        except Exception as e:
+            self._responder_json(500, {"erro": f"Erro interno: {e}"})
+
+    def _pasta_projeto(self, parametros):
+        """Resolve ?projeto= dentro da raiz do serviço (sem sair dela)"""
+        raiz = self.server.raiz
+        relativo = parametros.get("projeto", [""])[0]
+        pasta = os.path.realpath(os.path.join(raiz, relativo))
+        if os.path.commonpath([raiz, pasta]) != raiz:
+            raise ErroServico(403, "Projeto fora da pasta raiz do serviço")
+        return pasta
+
+    def _responder_json(self, status, dados):
+        conteudo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self._responder(status, conteudo, "application/json; charset=utf-8")
+
+    def _responder(self, status, conteudo, tipo, cabecalhos=None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        if not self.server.silencioso:
+            print(f"🌐 {self.address_string()} - {formato % args}")
+
+
+class ServidorOD(ThreadingHTTPServer):
+    """Servidor HTTP com um cache de projetos compartilhado entre as threads"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        endereco=("127.0.0.1", PORTA_PADRAO),
+        raiz=".",
+        max_projetos=MAX_PROJETOS_PADRAO,
+        silencioso=False,
+    ):
+        super().__init__(endereco, ManipuladorOD)
+        self.raiz = os.path.realpath(raiz)
+        self.cache = CacheProjetos(max_projetos)
+        self.silencioso = silencioso
+
+
+def main(argv=None):
+    """Linha de comando do serviço"""
+    parser = argparse.ArgumentParser(description="Serviço local HTTP/JSON de ODs")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument(
+        "--raiz", default=".", help="pasta que contém os projetos (padrão: atual)"
+    )
+    parser.add_argument(
+        "--max-projetos",
+        type=int,
+        default=MAX_PROJETOS_PADRAO,
+        help="projetos mantidos em memória",
+    )
+    args = parser.parse_args(argv)
+
+    servidor = ServidorOD(("127.0.0.1", args.porta), args.raiz, args.max_projetos)
+    print(f"🌐 Serviço de OD em http://127.0.0.1:{args.porta} (raiz: {servidor.raiz})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Serviço encerrado")
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Snapshot binário do projeto carregado
+Serializa decupagem, cronograma, índices e título em um único arquivo compacto,
+validado por versão de formato e digests das fontes (CSV e PDF)
+"""
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+
+# Incrementar sempre que a estrutura do payload ou o parser mudar
+VERSAO_FORMATO = 1
+
+MAGIC = b"ODSNAP"
+
+# magic, versão do formato, versão do Python (major, minor), versão do marshal,
+# digest da decupagem, digest do plano, tamanho do payload
+CABECALHO = struct.Struct("<6sHBBB32s32sQ")
+
+
+def calcular_digest_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """Calcula o SHA-256 de um arquivo (None se não existir)"""
+    if not caminho or not os.path.exists(caminho):
+        return None
+
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            sha.update(bloco)
+    return sha.digest()
+
+
+def calcular_digests_fontes(arquivo_decupagem, arquivo_plano):
+    """Retorna os digests (decupagem, plano) ou None se alguma fonte faltar"""
+    digest_decupagem = calcular_digest_arquivo(arquivo_decupagem)
+    digest_plano = calcular_digest_arquivo(arquivo_plano)
+    if digest_decupagem is None or digest_plano is None:
+        return None
+    return digest_decupagem, digest_plano
+
+
+def salvar_snapshot(caminho, digests, dados):
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)"""
+    payload = marshal.dumps(dados)
+    cabecalho = CABECALHO.pack(
+        MAGIC,
+        VERSAO_FORMATO,
+        sys.version_info[0],
+        sys.version_info[1],
+        marshal.version,
+        digests[0],
+        digests[1],
+        len(payload),
+    )
+
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(cabecalho)
+        f.write(payload)
+    os.replace(temporario, caminho)
+    return CABECALHO.size + len(payload)
+
+
+def carregar_snapshot(caminho, digests):
+    """Lê o snapshot em uma única leitura
+
+    Retorna None quando o arquivo não existe, está corrompido, foi gravado por
+    outra versão do formato/Python ou quando os digests das fontes não batem.
+    """
+    if digests is None or not os.path.exists(caminho):
+        return None
+
+    try:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+
+        if len(conteudo) < CABECALHO.size:
+            return None
+
+        (
+            magic,
+            versao,
+            py_major,
+            py_minor,
+            versao_marshal,
+            digest_decupagem,
+            digest_plano,
+            tamanho_payload,
+        ) = CABECALHO.unpack_from(conteudo)
+
+        if magic != MAGIC or versao != VERSAO_FORMATO:
+            return None
+        if (py_major, py_minor) != tuple(sys.version_info[:2]):
+            return None
+        if versao_marshal != marshal.version:
+            return None
+        if (digest_decupagem, digest_plano) != tuple(digests):
+            return None
+        if len(conteudo) - CABECALHO.size != tamanho_payload:
+            return None
+
+        # Arquivo local gerado pelo próprio sistema e validado pelo cabeçalho
+        dados = marshal.loads(memoryview(conteudo)[CABECALHO.size :])  # nosec B302
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+
+    if not isinstance(dados, dict):
+        return None
+    return dados
@@ -0,0 +1,36 @@
+"""
+Fixtures compartilhadas dos testes
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importado fora do patch.dict da fixture gui_modulo: ao sair, o patch remove
+# os módulos importados dentro dele e o pickle das tarefas do pool de
+# processos passaria a encontrar outra classe _CallItem
+import geracao_paralela  # noqa: E402,F401
+
+
+@pytest.fixture
+def gui_modulo():
+    """Importa gerar_od_gui com customtkinter/tkinter simulados (sem janela real)."""
+    with patch.dict(
+        "sys.modules",
+        {
+            "customtkinter": MagicMock(),
+            "tkinter": MagicMock(),
+            "tkinter.messagebox": MagicMock(),
+            "tkinter.filedialog": MagicMock(),
+        },
+    ):
+        sys.modules.pop("gerar_od_gui", None)
+        import gerar_od_gui
+
+        yield gerar_od_gui
+        sys.modules.pop("gerar_od_gui", None)
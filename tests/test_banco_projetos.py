@@ -0,0 +1,183 @@
+"""
+Testes para o banco SQLite de projetos e revisões
+"""
+
+import pytest
+import os
+import sys
+import copy
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banco_projetos import BancoProjetos, main
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+
+
+def _gerador_com_dados():
+    """Gerador com um projeto mínimo já carregado em memória."""
+    gerador = GeradorODCompleto()
+    gerador.dados_decupagem = {
+        "1": {
+            "locacao": "CASA",
+            "descricao": "ABERTURA",
+            "elenco": "Maria / Lauro",
+            "observacoes": "",
+            "planos": [
+                {"planos": "1 - GERAL", "elenco": "Maria", "observacoes": ""},
+                {"planos": "1.1 - DETALHE", "elenco": "nan", "observacoes": "nan"},
+            ],
+        }
+    }
+    gerador.config = {
+        "projeto": {"titulo": "ACORDA", "diretor": "", "total_dias": 1},
+        "dias_filmagem": {
+            "1": {
+                "cronograma_completo": [
+                    {
+                        "tipo": "atividade_fixa",
+                        "horario_inicio": "07h00",
+                        "horario_fim": "07h30",
+                        "atividade": "CAFÉ DA MANHÃ",
+                        "linha_original": "07h00 - 07h30 CAFÉ DA MANHÃ",
+                    },
+                    {
+                        "tipo": "cena",
+                        "numero": 1,
+                        "tipo_local": "INT",
+                        "descricao": "COZINHA",
+                        "horario_inicio": "",
+                        "horario_fim": "",
+                        "linha_original": "1 INT COZINHA",
+                        "descricao_detalhada": "MANHÃ ABERTURA. Elenco: 1",
+                    },
+                    {
+                        "tipo": "rec",
+                        "descricao": "REC: PD",
+                        "horario_inicio": "",
+                        "horario_fim": "",
+                        "linha_original": "REC: PD",
+                    },
+                ],
+                "cenas": ["1"],
+                "locacao_principal": "A DEFINIR",
+                "atividades_fixas": [],
+            }
+        },
+    }
+    return gerador
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """Banco temporário."""
+    with BancoProjetos(str(tmp_path / "projetos.db")) as banco:
+        yield banco
+
+
+def test_roundtrip_revisao(banco):
+    """Revisão gravada é restaurada igual ao projeto original."""
+    original = _gerador_com_dados()
+    revisao_id = banco.importar_gerador(original, "ACORDA", "v1")
+
+    restaurado = GeradorODCompleto()
+    assert banco.carregar_revisao(revisao_id, restaurado)
+
+    assert restaurado.dados_decupagem == original.dados_decupagem
+    assert restaurado.config == original.config
+    assert restaurado.indices["dias_por_cena"] == {"1": ["1"]}
+
+
+def test_revisoes_e_historico_cena(banco):
+    """Consultas entre revisões."""
+    gerador = _gerador_com_dados()
+    banco.importar_gerador(gerador, "ACORDA", "v1")
+
+    revisado = copy.deepcopy(gerador.config)
+    revisado["dias_filmagem"]["2"] = revisado["dias_filmagem"].pop("1")
+    gerador.config = revisado
+    banco.importar_gerador(gerador, "ACORDA", "v2")
+
+    assert banco.listar_projetos() == [{"nome": "ACORDA", "revisoes": 2}]
+    assert [r["rotulo"] for r in banco.listar_revisoes("ACORDA")] == ["v2", "v1"]
+    assert banco.historico_cena("ACORDA", "1") == [
+        {"rotulo": "v1", "dia": 1},
+        {"rotulo": "v2", "dia": 2},
+    ]
+    assert banco.buscar_revisao("ACORDA") == banco.buscar_revisao("ACORDA", "v2")
+
+
+def test_reimportar_mesmo_rotulo_substitui(banco):
+    """Reimportar a mesma revisão não duplica dados."""
+    gerador = _gerador_com_dados()
+    banco.importar_gerador(gerador, "ACORDA", "v1")
+    banco.importar_gerador(gerador, "ACORDA", "v1")
+
+    assert banco.listar_projetos() == [{"nome": "ACORDA", "revisoes": 1}]
+    total_itens = banco.conexao.execute(
+        "SELECT COUNT(*) FROM itens_cronograma"
+    ).fetchone()[0]
+    assert total_itens == 3
+
+
+def test_importar_sem_cronograma_falha(banco):
+    """Configuração padrão (sem PDF) não é importada."""
+    gerador = _gerador_com_dados()
+    del gerador.config["dias_filmagem"]["1"]["cronograma_completo"]
+
+    with pytest.raises(ValueError):
+        banco.importar_gerador(gerador, "ACORDA", "v1")
+
+
+def test_gerar_od_da_revisao(banco, tmp_path):
+    """OD é gerada a partir do banco sem reler as fontes."""
+    revisao_id = banco.importar_gerador(_gerador_com_dados(), "ACORDA", "v1")
+
+    gerador = GeradorODCompleto()
+    gerador.pasta_ods = str(tmp_path)
+    gerador.arquivo_decupagem = str(tmp_path / "inexistente.csv")
+    assert banco.carregar_revisao(revisao_id, gerador)
+    assert gerador.renderizar_od_dia(1)
+    assert (tmp_path / "OD_Dia_1.xlsx").exists()
+
+
+def test_carregar_revisao_descarta_estado_anterior(banco, tmp_path):
+    """Revisão do banco passa por restaurar_estado: nada do projeto anterior fica."""
+    revisao_id = banco.importar_gerador(_gerador_com_dados(), "ACORDA", "v1")
+
+    gerador = GeradorODCompleto()
+    gerador.dia_parcial = "3"
+    gerador._fontes_carregadas = object()
+    gerador.digests_carregados = (b"x" * 32, b"y" * 32)
+    gerador.indices = {"cenas_por_dia": {"3": ["9"]}, "dias_por_cena": {}}
+
+    assert banco.carregar_revisao(revisao_id, gerador)
+    assert gerador.dia_parcial is None
+    assert gerador._fontes_carregadas is None
+    assert gerador.digests_carregados != (b"x" * 32, b"y" * 32)
+    assert gerador.indices["cenas_por_dia"] == {"1": ["1"]}
+
+
+def test_banco_cria_pasta_do_arquivo(tmp_path):
+    """O caminho padrão fica em arquivos/, que pode ainda não existir."""
+    caminho = tmp_path / "arquivos" / "projetos.db"
+    with BancoProjetos(str(caminho)) as banco:
+        assert banco.listar_projetos() == []
+    assert caminho.exists()
+
+
+def test_cli_erros_viram_mensagem(tmp_path, monkeypatch, capsys):
+    """Plano sem cronograma e dia inválido: mensagem e código 1, sem traceback."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    os.remove(tmp_path / "arquivos" / "PLANO_FINAL.pdf")
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["importar", "ACORDA", "v1"]) == 1
+    assert "sem cronograma do PDF" in capsys.readouterr().out
+
+    assert main(["gerar", "ACORDA", "um"]) == 1
+    assert "❌ Dia inválido: um" in capsys.readouterr().out
+
+    assert main(["cena", "ACORDA", "7B"]) == 1
+    assert "❌ Cena inválida: 7B" in capsys.readouterr().out
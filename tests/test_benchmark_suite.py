@@ -0,0 +1,65 @@
+"""
+Testes para a suíte de benchmarks (execução e comparação com baseline)
+"""
+
+import os
+import sys
+import json
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import suite
+
+
+def _documento(**medianas):
+    """Resultados mínimos com as medianas indicadas para o tamanho 'pequeno'."""
+    return {
+        "repeticoes": 1,
+        "resultados": {
+            "pequeno": {
+                "corpus": {"dias": 1, "cenas": 1, "planos": 1, "paginas": 1},
+                "etapas": {
+                    etapa: {"mediana_ms": valor, "min_ms": valor}
+                    for etapa, valor in medianas.items()
+                },
+            }
+        },
+    }
+
+
+def test_comparar_marca_regressoes():
+    """Regressão exige passar do limite relativo e do mínimo absoluto."""
+    base = _documento(extrair_pdf=100.0, gravar_config=1.0, montar_dia=50.0)
+    atual = _documento(extrair_pdf=130.0, gravar_config=2.0, montar_dia=40.0)
+
+    linhas = {linha[1]: linha for linha in suite.comparar(base, atual, 0.2, 2.0)}
+    assert linhas["extrair_pdf"][5] is True
+    assert linhas["gravar_config"][5] is False  # +100%, mas só 1 ms
+    assert linhas["montar_dia"][5] is False
+
+
+def test_compare_pela_linha_de_comando(tmp_path):
+    """Comando compare sai com 1 quando há regressão."""
+    base = tmp_path / "base.json"
+    atual = tmp_path / "atual.json"
+    base.write_text(json.dumps(_documento(extrair_pdf=100.0)), encoding="utf-8")
+
+    atual.write_text(json.dumps(_documento(extrair_pdf=105.0)), encoding="utf-8")
+    assert suite.main(["compare", str(base), str(atual)]) == 0
+
+    atual.write_text(json.dumps(_documento(extrair_pdf=200.0)), encoding="utf-8")
+    assert suite.main(["compare", str(base), str(atual)]) == 1
+
+
+def test_executar_suite_mede_todas_as_etapas():
+    """Suíte roda ponta a ponta num corpus mínimo."""
+    parametros = {
+        "pequeno": {"dias": 1, "cenas_por_dia": 2, "planos_por_cena": 1, "elenco": 2}
+    }
+    documento = suite.executar_suite(["pequeno"], 1, parametros)
+
+    etapas = documento["resultados"]["pequeno"]["etapas"]
+    assert list(etapas) == suite.ETAPAS
+    assert all(medida["mediana_ms"] >= 0 for medida in etapas.values())
+    assert documento["resultados"]["pequeno"]["corpus"]["dias"] == 1
@@ -0,0 +1,119 @@
+"""
+Testes de conformidade dos extratores de texto de PDF
+"""
+
+import pytest
+import os
+import sys
+import shutil
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extratores_pdf import EXTRATORES, criar_extrator, montar_texto
+from gerador_od_completo import GeradorODCompleto
+from memoria_processo import formatar_mb, pico_rss_bytes
+
+
+def _cronograma(pasta, extrator):
+    """Cronograma extraído do plano do projeto com o extrator indicado."""
+    gerador = GeradorODCompleto(pasta_projeto=str(pasta), extrator_pdf=extrator)
+    return gerador._processar_plano_pdf(gerador.arquivo_plano)
+
+
+@pytest.fixture
+def projeto(tmp_path):
+    """Cópia do plano de exemplo numa pasta de projeto temporária."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+    (tmp_path / "arquivos").mkdir()
+    shutil.copy("arquivos/PLANO_FINAL.pdf", tmp_path / "arquivos")
+    return tmp_path
+
+
+@pytest.mark.parametrize("nome", [nome for nome in EXTRATORES if nome != "pdfplumber"])
+def test_cronograma_identico_ao_pdfplumber(projeto, nome):
+    """Todo backend produz o mesmo cronograma que o padrão."""
+    if nome == "pypdf":
+        pytest.importorskip("pypdf")
+
+    referencia = _cronograma(projeto, "pdfplumber")
+    assert len(referencia) == 5
+    assert _cronograma(projeto, nome) == referencia
+
+
+def test_escolha_do_extrator(monkeypatch):
+    """Parâmetro tem prioridade sobre a variável de ambiente."""
+    monkeypatch.delenv("OD_EXTRATOR_PDF", raising=False)
+    assert criar_extrator().nome == "pdfplumber"
+
+    monkeypatch.setenv("OD_EXTRATOR_PDF", "pdfminer")
+    assert criar_extrator().nome == "pdfminer"
+    assert criar_extrator("pdfplumber").nome == "pdfplumber"
+
+    with pytest.raises(ValueError):
+        criar_extrator("inexistente")
+
+
+def test_montar_texto_linhas_e_palavras():
+    """Caracteres próximos formam palavras; topos próximos formam linhas."""
+    fragmentos = [
+        (10, 15, 100.5, "B"),
+        (0, 5, 100, "A"),
+        (5, 10, 101, "1"),
+        (30, 35, 100, "C"),
+        (0, None, 120, "REC: 7B"),
+        (50, None, 121, "0:30"),
+    ]
+    assert montar_texto(fragmentos) == "A1B C\nREC: 7B 0:30"
+
+
+def test_pdfplumber_libera_cache_das_paginas():
+    """Objetos de layout de cada página são descartados após extrair o texto."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+
+    extrator = criar_extrator("pdfplumber")
+    documento = extrator.abrir("arquivos/PLANO_FINAL.pdf")
+    try:
+        for indice in range(extrator.total_paginas(documento)):
+            assert extrator.texto_pagina(documento, indice)
+        for pagina in documento.pages:
+            assert not hasattr(pagina, "_objects")
+            assert not hasattr(pagina, "_layout")
+    finally:
+        extrator.fechar(documento)
+
+
+def test_pdfplumber_pagina_so_com_close():
+    """Versões sem flush_cache: close() basta, e nenhum dos dois também serve."""
+
+    class PaginaComClose:
+        fechada = False
+
+        def extract_text(self):
+            return "texto"
+
+        def close(self):
+            self.fechada = True
+
+    class PaginaSemLiberar:
+        def extract_text(self):
+            return "texto"
+
+    extrator = criar_extrator("pdfplumber")
+    documento = type("Documento", (), {})()
+    documento.pages = [PaginaComClose(), PaginaSemLiberar()]
+
+    assert extrator.texto_pagina(documento, 0) == "texto"
+    assert documento.pages[0].fechada
+    assert extrator.texto_pagina(documento, 1) == "texto"
+
+
+def test_pico_rss():
+    """Pico de RSS é informado em bytes (ou desconhecido)."""
+    pico = pico_rss_bytes()
+    if sys.platform.startswith("linux"):
+        assert pico > 1024 * 1024
+    assert formatar_mb(None) == "?"
+    assert formatar_mb(3 * 1024 * 1024) == "3.0 MB"
@@ -0,0 +1,154 @@
+"""
+Testes para a geração paralela de dias com status por dia
+"""
+
+import pytest
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import load_workbook
+
+from geracao_paralela import (
+    STATUS_CANCELADO,
+    STATUS_CONCLUIDO,
+    STATUS_GRAVANDO,
+    STATUS_NA_FILA,
+    STATUS_RENDERIZANDO,
+    PoolGeracao,
+    gerar_dias_em_paralelo,
+    workers_padrao,
+    workers_por_nucleos,
+)
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+from progresso_od import TokenCancelamento
+
+
+@pytest.fixture
+def gerador(tmp_path):
+    gerar_corpus(str(tmp_path), dias=4, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador.carregar_projeto()
+    return gerador
+
+
+def _status_por_dia(eventos):
+    por_dia = {}
+    for dia, status, ms in eventos:
+        por_dia.setdefault(dia, []).append(status)
+    return por_dia
+
+
+def test_workers_padrao_deixa_um_nucleo_livre():
+    assert workers_padrao(10, nucleos=8) == 7
+    assert workers_padrao(3, nucleos=8) == 3
+    assert workers_padrao(5, nucleos=1) == 1
+    assert workers_por_nucleos(8) == 7
+    assert workers_por_nucleos(1) == 1
+
+
+def test_processos_geram_todos_os_dias_em_ordem(gerador):
+    """Resultados na ordem pedida e status completos de cada dia."""
+    eventos = []
+    resultados = gerar_dias_em_paralelo(
+        gerador,
+        ["3", "1", "4", "2"],
+        workers=2,
+        ao_status=lambda *evento: eventos.append(evento),
+    )
+
+    assert [resultado["dia"] for resultado in resultados] == ["3", "1", "4", "2"]
+    assert all(resultado["sucesso"] for resultado in resultados)
+    assert all(resultado["ms"] > 0 for resultado in resultados)
+
+    for dia, status in _status_por_dia(eventos).items():
+        assert status[0] == STATUS_NA_FILA, dia
+        assert status[-1] == STATUS_CONCLUIDO, dia
+        # Status intermediários chegam na ordem, e nunca depois do final
+        intermediarios = status[1:-1]
+        assert intermediarios in (
+            [],
+            [STATUS_RENDERIZANDO],
+            [STATUS_GRAVANDO],
+            [STATUS_RENDERIZANDO, STATUS_GRAVANDO],
+        ), dia
+
+    for dia in range(1, 5):
+        load_workbook(os.path.join(gerador.pasta_ods, f"OD_Dia_{dia}.xlsx"))
+
+
+def test_sequencial_cancelado_marca_dias_restantes(gerador):
+    """Com um processo, o cancelamento vale entre linhas e os demais dias saem."""
+    token = TokenCancelamento()
+    gerador.cancelamento = token
+
+    def ao_progresso(unidade, atual, total, dia):
+        if unidade == "linha" and dia == 2:
+            token.cancelar()
+
+    gerador.ao_progresso = ao_progresso
+    eventos = []
+    resultados = gerar_dias_em_paralelo(
+        gerador,
+        ["1", "2", "3"],
+        workers=1,
+        ao_status=lambda *evento: eventos.append(evento),
+        cancelamento=token,
+    )
+
+    assert [resultado["dia"] for resultado in resultados] == ["1"]
+    por_dia = _status_por_dia(eventos)
+    assert por_dia["1"] == [
+        STATUS_NA_FILA,
+        STATUS_RENDERIZANDO,
+        STATUS_GRAVANDO,
+        STATUS_CONCLUIDO,
+    ]
+    assert por_dia["2"][-1] == STATUS_CANCELADO
+    assert por_dia["3"] == [STATUS_NA_FILA, STATUS_CANCELADO]
+    assert not os.path.exists(os.path.join(gerador.pasta_ods, "OD_Dia_2.xlsx"))
+    assert gerador.metricas.observadores == []
+
+
+def test_pool_reaproveita_processos_e_so_regrava_estado_alterado(gerador):
+    """Processos vivos entre gerações; poucos dias geram no processo atual."""
+    pool = PoolGeracao(workers=2)
+    try:
+        gerar_dias_em_paralelo(gerador, ["1", "2"], pool=pool)
+        assert pool._executor is None  # dois dias: sem subir processos
+
+        resultados = gerar_dias_em_paralelo(gerador, ["1", "2", "3"], pool=pool)
+        assert all(resultado["sucesso"] for resultado in resultados)
+        executor, versao = pool._executor, pool._versao
+        processos = set(executor._processes)
+
+        gerar_dias_em_paralelo(gerador, ["2", "3", "4"], pool=pool)
+        assert pool._executor is executor
+        assert set(executor._processes) == processos
+        assert pool._versao == versao  # estado igual: arquivo não regravado
+
+        # Novo estado (outra carga/revisão) chega aos processos existentes
+        estado = gerador._dados_snapshot()
+        estado["config"] = dict(estado["config"])
+        estado["config"]["projeto"] = dict(
+            estado["config"]["projeto"], titulo="REVISADO"
+        )
+        gerador.restaurar_estado(estado)
+        gerar_dias_em_paralelo(gerador, ["1", "3", "4"], pool=pool)
+        assert pool._executor is executor and pool._versao == versao + 1
+        planilha = load_workbook(os.path.join(gerador.pasta_ods, "OD_Dia_4.xlsx"))
+        textos = [
+            celula.value
+            for linha in planilha.active.iter_rows()
+            for celula in linha
+            if isinstance(celula.value, str)
+        ]
+        assert any("REVISADO" in texto for texto in textos)
+    finally:
+        pool.fechar()
+    assert not any(
+        nome.startswith("estado_geracao") for nome in os.listdir(gerador.pasta_cache)
+    )
@@ -0,0 +1,67 @@
+"""
+Testes para o gerador de corpus sintético
+"""
+
+import pytest
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_corpus import TAMANHOS, gerar_corpus, main
+from gerador_od_completo import GeradorODCompleto
+
+
+def _ler(caminho):
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+def test_mesma_semente_mesmos_bytes(tmp_path):
+    """Corpus é determinístico sob a semente."""
+    a = gerar_corpus(str(tmp_path / "a"), semente=7)
+    b = gerar_corpus(str(tmp_path / "b"), semente=7)
+    c = gerar_corpus(str(tmp_path / "c"), semente=8)
+
+    assert _ler(a["plano"]) == _ler(b["plano"])
+    assert _ler(a["decupagem"]) == _ler(b["decupagem"])
+    assert _ler(a["plano"]) != _ler(c["plano"])
+    assert _ler(a["plano"]).startswith(b"%PDF-1.4")
+
+
+def test_corpus_lido_pelo_gerador(tmp_path):
+    """Plano e decupagem gerados seguem a gramática que o GeradorOD lê."""
+    resumo = gerar_corpus(
+        str(tmp_path), dias=12, cenas_por_dia=8, planos_por_cena=3, elenco=20
+    )
+    assert resumo["paginas"] > 1
+
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador._carregar_dados()
+
+    assert gerador.config["projeto"]["titulo"] == "CORPUS SINTÉTICO"
+    assert gerador.config["projeto"]["total_dias"] == 12
+    assert {
+        dia: config["cenas"] for dia, config in gerador.config["dias_filmagem"].items()
+    } == resumo["cenas_por_dia"]
+    assert len(gerador.dados_decupagem) == resumo["cenas"]
+    assert all(len(cena["planos"]) == 3 for cena in gerador.dados_decupagem.values())
+
+    # Descrição detalhada vem da linha "Elenco:" logo após a cena
+    cronograma = gerador.config["dias_filmagem"]["1"]["cronograma_completo"]
+    cenas = [item for item in cronograma if item["tipo"] == "cena"]
+    assert all("descricao_detalhada" in item for item in cenas)
+
+    assert gerador.renderizar_od_dia(12)
+
+
+def test_linha_de_comando(tmp_path, capsys):
+    """CLI aceita tamanho de referência e sobrescreve parâmetros."""
+    assert main([str(tmp_path), "--tamanho", "pequeno", "--dias", "2"]) == 0
+    assert "2 dias" in capsys.readouterr().out
+    assert os.path.exists(tmp_path / "arquivos" / "PLANO_FINAL.pdf")
+    assert set(TAMANHOS) == {"pequeno", "medio", "grande"}
+
+    with pytest.raises(ValueError):
+        gerar_corpus(str(tmp_path), dias=0)
@@ -0,0 +1,656 @@
+"""
+Testes para o carregamento dos dias em segundo plano e a ponte de eventos
+da GUI (sem janela real)
+"""
+
+import os
+import sys
+import queue
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+from historico_revisoes import HistoricoRevisoes
+from monitor_arquivos import MonitorArquivos
+from progresso_od import TokenCancelamento
+from registro_log import RegistroLog
+
+
+def _gui_sem_janela(gui_modulo, gerador):
+    """Instância da GUI com widgets simulados e root.after registrando callbacks."""
+    app = gui_modulo.GeradorODGUI.__new__(gui_modulo.GeradorODGUI)
+    app.gerador = gerador
+    app.marcos_inicio = {}
+    app._inicio = time.perf_counter()
+    app.root = MagicMock()
+    app.pendentes = []
+    app.root.after.side_effect = lambda atraso, funcao: app.pendentes.append(funcao)
+    app._eventos = queue.Queue()
+    app.registro_log = RegistroLog(
+        os.path.join(gerador.pasta_projeto, "logs", "gui.log"), linhas_visiveis=1000
+    )
+    app.log_text = MagicMock()
+    app.progress_bar = MagicMock()
+    app.progresso_label = MagicMock()
+    app.status_dias_frame = MagicMock()
+    app.status_dias_labels = {}
+    app.cancelamento = TokenCancelamento()
+    app.pool_geracao = gui_modulo.PoolGeracao(workers=2)
+    app.btn_gerar = MagicMock()
+    app.revisao_menu = MagicMock()
+    app.observacao_var = MagicMock()
+    app.observacao_var.get.return_value = False
+    app.historico = HistoricoRevisoes(os.path.join(gerador.pasta_projeto, "revisoes"))
+    app.revisao_selecionada = None
+    app._revisoes_menu = {}
+    gerador.historico = app.historico
+    app.dias_checkboxes_frame = MagicMock()
+    app.dias_checkboxes_frame.winfo_children.return_value = []
+    app.dias_vars = {}
+    app.dias_checkboxes = {}
+    app.dias_disponiveis = []
+    app._carregando_dias = False
+    app._recarregar_dias = False
+    app._ocupado = False
+    app._status_arquivos = None
+    app.todos_dias_var = MagicMock(get=MagicMock(return_value=True))
+    return app
+
+
+def _processar_eventos(app, prazo=10.0):
+    """Simula o mainloop até a leitura em segundo plano terminar."""
+    fim = time.monotonic() + prazo
+    while app._carregando_dias and time.monotonic() < fim:
+        _quadro(app)
+        time.sleep(0.01)
+
+
+def _quadro(app):
+    """Um quadro do mainloop: drena a ponte de eventos uma vez."""
+    app.pendentes.clear()
+    app._drenar_eventos()
+
+
+def _texto_do_log(app):
+    return "".join(chamada.args[1] for chamada in app.log_text.insert.call_args_list)
+
+
+def test_carregamento_nao_bloqueia_a_interface(gui_modulo, tmp_path):
+    """A leitura roda fora da thread da interface e preenche os dias no fim."""
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+
+    liberar = threading.Event()
+    threads_de_leitura = []
+    carregar_original = gerador._carregar_dados
+
+    def carregar_lento(*args, **kwargs):
+        threads_de_leitura.append(threading.current_thread())
+        liberar.wait(5)
+        return carregar_original(*args, **kwargs)
+
+    gerador._carregar_dados = carregar_lento
+
+    app.carregar_dias_disponiveis()
+
+    # Retornou imediatamente, em estado de carregamento
+    assert app._carregando_dias
+    assert app.dias_disponiveis == []
+    app.btn_gerar.configure.assert_called_with(state="disabled")
+
+    # Novo pedido durante a leitura fica para depois (não dispara outra thread)
+    app.carregar_dias_disponiveis()
+    assert app._recarregar_dias
+
+    liberar.set()
+    _processar_eventos(app)
+    _processar_eventos(app)
+
+    assert app.dias_disponiveis == ["1", "2", "3"]
+    assert set(app.dias_vars) == {"1", "2", "3"}
+    # O pedido pendente rodou depois, reaproveitando o projeto já carregado
+    _quadro(app)
+    assert _texto_do_log(app).count("3 dias encontrados") == 2
+    assert len(threads_de_leitura) == 1
+    assert threading.current_thread() not in threads_de_leitura
+    app.btn_gerar.configure.assert_called_with(state="normal")
+
+
+def test_erro_na_leitura_vai_para_o_log(gui_modulo, tmp_path):
+    """Falha na leitura é registrada e o painel sai do estado de carregamento."""
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+    gerador._carregar_dados = MagicMock(side_effect=RuntimeError("PDF corrompido"))
+
+    app.carregar_dias_disponiveis()
+    _processar_eventos(app)
+    _quadro(app)  # mensagem registrada no último callback aparece no quadro seguinte
+
+    assert not app._carregando_dias
+    assert "PDF corrompido" in _texto_do_log(app)
+
+
+def test_eventos_de_threads_sao_agrupados_por_quadro(gui_modulo, tmp_path):
+    """Logs e progresso vindos de threads só tocam os widgets no drenar."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    chamadas_na_interface = []
+
+    def trabalho(n):
+        for i in range(100):
+            app.log(f"thread {n} linha {i}")
+            app._definir_progresso(i / 100)
+        app._definir_status(f"thread {n} pronta")
+        app._na_interface(
+            lambda: chamadas_na_interface.append(threading.current_thread())
+        )
+
+    threads = [threading.Thread(target=trabalho, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Nada foi aplicado fora da thread da interface
+    app.log_text.insert.assert_not_called()
+    app.progress_bar.set.assert_not_called()
+
+    _quadro(app)
+
+    # 400 linhas num único insert; progresso e status só com o último valor
+    assert app.log_text.insert.call_count == 1
+    linhas = _texto_do_log(app).splitlines()
+    assert len(linhas) == 400
+    for n in range(4):
+        minhas = [linha for linha in linhas if linha.startswith(f"thread {n} ")]
+        assert minhas == [f"thread {n} linha {i}" for i in range(100)]
+    app.progress_bar.set.assert_called_once_with(0.99)
+    assert app.progresso_label.configure.call_count == 1
+    assert chamadas_na_interface == [threading.current_thread()] * 4
+
+    # O próximo quadro fica agendado mesmo sem eventos
+    assert app.pendentes == [app._drenar_eventos]
+    _quadro(app)
+    assert app.log_text.insert.call_count == 1
+
+
+def test_log_na_tela_fica_limitado(gui_modulo, tmp_path):
+    """Ao passar do limite, as linhas mais antigas saem do topo do widget."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.registro_log = RegistroLog(str(tmp_path / "gui.log"), linhas_visiveis=10)
+
+    for i in range(8):
+        app.log(f"linha {i}")
+    _quadro(app)
+    app.log_text.delete.assert_not_called()
+
+    for i in range(8, 15):
+        app.log(f"linha {i}")
+    _quadro(app)
+    # 8 + 7 = 15 linhas: as 5 primeiras saem da tela
+    app.log_text.delete.assert_called_once_with("1.0", "6.0")
+    assert list(app.registro_log.linhas) == [f"linha {i}" for i in range(5, 15)]
+    app.registro_log.fechar()
+
+
+def test_gerar_varios_dias_le_o_projeto_uma_vez(gui_modulo, tmp_path):
+    """Listar os dias e gerar três ODs custa uma única leitura das fontes."""
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+    with patch.object(
+        gerador, "_carregar_dados", wraps=gerador._carregar_dados
+    ) as carregar:
+        app.carregar_dias_disponiveis()
+        _processar_eventos(app)
+
+        try:
+            assert app._gerar_dias(["1", "2", "3"]) == (3, 0)
+            assert app._gerar_dias(["2"]) == (1, 0)
+        finally:
+            app.pool_geracao.fechar()
+
+    assert carregar.call_count == 1
+
+    # Linhas de status por dia criadas e atualizadas pela ponte de eventos
+    _quadro(app)
+    assert list(app.status_dias_labels) == ["2"]
+    texto = app.status_dias_labels["2"].configure.call_args.kwargs["text"]
+    assert "✅ concluída" in texto and "ms)" in texto
+    arquivos = set(os.listdir(gerador.pasta_ods))
+    assert {"OD_Dia_1.xlsx", "OD_Dia_2.xlsx", "OD_Dia_3.xlsx"} <= arquivos
+
+
+def test_inicializacao_adiada_e_marcos(gui_modulo, tmp_path, monkeypatch):
+    """Primeira pintura sem gerador nem área de progresso; carga no ocioso."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gui_modulo, "INTERVALO_STATUS_ARQUIVOS", 0.05)
+    agendados = []
+    root = gui_modulo.ctk.CTk.return_value
+    root.winfo_screenwidth.return_value = 1920
+    root.winfo_screenheight.return_value = 1080
+    root.after.side_effect = lambda atraso, funcao: agendados.append(funcao)
+    root.after_idle.side_effect = agendados.append
+
+    app = gui_modulo.GeradorODGUI()
+
+    # Janela pintada com o essencial; gerador e área de progresso ainda não
+    assert set(app.marcos_inicio) == {"primeira_pintura"}
+    assert app.gerador is None
+    assert not hasattr(app, "log_text")
+    assert agendados == [app._concluir_interface]
+
+    # Mainloop simulado: constrói o resto, verifica arquivos e carrega os dias
+    fim = time.monotonic() + 10
+    while "interativa" not in app.marcos_inicio and time.monotonic() < fim:
+        if agendados:
+            agendados.pop(0)()
+        else:
+            time.sleep(0.01)
+    app._drenar_eventos()
+    app.registro_log.fechar()
+    while app.monitor_entrada is None and time.monotonic() < fim:
+        time.sleep(0.01)
+    app.monitor_entrada.parar()
+
+    assert hasattr(app, "log_text")
+    assert app.gerador is not None
+    assert app.dias_disponiveis == ["1", "2"]
+    assert app.marcos_inicio["primeira_pintura"] <= app.marcos_inicio["interativa"]
+    assert any("⏱️ Inicialização" in linha for linha in app.registro_log.linhas)
+
+
+def test_verificar_arquivos_sem_mudancas_nao_custa_nada(
+    gui_modulo, tmp_path, monkeypatch
+):
+    """Só os.stat quando nada mudou; recarga só quando o conteúdo muda."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gui_modulo, "ToastNotification", MagicMock())
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.decupagem_status = MagicMock()
+    app.plano_status = MagicMock()
+    app.observacao_var = MagicMock(get=MagicMock(return_value=False))
+    app._status_arquivos = None
+    app.carregar_dias_disponiveis = MagicMock()
+    app.monitor_entrada = MonitorArquivos(
+        gui_modulo.ARQUIVOS_ENTRADA, usar_inotify=False
+    )
+
+    app.verificar_arquivos()
+    assert app.carregar_dias_disponiveis.call_count == 1
+    app.decupagem_status.configure.reset_mock()
+
+    # Cliques repetidos sem alteração: nem hash, nem rótulos, nem recarga
+    with patch("monitor_arquivos.calcular_digest_arquivo") as digest:
+        for _ in range(5):
+            app.verificar_arquivos_com_toast()
+        digest.assert_not_called()
+    app.decupagem_status.configure.assert_not_called()
+    assert app.carregar_dias_disponiveis.call_count == 1
+
+    # Só o mtime mudou: o hash confirma que o conteúdo é o mesmo
+    os.utime(gui_modulo.ARQUIVO_DECUPAGEM_GUI, ns=(0, 10**18))
+    app.verificar_arquivos_com_toast()
+    assert app.carregar_dias_disponiveis.call_count == 1
+
+    with open(gui_modulo.ARQUIVO_DECUPAGEM_GUI, "a", encoding="utf-8") as f:
+        f.write("\n")
+    app.verificar_arquivos_com_toast()
+    assert app.carregar_dias_disponiveis.call_count == 2
+
+    # Arquivo removido: rótulo e botão mudam, sem recarga
+    os.remove(gui_modulo.ARQUIVO_PLANO_GUI)
+    app.verificar_arquivos_com_toast()
+    assert app.carregar_dias_disponiveis.call_count == 2
+    app.plano_status.configure.assert_called_with(
+        text="❌ PLANO_FINAL.pdf", text_color="#dc3545"
+    )
+    app.btn_gerar.configure.assert_called_with(state="disabled")
+
+
+def test_limpar_ods_roda_fora_da_interface(gui_modulo, tmp_path, monkeypatch):
+    """Levantamento e exclusão em segundo plano; a interface só pergunta e mostra."""
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+    app.btn_limpar = MagicMock()
+    app.btn_verificar = MagicMock()
+    app.btn_cancelar = MagicMock()
+    pasta_ods = tmp_path / "ODs"
+    pasta_ods.mkdir()
+    for dia in range(1, 6):
+        (pasta_ods / f"OD_Dia_{dia}.xlsx").write_bytes(b"x")
+    monkeypatch.setattr(gui_modulo, "PASTA_ODS_GUI", str(pasta_ods))
+    monkeypatch.setattr(
+        gui_modulo, "PASTA_ARQUIVO_ODS_GUI", str(tmp_path / "ODs_arquivo")
+    )
+
+    threads_de_disco = []
+    for nome in ("listar_ods", "excluir_ods"):
+        original = getattr(gui_modulo, nome)
+
+        def registrar(*args, _original=original, **kwargs):
+            threads_de_disco.append(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(gui_modulo, nome, registrar)
+
+    messagebox = gui_modulo.messagebox
+    messagebox.askyesnocancel.return_value = False  # Não: excluir...
+    messagebox.askyesno.return_value = False  # ...mas "Não" na confirmação
+
+    def esperar_botoes_liberados():
+        fim = time.monotonic() + 10
+        while time.monotonic() < fim:
+            _quadro(app)
+            if app.btn_limpar.configure.call_args.kwargs == {"state": "normal"}:
+                return
+            time.sleep(0.01)
+        raise AssertionError("botões não foram reabilitados")
+
+    app.limpar_ods()
+    app.btn_limpar.configure.assert_called_with(state="disabled")
+    esperar_botoes_liberados()
+    assert len(list(pasta_ods.iterdir())) == 5  # "Não" nunca apaga
+    assert messagebox.askyesno.call_args.kwargs["default"] == messagebox.NO
+
+    messagebox.askyesno.return_value = True
+    app.btn_limpar.reset_mock()
+    app.limpar_ods()
+    esperar_botoes_liberados()
+
+    assert len(threads_de_disco) == 3
+    assert threading.main_thread() not in threads_de_disco
+    assert "✅ 5 arquivo(s) de OD removido(s)" in _texto_do_log(app)
+    assert list(pasta_ods.iterdir()) == []
+    app.progress_bar.set.assert_called_with(1.0)
+    messagebox.showinfo.assert_called()
+
+    # Sim: a pasta inteira vai para o arquivo datado
+    (pasta_ods / "OD_Dia_1.xlsx").write_bytes(b"x")
+    messagebox.askyesnocancel.return_value = True
+    app.btn_limpar.reset_mock()
+    app.limpar_ods()
+    esperar_botoes_liberados()
+    arquivados = list((tmp_path / "ODs_arquivo").iterdir())
+    assert len(arquivados) == 1
+    assert [p.name for p in arquivados[0].iterdir()] == ["OD_Dia_1.xlsx"]
+    assert list(pasta_ods.iterdir()) == []
+
+
+def test_trocar_revisao_recarrega_dias_sem_reler_fontes(gui_modulo, tmp_path):
+    """O seletor lista as revisões carregadas e alterna entre elas pela memória."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+    app.carregar_dias_disponiveis()
+    _processar_eventos(app)
+
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    app.carregar_dias_disponiveis()
+    _processar_eventos(app)
+    assert app.dias_disponiveis == ["1", "2", "3"]
+
+    rotulos = list(app._revisoes_menu)
+    assert rotulos[0] == gui_modulo.ROTULO_REVISAO_ATUAL
+    assert len(rotulos) == 3
+    app.revisao_menu.set.assert_called_with(gui_modulo.ROTULO_REVISAO_ATUAL)
+
+    with patch.object(
+        gerador, "_carregar_decupagem", side_effect=AssertionError
+    ), patch.object(gerador, "_processar_plano_pdf", side_effect=AssertionError):
+        # Mais antiga por último: a revisão com dois dias
+        app.on_revisao_changed(rotulos[-1])
+        _processar_eventos(app)
+        assert app.dias_disponiveis == ["1", "2"]
+        assert "(da memória)" in _texto_do_log(app)
+        app.revisao_menu.set.assert_called_with(rotulos[-1])
+
+        app.on_revisao_changed(gui_modulo.ROTULO_REVISAO_ATUAL)
+        _processar_eventos(app)
+        assert app.dias_disponiveis == ["1", "2", "3"]
+
+
+def test_observacao_recarrega_sob_lock_e_atualiza_na_interface(gui_modulo, tmp_path):
+    """Callback do monitor: recarga sob _lock_carga, dias só mudam na interface."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador.carregar_projeto()
+    app = _gui_sem_janela(gui_modulo, gerador)
+    app.dias_disponiveis = ["1", "2"]
+
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    locks = []
+    carregar_decupagem = gerador._carregar_decupagem
+
+    def carregar_registrando(*args, **kwargs):
+        locks.append(gerador._lock_carga.locked())
+        return carregar_decupagem(*args, **kwargs)
+
+    with patch.object(gerador, "_carregar_decupagem", carregar_registrando):
+        thread = threading.Thread(
+            target=app._ao_alterar_arquivos,
+            args=({gerador.arquivo_decupagem, gerador.arquivo_plano},),
+        )
+        thread.start()
+        thread.join(10)
+
+    assert locks == [True]
+    assert app.dias_disponiveis == ["1", "2"]  # nada mudou fora da interface
+    _quadro(app)
+    assert app.dias_disponiveis == ["1", "2", "3"]
+    assert "✅ OD do Dia 3 regenerada" in _texto_do_log(app)
+
+
+def test_ativar_observacao_prepara_fora_da_interface(gui_modulo, tmp_path):
+    """Gerador e digests do monitor são preparados em segundo plano."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.gerador = None  # ainda não criado, como logo após a primeira pintura
+    app._lock_gerador = threading.Lock()
+    app.observacao_checkbox = MagicMock()
+    app.observacao_var.get.return_value = True
+    app.monitor = None
+    threads_do_gerador = []
+
+    def criar_gerador(*args, **kwargs):
+        threads_do_gerador.append(threading.current_thread())
+        return GeradorODCompleto(pasta_projeto=str(tmp_path))
+
+    with patch("gerador_od_completo.GeradorODCompleto", side_effect=criar_gerador):
+        app.on_observacao_changed()
+        assert app.monitor is None
+        app.observacao_checkbox.configure.assert_called_with(state="disabled")
+
+        fim = time.monotonic() + 10
+        while app.monitor is None and time.monotonic() < fim:
+            _quadro(app)
+            time.sleep(0.01)
+
+    try:
+        assert app.monitor.ativo
+        assert (
+            threads_do_gerador and threading.current_thread() not in threads_do_gerador
+        )
+        app.observacao_checkbox.configure.assert_called_with(state="normal")
+    finally:
+        app.monitor.parar()
+    _quadro(app)
+    assert "👁️ Observação de arquivos ativada" in _texto_do_log(app)
+
+
+def test_cancelar_durante_leitura_em_segundo_plano(gui_modulo, tmp_path):
+    """Cancelar com uma leitura em andamento não trava a lista de dias."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    app = _gui_sem_janela(gui_modulo, gerador)
+    app.perfil_var = MagicMock(get=MagicMock(return_value=False))
+    app.btn_limpar = MagicMock()
+    app.btn_verificar = MagicMock()
+    app.btn_cancelar = MagicMock()
+
+    # Geração em andamento: o token está preso ao gerador compartilhado
+    gerador.cancelamento = app.cancelamento
+    lendo = threading.Event()
+    liberar = threading.Event()
+    carregar_decupagem = gerador._carregar_decupagem
+
+    def carregar_e_esperar(*args, **kwargs):
+        lendo.set()
+        liberar.wait(5)
+        return carregar_decupagem(*args, **kwargs)
+
+    with patch.object(gerador, "_carregar_decupagem", carregar_e_esperar):
+        app.carregar_dias_disponiveis()
+        assert lendo.wait(5)
+        app.cancelamento.cancelar()
+        liberar.set()
+        _processar_eventos(app)
+    _quadro(app)
+
+    assert not app._carregando_dias
+    assert "interrompida pelo cancelamento" in _texto_do_log(app)
+
+    # A geração solta o token ao terminar; a próxima leitura não é cancelada
+    app.cancelamento.reiniciar()
+    try:
+        app.executar_geracao(["1"])
+    finally:
+        app.pool_geracao.fechar()
+    assert gerador.cancelamento is None
+    app.cancelamento.cancelar()
+    app.carregar_dias_disponiveis()
+    _processar_eventos(app)
+    assert app.dias_disponiveis == ["1", "2"]
+
+
+def test_perfil_gera_no_processo_da_interface(gui_modulo, tmp_path, monkeypatch):
+    """Com o perfil ligado os dias não vão para o pool (o perfil não veria nada)."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.perfil_var = MagicMock(get=MagicMock(return_value=True))
+    app.btn_limpar = MagicMock()
+    app.btn_verificar = MagicMock()
+    app.btn_cancelar = MagicMock()
+    app._gerar_dias = MagicMock(return_value=(3, 0))
+    monkeypatch.setattr(
+        gui_modulo,
+        "executar_com_perfil",
+        lambda funcao, **kwargs: (funcao(), {"pstats": "perfil.pstats"}),
+    )
+
+    app.executar_geracao(["1", "2", "3"])
+
+    app._gerar_dias.assert_called_once_with(["1", "2", "3"], workers=1)
+    _quadro(app)
+    assert "sem paralelismo" in _texto_do_log(app)
+
+
+def test_gerar_fica_bloqueado_durante_geracao(gui_modulo, tmp_path):
+    """Recarga dos dias ou dos arquivos no meio de uma geração não libera "Gerar"."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.btn_limpar = MagicMock()
+    app.btn_verificar = MagicMock()
+    app.btn_cancelar = MagicMock()
+    app.decupagem_status = MagicMock()
+    app.plano_status = MagicMock()
+    presentes = {caminho: True for caminho in gui_modulo.ARQUIVOS_ENTRADA}
+
+    app._bloquear_botoes()
+    app._ao_carregar_dias(["1", "2"], None)
+    app._atualizar_status_arquivos(presentes)
+    app.btn_gerar.configure.assert_called_with(state="disabled")
+    assert all(
+        chamada.kwargs == {"state": "disabled"}
+        for chamada in app.btn_gerar.configure.call_args_list
+    )
+
+    app._reabilitar_botoes()
+    app.btn_gerar.configure.assert_called_with(state="normal")
+
+    # Fim de uma tarefa com um arquivo de entrada faltando: continua bloqueado
+    app._bloquear_botoes()
+    app._atualizar_status_arquivos(
+        dict(presentes, **{gui_modulo.ARQUIVO_PLANO_GUI: False})
+    )
+    app._reabilitar_botoes()
+    app.btn_gerar.configure.assert_called_with(state="disabled")
+
+
+def test_erro_em_uma_chamada_nao_perde_as_demais(gui_modulo, tmp_path):
+    """Uma chamada que falha vai para o log; as seguintes do quadro rodam."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    executadas = []
+
+    def janela_fechada():
+        raise RuntimeError("invalid command name")
+
+    app._na_interface(lambda: executadas.append("antes"))
+    app._na_interface(janela_fechada)
+    app._na_interface(lambda: executadas.append("depois"))
+    _quadro(app)
+    _quadro(app)
+
+    assert executadas == ["antes", "depois"]
+    assert "invalid command name" in _texto_do_log(app)
+    assert app.pendentes == [app._drenar_eventos]
+
+
+def test_previa_fechada_durante_a_leitura(gui_modulo, tmp_path):
+    """Resultado que chega depois de fechar a prévia é descartado sem erro."""
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    previa = gui_modulo.JanelaPrevia.__new__(gui_modulo.JanelaPrevia)
+    previa.app = app
+    previa.janela = MagicMock()
+    previa.janela.winfo_exists.return_value = False
+    previa.dia_var = MagicMock()
+    previa.dia_var.get.side_effect = RuntimeError("invalid command name")
+    previa.info_label = MagicMock()
+    previa.lista = MagicMock()
+
+    previa._exibir("1", [("07h00", "CENA 1", "cena")], None)
+
+    previa.info_label.configure.assert_not_called()
+    previa.lista.mostrar.assert_not_called()
+
+
+def test_recarga_dos_dias_mantem_a_selecao(gui_modulo, tmp_path, monkeypatch):
+    """Recarga automática mantém os dias marcados e os checkboxes utilizáveis."""
+
+    class Variavel:
+        def __init__(self, value=False):
+            self.valor = value
+
+        def get(self):
+            return self.valor
+
+        def set(self, valor):
+            self.valor = valor
+
+    monkeypatch.setattr(gui_modulo.ctk, "BooleanVar", Variavel)
+    app = _gui_sem_janela(gui_modulo, GeradorODCompleto(pasta_projeto=str(tmp_path)))
+    app.todos_dias_var.get.return_value = False
+    app.dias_disponiveis = ["1", "2", "3"]
+    app.criar_checkboxes_dias()
+    app.dias_vars["2"].set(True)
+    app.dias_vars["3"].set(True)
+
+    # Monitor de arquivos: leitura em andamento e plano novo sem o dia 3
+    app.mostrar_carregando_dias()
+    app._ao_carregar_dias(["1", "2", "4"], None)
+
+    assert {dia: var.get() for dia, var in app.dias_vars.items()} == {
+        "1": False,
+        "2": True,
+        "4": False,
+    }
+    estados = {
+        chamada.kwargs["state"]
+        for chamada in gui_modulo.ctk.CTkCheckBox.call_args_list[-3:]
+    }
+    assert estados == {"normal"}
@@ -0,0 +1,103 @@
+"""
+Testes para o histórico de revisões (LRU em memória + snapshots por revisão)
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+from historico_revisoes import HistoricoRevisoes, id_revisao, tamanho_em_memoria
+
+
+def _estado(dias, tamanho_texto=10):
+    return {
+        "dados_decupagem": {"1": {"descricao": "x" * tamanho_texto, "planos": []}},
+        "config": {
+            "projeto": {"titulo": "TESTE"},
+            "dias_filmagem": {str(dia): {"cenas": [1]} for dia in range(1, dias + 1)},
+        },
+        "titulo_extraido": "TESTE",
+        "indices": {},
+    }
+
+
+def _digests(n):
+    return bytes([n]) * 32, bytes([n + 100]) * 32
+
+
+def test_lru_limitado_por_quantidade_e_orcamento(tmp_path):
+    historico = HistoricoRevisoes(str(tmp_path), max_em_memoria=2, max_em_disco=3)
+    ids = [historico.registrar(_digests(n), _estado(n)) for n in range(1, 4)]
+
+    # Só as duas últimas em memória; a primeira continua em disco
+    assert not historico.em_memoria(ids[0])
+    assert historico.em_memoria(ids[1]) and historico.em_memoria(ids[2])
+    assert [r["id"] for r in historico.listar()] == ids[::-1]
+
+    # Usar a segunda a torna a mais recente: a terceira é a próxima a sair
+    assert historico.obter(ids[1]) is not None
+    assert len(historico.obter(ids[0])["config"]["dias_filmagem"]) == 1
+    assert historico.em_memoria(ids[0]) and not historico.em_memoria(ids[2])
+
+    # Orçamento em bytes: cabe um estado grande por vez
+    grande = _estado(1, tamanho_texto=200_000)
+    historico.orcamento_bytes = tamanho_em_memoria(grande) + 1000
+    historico.registrar(_digests(9), grande)
+    assert historico.em_memoria(id_revisao(_digests(9)))
+    assert historico.bytes_em_memoria <= historico.orcamento_bytes
+    assert not historico.em_memoria(ids[0]) and not historico.em_memoria(ids[1])
+
+    # Disco: as três carregadas por último; o índice sobrevive a uma nova instância
+    novo = HistoricoRevisoes(str(tmp_path))
+    assert [r["id"] for r in novo.listar()] == [
+        id_revisao(_digests(9)),
+        ids[2],
+        ids[1],
+    ]
+    assert novo.obter(ids[0]) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), f"{ids[0]}.odsnap"))
+    assert novo.obter(ids[1])["config"]["projeto"]["titulo"] == "TESTE"
+
+
+def test_trocar_de_revisao_nao_rele_fontes(tmp_path):
+    """Revisão anterior e atual alternam sem ler CSV/PDF de novo."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    gerador.historico = HistoricoRevisoes(str(tmp_path / "revisoes"))
+    assert gerador.carregar_projeto()
+    anterior = id_revisao(gerador.digests_carregados)
+
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    assert gerador.carregar_projeto()
+    assert len(gerador.config["dias_filmagem"]) == 3
+    atual = id_revisao(gerador.digests_carregados)
+    assert [r["id"] for r in gerador.historico.listar()] == [atual, anterior]
+
+    # A revisão em disco é um link para o snapshot do projeto
+    assert (tmp_path / "revisoes" / f"{anterior}.odsnap").exists()
+    assert os.path.samefile(
+        tmp_path / "revisoes" / f"{atual}.odsnap", gerador.arquivo_snapshot
+    )
+
+    with patch.object(
+        gerador, "_carregar_decupagem", side_effect=AssertionError
+    ), patch.object(gerador, "_processar_plano_pdf", side_effect=AssertionError):
+        assert gerador.usar_revisao(anterior)
+        assert len(gerador.config["dias_filmagem"]) == 2
+        # De volta aos arquivos atuais: vem do histórico, não do snapshot
+        with patch.object(gerador, "_carregar_snapshot", side_effect=AssertionError):
+            assert gerador.carregar_projeto()
+        assert len(gerador.config["dias_filmagem"]) == 3
+
+    # Fora da memória a revisão vem do snapshot dela em disco
+    outro = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    outro.historico = HistoricoRevisoes(str(tmp_path / "revisoes"))
+    assert outro.usar_revisao(anterior)
+    assert len(outro.config["dias_filmagem"]) == 2
+    assert outro.historico.em_memoria(anterior)
+    assert not outro.usar_revisao("inexistente")
@@ -0,0 +1,69 @@
+"""
+Testes para a limpeza e o arquivamento da pasta de ODs
+"""
+
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limpeza_ods import arquivar_pasta_ods, excluir_ods, listar_ods
+
+
+def _criar_ods(pasta, total):
+    os.makedirs(pasta, exist_ok=True)
+    for dia in range(1, total + 1):
+        with open(os.path.join(pasta, f"OD_Dia_{dia}.xlsx"), "wb") as f:
+            f.write(b"x")
+    with open(os.path.join(pasta, "metricas_geracao.json"), "w") as f:
+        f.write("{}")
+
+
+def test_listar_e_excluir_ods(tmp_path):
+    pasta = str(tmp_path / "ODs")
+    assert listar_ods(pasta) == []
+
+    _criar_ods(pasta, 3)
+    arquivos = listar_ods(pasta)
+    assert [os.path.basename(a) for a in arquivos] == [
+        "OD_Dia_1.xlsx",
+        "OD_Dia_2.xlsx",
+        "OD_Dia_3.xlsx",
+    ]
+
+    progresso = []
+    removidos, erros = excluir_ods(
+        arquivos + [os.path.join(pasta, "OD_Dia_9.xlsx")],
+        lambda atual, total: progresso.append((atual, total)),
+    )
+    assert removidos == 3
+    assert [os.path.basename(a) for a, _ in erros] == ["OD_Dia_9.xlsx"]
+    assert progresso[-1] == (4, 4)
+    assert os.listdir(pasta) == ["metricas_geracao.json"]
+
+
+def test_arquivar_faz_um_unico_rename(tmp_path):
+    pasta = str(tmp_path / "ODs")
+    pasta_arquivo = str(tmp_path / "ODs_arquivo")
+    agora = datetime(2026, 10, 19, 8, 30, 0)
+    _criar_ods(pasta, 200)
+
+    with patch("limpeza_ods.os.remove") as remover, patch(
+        "limpeza_ods.os.rename", wraps=os.rename
+    ) as renomear:
+        destino = arquivar_pasta_ods(pasta, pasta_arquivo, agora=agora)
+
+    remover.assert_not_called()
+    assert renomear.call_count == 1
+    assert destino == os.path.join(pasta_arquivo, "ODs_2026-10-19_083000")
+    assert len(listar_ods(destino)) == 200
+    assert os.path.isdir(pasta) and os.listdir(pasta) == []
+
+    # Segundo arquivamento no mesmo segundo não sobrescreve o primeiro
+    _criar_ods(pasta, 1)
+    segundo = arquivar_pasta_ods(pasta, pasta_arquivo, agora=agora)
+    assert segundo == destino + "_2"
+    assert len(listar_ods(destino)) == 200
@@ -0,0 +1,67 @@
+"""
+Testes para a geração em lote de vários projetos
+"""
+
+import pytest
+import os
+import sys
+import shutil
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lote_od
+
+
+def _criar_projeto(raiz, nome):
+    """Cria uma pasta de produção com a mesma estrutura de arquivos/."""
+    pasta = raiz / nome / "arquivos"
+    pasta.mkdir(parents=True)
+    shutil.copy("arquivos/DECUPAGEM.csv", pasta)
+    shutil.copy("arquivos/PLANO_FINAL.pdf", pasta)
+    return str(raiz / nome)
+
+
+@pytest.fixture
+def projetos(tmp_path):
+    """Duas produções de exemplo."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+    return [_criar_projeto(tmp_path, "serie_a"), _criar_projeto(tmp_path, "serie_b")]
+
+
+def test_lote_sequencial(projetos):
+    """Cada projeto recebe suas próprias ODs e log."""
+    resultados = lote_od.gerar_lote(projetos, workers=1)
+
+    assert [r["projeto"] for r in resultados] == projetos
+    for resultado in resultados:
+        assert resultado["sucesso"], resultado["erro"]
+        assert resultado["dias"] == 5
+        pasta_ods = os.path.join(resultado["projeto"], "arquivos", "ODs")
+        assert os.path.exists(os.path.join(pasta_ods, "OD_Dia_1.xlsx"))
+        assert os.path.exists(os.path.join(pasta_ods, lote_od.NOME_LOG_PROJETO))
+
+
+def test_lote_paralelo_com_falha(projetos, tmp_path):
+    """Projeto inválido é reportado sem interromper os demais."""
+    vazio = tmp_path / "vazio"
+    vazio.mkdir()
+    entrada = projetos + [str(vazio)]
+
+    resultados = lote_od.gerar_lote(entrada, workers=2)
+
+    assert [r["projeto"] for r in resultados] == entrada
+    assert resultados[0]["sucesso"] and resultados[1]["sucesso"]
+    assert not resultados[2]["sucesso"]
+    assert resultados[2]["erro"]
+
+
+def test_main_lote_resumo(projetos, capsys):
+    """Linha de comando imprime um único resumo."""
+    codigo = lote_od.main(projetos[:1] + ["--workers", "1"])
+
+    saida = capsys.readouterr().out
+    assert codigo == 0
+    assert saida.count("Resumo do lote") == 1
+    assert "serie_a" in saida
@@ -0,0 +1,63 @@
+"""
+Testes para o relatório de memória por etapa (--memory-report)
+"""
+
+import os
+import sys
+import json
+import tracemalloc
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memoria_processo import MonitorMemoria, executar_com_relatorio_memoria
+from gerador_corpus import gerar_corpus
+import gerar_od
+
+MB = 1024 * 1024
+
+
+def test_pico_e_memoria_retida_por_etapa(tmp_path):
+    """Pico temporário e memória retida são separados, inclusive aninhados."""
+    monitor = MonitorMemoria()
+    retido = []
+
+    def trabalho():
+        with monitor.span("temporario"):
+            blocos = [bytes(1000) for _ in range(4000)]
+            del blocos
+        with monitor.span("retido"):
+            retido.extend(bytes(1000) for _ in range(2000))
+
+    _, caminho = executar_com_relatorio_memoria(
+        trabalho, monitor, nome="teste", pasta=str(tmp_path)
+    )
+    assert not tracemalloc.is_tracing()
+
+    with open(caminho, encoding="utf-8") as f:
+        etapas = json.load(f)["etapas"]
+
+    assert etapas["temporario"]["pico_bytes"] > 3.5 * MB
+    assert etapas["temporario"]["retido_bytes"] < 0.5 * MB
+    assert etapas["retido"]["retido_bytes"] > 1.5 * MB
+    assert etapas["retido"]["top_alocacoes"][0]["local"].startswith(__file__)
+
+    # A etapa externa vê o maior pico das internas, sem o custo dos snapshots
+    externa = etapas["teste"]
+    assert etapas["temporario"]["pico_bytes"] <= externa["pico_bytes"] < 6 * MB
+
+
+def test_cli_memory_report(tmp_path, monkeypatch):
+    """gerar_od.py all --memory-report mede as etapas do gerador."""
+    gerar_corpus(str(tmp_path), dias=1, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["gerar_od.py", "all", "--memory-report"])
+
+    gerar_od.main()
+
+    (arquivo,) = os.listdir(tmp_path / "arquivos" / "perfis")
+    assert arquivo.startswith("memoria_todas_")
+    with open(tmp_path / "arquivos" / "perfis" / arquivo, encoding="utf-8") as f:
+        etapas = json.load(f)["etapas"]
+    for etapa in ("ler_csv", "extrair_pdf", "renderizar_dia", "salvar_xlsx"):
+        assert etapas[etapa]["vezes"] >= 1, etapa
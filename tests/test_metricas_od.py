@@ -0,0 +1,87 @@
+"""
+Testes para as métricas de execução (tempos por etapa, contagens e bytes)
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metricas_od import MetricasExecucao
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+
+
+def test_etapas_contagens_e_bytes(tmp_path):
+    """Etapas acumulam duração e chamadas; bytes somam o tamanho dos arquivos."""
+    arquivo = tmp_path / "dados.bin"
+    arquivo.write_bytes(b"x" * 100)
+
+    metricas = MetricasExecucao()
+    for _ in range(2):
+        with metricas.etapa("ler"):
+            pass
+    with pytest.raises(ValueError):
+        with metricas.etapa("falhar"):
+            raise ValueError("etapa com erro também é medida")
+
+    metricas.contar("paginas", 3)
+    metricas.contar("paginas")
+    metricas.definir("cenas", 7)
+    metricas.registrar_leitura(str(arquivo))
+    metricas.registrar_gravacao(str(arquivo))
+    metricas.registrar_gravacao(str(tmp_path / "inexistente"))
+
+    relatorio = metricas.como_dict()
+    assert relatorio["etapas"]["ler"]["vezes"] == 2
+    assert relatorio["etapas"]["falhar"]["vezes"] == 1
+    assert relatorio["contagens"] == {"paginas": 4, "cenas": 7}
+    assert relatorio["bytes"] == {"lidos": 100, "gravados": 100}
+    assert any("ler:" in linha for linha in metricas.resumo())
+
+    metricas.reiniciar()
+    assert metricas.como_dict()["etapas"] == {}
+
+
+def test_gerar_todas_ods_grava_relatorio(tmp_path):
+    """gerar_todas_ods expõe as métricas no gerador e grava o JSON."""
+    resumo = gerar_corpus(
+        str(tmp_path), dias=2, cenas_por_dia=3, planos_por_cena=2, elenco=4
+    )
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador.gerar_todas_ods()
+
+    with open(gerador.arquivo_metricas, encoding="utf-8") as f:
+        relatorio = json.load(f)
+    assert relatorio["etapas"].keys() == gerador.metricas.como_dict()["etapas"].keys()
+
+    for etapa in (
+        "ler_csv",
+        "extrair_pdf",
+        "analisar_linhas",
+        "montar_config",
+        "gravar_config",
+        "renderizar_dia",
+        "salvar_xlsx",
+        "gerar_todas_ods",
+    ):
+        assert etapa in relatorio["etapas"], etapa
+    assert relatorio["etapas"]["salvar_xlsx"]["vezes"] == 2
+
+    contagens = relatorio["contagens"]
+    assert contagens["paginas"] == resumo["paginas"]
+    assert contagens["cenas"] == resumo["cenas"]
+    assert contagens["planos"] == resumo["planos"]
+    assert contagens["dias"] == contagens["ods"] == 2
+    assert contagens["linhas_planilha"] > 0
+    assert relatorio["bytes"]["lidos"] >= os.path.getsize(resumo["plano"])
+    assert relatorio["bytes"]["gravados"] > 0
+
+    # Segunda execução restaura do snapshot: métricas recomeçam do zero
+    assert GeradorODCompleto(pasta_projeto=str(tmp_path)).gerar_todas_ods()
+    with open(gerador.arquivo_metricas, encoding="utf-8") as f:
+        etapas = json.load(f)["etapas"]
+    assert "carregar_snapshot" in etapas and "extrair_pdf" not in etapas
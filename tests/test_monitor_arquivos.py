@@ -0,0 +1,191 @@
+"""
+Testes para o monitor de arquivos e a regeneração incremental
+"""
+
+import pytest
+import os
+import sys
+import shutil
+import threading
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor_arquivos import MonitorArquivos
+from progresso_od import GeracaoCancelada
+from gerador_od_completo import GeradorODCompleto
+
+
+def test_verificar_agora_detecta_conteudo(tmp_path):
+    """Somente mudanças reais de conteúdo são reportadas."""
+    arquivo = tmp_path / "DECUPAGEM.csv"
+    arquivo.write_text("CENA\n1\n", encoding="utf-8")
+    monitor = MonitorArquivos([str(arquivo)])
+
+    assert monitor.verificar_agora() == set()
+
+    # Mesmo conteúdo com mtime novo: hash igual, nada a fazer
+    os.utime(arquivo, ns=(1, 1))
+    assert monitor.verificar_agora() == set()
+
+    arquivo.write_text("CENA\n1\n2\n", encoding="utf-8")
+    assert monitor.verificar_agora() == {str(arquivo)}
+    assert monitor.verificar_agora() == set()
+
+
+def test_arquivo_removido_e_criado(tmp_path):
+    """Remoção e criação também contam como alteração."""
+    arquivo = tmp_path / "PLANO_FINAL.pdf"
+    monitor = MonitorArquivos([str(arquivo)])
+    assert not monitor.existe(str(arquivo))
+
+    arquivo.write_bytes(b"%PDF")
+    assert monitor.verificar_agora() == {str(arquivo)}
+    assert monitor.existe(str(arquivo))
+
+    arquivo.unlink()
+    assert monitor.verificar_agora() == {str(arquivo)}
+
+
+@pytest.mark.parametrize("usar_inotify", [False, True])
+def test_monitor_em_segundo_plano(tmp_path, usar_inotify):
+    """Thread do monitor chama o callback após a escrita estabilizar."""
+    arquivo = tmp_path / "DECUPAGEM.csv"
+    arquivo.write_text("CENA\n1\n", encoding="utf-8")
+    recebido = []
+    evento = threading.Event()
+
+    def ao_alterar(alterados):
+        recebido.append(alterados)
+        evento.set()
+
+    monitor = MonitorArquivos(
+        [str(arquivo)],
+        ao_alterar,
+        intervalo=0.05,
+        espera_estabilizar=0.05,
+        usar_inotify=usar_inotify,
+    )
+    monitor.iniciar()
+    try:
+        assert monitor.ativo
+        arquivo.write_text("CENA\n1\n2\n", encoding="utf-8")
+        assert evento.wait(5), f"callback não chamado ({monitor.backend})"
+    finally:
+        monitor.parar()
+
+    assert recebido == [{str(arquivo)}]
+    assert not monitor.ativo
+
+
+def test_cancelamento_no_callback_nao_encerra_o_monitor(tmp_path):
+    """GeracaoCancelada no callback não mata a thread; a próxima edição é vista."""
+    arquivo = tmp_path / "DECUPAGEM.csv"
+    arquivo.write_text("CENA\n1\n", encoding="utf-8")
+    chamadas = []
+    primeira = threading.Event()
+    segunda = threading.Event()
+
+    def ao_alterar(alterados):
+        chamadas.append(alterados)
+        if len(chamadas) == 1:
+            primeira.set()
+            raise GeracaoCancelada("geração cancelada pelo usuário")
+        segunda.set()
+
+    monitor = MonitorArquivos(
+        [str(arquivo)],
+        ao_alterar,
+        intervalo=0.05,
+        espera_estabilizar=0.05,
+        usar_inotify=False,
+    )
+    monitor.iniciar()
+    try:
+        arquivo.write_text("CENA\n1\n2\n", encoding="utf-8")
+        assert primeira.wait(5), f"callback não chamado ({monitor.backend})"
+        arquivo.write_text("CENA\n1\n2\n3\n", encoding="utf-8")
+        assert segunda.wait(5), "monitor parou depois do cancelamento"
+        assert monitor.ativo
+    finally:
+        monitor.parar()
+
+
+def test_dias_afetados_por_cena_e_cronograma():
+    """Dia é afetado se o cronograma ou uma cena referenciada mudar."""
+    gerador = GeradorODCompleto()
+    gerador.dados_decupagem = {"1": {"descricao": "A"}, "2": {"descricao": "B"}}
+    gerador.config = {
+        "projeto": {"titulo": "T", "diretor": "", "total_dias": 2},
+        "dias_filmagem": {"1": {"cenas": ["1"]}, "2": {"cenas": ["2"]}},
+    }
+
+    decupagem_anterior = {"1": {"descricao": "A"}, "2": {"descricao": "velha"}}
+    assert gerador.dias_afetados(decupagem_anterior, gerador.config) == ["2"]
+
+    config_anterior = {
+        "projeto": gerador.config["projeto"],
+        "dias_filmagem": {"1": {"cenas": ["1", "2"]}, "2": {"cenas": ["2"]}},
+    }
+    assert gerador.dias_afetados(gerador.dados_decupagem, config_anterior) == ["1"]
+
+    config_anterior = {"projeto": {"titulo": "OUTRO"}, "dias_filmagem": {}}
+    assert gerador.dias_afetados(gerador.dados_decupagem, config_anterior) == [
+        "1",
+        "2",
+    ]
+
+
+def test_recarregar_so_decupagem(tmp_path):
+    """Alterar uma cena da decupagem afeta apenas o dia em que ela é filmada."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+
+    (tmp_path / "arquivos").mkdir()
+    shutil.copy("arquivos/DECUPAGEM.csv", tmp_path / "arquivos")
+    shutil.copy("arquivos/PLANO_FINAL.pdf", tmp_path / "arquivos")
+
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador._carregar_dados()
+
+    csv = tmp_path / "arquivos" / "DECUPAGEM.csv"
+    conteudo = csv.read_text(encoding="utf-8")
+    csv.write_text(
+        conteudo.replace("ABERTURA. Eliéser toma café", "ABERTURA REVISADA", 1),
+        encoding="utf-8",
+    )
+
+    processar_pdf = gerador._processar_plano_pdf
+    gerador._processar_plano_pdf = lambda *args: pytest.fail("PDF relido")
+    try:
+        dias = gerador.recarregar_fontes({gerador.arquivo_decupagem})
+    finally:
+        gerador._processar_plano_pdf = processar_pdf
+
+    # Cena 1 está na diária 2 do plano de exemplo
+    assert dias == ["2"]
+    assert gerador.dados_decupagem["1"]["descricao"].startswith("ABERTURA REVISADA")
+    assert gerador.recarregar_fontes({str(tmp_path / "outro.txt")}) == []
+
+
+def test_edicao_durante_geracao_inicial_e_regenerada(tmp_path):
+    """Mudança nas fontes durante a geração inicial não vira a referência."""
+    from gerador_corpus import gerar_corpus
+
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    gerar_todas_original = gerador.gerar_todas_ods
+
+    def gerar_e_editar():
+        ok = gerar_todas_original()
+        gerar_corpus(
+            str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2
+        )
+        return ok
+
+    gerador.gerar_todas_ods = gerar_e_editar
+    parar = threading.Event()
+    parar.set()  # encerra logo depois de começar a observar
+
+    assert gerador.observar_alteracoes(intervalo=0.05, parar=parar)
+    assert os.path.exists(os.path.join(gerador.pasta_ods, "OD_Dia_3.xlsx"))
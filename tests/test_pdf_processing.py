@@ -7,11 +7,13 @@ import os
 import sys
 import tempfile
 import json
+import shutil
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gerador_od_completo import GeradorODCompleto
+from snapshot_projeto import calcular_digest_arquivo
 
 
 @pytest.fixture
@@ -334,3 +336,50 @@ def test_validar_estrutura_pdf_extraido(gerador_teste):
 
     except Exception:
         assert True  # Código foi executado
+
+
+def test_indice_diarias_caminho_rapido(tmp_path):
+    """Geração de um único dia lê só as páginas da diária pelo índice do cache."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+
+    (tmp_path / "arquivos").mkdir()
+    shutil.copy("arquivos/DECUPAGEM.csv", tmp_path / "arquivos")
+    shutil.copy("arquivos/PLANO_FINAL.pdf", tmp_path / "arquivos")
+
+    completo = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert completo._carregar_dados()
+    with open(completo.arquivo_indice_plano, encoding="utf-8") as f:
+        indice = json.load(f)
+    assert indice["total_dias"] == 5
+    assert indice["dias"]["3"]["inicio"][0] == indice["dias"]["3"]["fim"][0] == 1
+
+    # Sem snapshot, o caminho rápido depende apenas do índice
+    os.remove(completo.arquivo_snapshot)
+
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    paginas_lidas = []
+    extrair = gerador._extrair_paginas_pdf
+
+    def extrair_registrando(arquivo_pdf, paginas=None):
+        resultado = extrair(arquivo_pdf, paginas)
+        paginas_lidas.extend(indice for indice, _ in resultado)
+        return resultado
+
+    gerador._extrair_paginas_pdf = extrair_registrando
+    assert gerador.gerar_od_dia(3)
+
+    assert paginas_lidas == [1]
+    assert gerador.dia_parcial == "3"
+    assert list(gerador.config["dias_filmagem"]) == ["3"]
+    assert gerador.config["projeto"] == completo.config["projeto"]
+    assert gerador.config["dias_filmagem"]["3"] == completo.config["dias_filmagem"]["3"]
+    assert os.path.exists(tmp_path / "arquivos" / "ODs" / "OD_Dia_3.xlsx")
+
+    # PDF alterado invalida o índice
+    with open(gerador.arquivo_plano, "ab") as f:
+        f.write(b"\n%% alterado\n")
+    assert (
+        gerador._carregar_indice_plano(calcular_digest_arquivo(gerador.arquivo_plano))
+        is None
+    )
@@ -0,0 +1,82 @@
+"""
+Testes para o modo de perfil de desempenho (cProfile + pilhas amostradas)
+"""
+
+import pytest
+import os
+import sys
+import time
+import pstats
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perfil_od import executar_com_perfil
+import gerar_od
+
+
+def _trabalho_lento():
+    """Função com tempo suficiente para aparecer nas amostras."""
+    fim = time.perf_counter() + 0.1
+    total = 0
+    while time.perf_counter() < fim:
+        total += sum(range(100))
+    return total
+
+
+def test_grava_pstats_resumo_e_pilhas(tmp_path):
+    """Perfil gera .pstats legível, resumo top-N e pilhas collapsed."""
+    resultado, arquivos = executar_com_perfil(
+        _trabalho_lento, nome="teste", pasta=str(tmp_path), top=5, pilhas=True
+    )
+    assert resultado > 0
+    assert set(arquivos) == {"pstats", "resumo", "pilhas"}
+
+    estatisticas = pstats.Stats(arquivos["pstats"])
+    assert any(
+        funcao[2] == "_trabalho_lento" for funcao in estatisticas.stats
+    ), "função não aparece no perfil"
+
+    with open(arquivos["resumo"], encoding="utf-8") as f:
+        resumo = f.read()
+    assert "tempo acumulado" in resumo and "_trabalho_lento" in resumo
+
+    with open(arquivos["pilhas"], encoding="utf-8") as f:
+        linhas = f.read().splitlines()
+    assert linhas
+    pilha, contagem = linhas[0].rsplit(" ", 1)
+    assert int(contagem) > 0
+    assert any("_trabalho_lento (test_perfil_od.py" in linha for linha in linhas)
+
+
+def test_relatorios_gravados_mesmo_com_erro(tmp_path):
+    """Exceção da tarefa é propagada, mas o perfil fica gravado."""
+
+    def falhar():
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError):
+        executar_com_perfil(falhar, nome="erro", pasta=str(tmp_path))
+
+    gravados = sorted(os.listdir(tmp_path))
+    assert len(gravados) == 2
+    assert gravados[0].endswith(".pstats") and gravados[1].endswith(".txt")
+
+
+def test_cli_profile(tmp_path, monkeypatch):
+    """gerar_od.py all --profile grava o perfil em arquivos/perfis."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["gerar_od.py", "all", "--profile-stacks"])
+
+    with patch("gerador_od_completo.GeradorODCompleto") as gerador:
+        gerar_od.main()
+
+    gerador.return_value.gerar_todas_ods.assert_called_once()
+    gravados = os.listdir(tmp_path / "arquivos" / "perfis")
+    assert sorted(nome.rsplit(".", 1)[1] for nome in gravados) == [
+        "folded",
+        "pstats",
+        "txt",
+    ]
+    assert all(nome.startswith("perfil_todas_") for nome in gravados)
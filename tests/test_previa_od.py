@@ -0,0 +1,116 @@
+"""
+Testes para a prévia do cronograma e a lista virtualizada da GUI
+"""
+
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_od_completo import GeradorODCompleto
+from previa_od import faixa_visivel, linhas_previa
+
+
+@pytest.fixture
+def gerador(tmp_path):
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    gerador.dados_decupagem = {
+        "3": {
+            "locacao": "QUARTO",
+            "descricao": "ACORDA",
+            "elenco": "ANA, JOÃO",
+            "planos": [{"planos": "PG ANA"}, {"planos": "PD JOÃO"}],
+        },
+        "7": {"locacao": "nan", "elenco": "", "planos": []},
+    }
+    gerador.config = {
+        "dias_filmagem": {
+            "1": {
+                "cronograma_completo": [
+                    {
+                        "tipo": "atividade_fixa",
+                        "horario_inicio": "07h00",
+                        "horario_fim": "08h00",
+                        "atividade": "CAFÉ",
+                    },
+                    {
+                        "tipo": "cena",
+                        "numero": 3,
+                        "tipo_local": "INT",
+                        "descricao": "QUARTO - DIA",
+                    },
+                    {"tipo": "rec", "descricao": "REC: 2 passagens"},
+                    {"tipo": "cena", "numero": 7, "tipo_local": "EXT"},
+                ]
+            },
+            "2": {"cenas": [7]},
+        }
+    }
+    return gerador
+
+
+def test_linhas_do_cronograma_com_decupagem_sem_planilha(gerador):
+    """Cada atividade vira uma linha; cenas trazem locação/elenco e planos."""
+    with patch.object(
+        gerador, "_montar_workbook_cronograma", side_effect=AssertionError
+    ):
+        linhas = linhas_previa(gerador, 1)
+
+    assert linhas == [
+        ("07h00-08h00", "⏰ CAFÉ", "atividade_fixa"),
+        ("", "🎬 Cena 3 INT QUARTO - DIA", "cena"),
+        ("", "     Locação: QUARTO | Elenco: ANA, JOÃO", "detalhe"),
+        ("", "     • PG ANA", "plano"),
+        ("", "     • PD JOÃO", "plano"),
+        ("", "📹 REC: 2 passagens", "rec"),
+        ("", "🎬 Cena 7 EXT", "cena"),
+    ]
+
+    # Dia sem cronograma do PDF lista as cenas; dia inexistente fica vazio
+    assert linhas_previa(gerador, 2) == [("", "🎬 Cena 7", "cena")]
+    assert linhas_previa(gerador, 99) == []
+
+
+def test_faixa_visivel():
+    assert faixa_visivel(0, 220, 22, 100) == (0, 13)
+    assert faixa_visivel(1100, 220, 22, 100) == (48, 63)
+    assert faixa_visivel(2000, 220, 22, 100) == (88, 100)
+    assert faixa_visivel(0, 220, 22, 0) == (0, 0)
+
+
+def test_lista_virtual_cria_itens_so_para_linhas_visiveis(gui_modulo):
+    """100 linhas: itens só para a janela visível, reaproveitados ao rolar."""
+    lista = gui_modulo.ListaVirtual(MagicMock())
+    canvas = lista.canvas
+    canvas.winfo_height.return_value = 220
+    canvas.canvasy.return_value = 0
+    contador = iter(range(10**6))
+    canvas.create_text.side_effect = lambda *a, **k: next(contador)
+
+    lista.mostrar([(f"{i:02d}h00", f"linha {i}", "cena") for i in range(100)])
+    assert canvas.create_text.call_count == 2 * 13
+    assert sorted(lista._itens) == list(range(13))
+
+    # No meio da lista a janela tem margem dos dois lados: 15 linhas no máximo
+    canvas.canvasy.return_value = 1100
+    lista.redesenhar()
+    assert sorted(lista._itens) == list(range(48, 63))
+    assert canvas.create_text.call_count == 2 * 15
+
+    canvas.canvasy.return_value = 500
+    lista.redesenhar()
+    canvas.canvasy.return_value = 1100
+    lista.redesenhar()
+    assert canvas.create_text.call_count == 2 * 15
+
+    # Texto do item reaproveitado corresponde à nova linha
+    _, item_texto = lista._itens[50]
+    textos = [
+        chamada.kwargs["text"]
+        for chamada in canvas.itemconfigure.call_args_list
+        if chamada.args == (item_texto,) and "text" in chamada.kwargs
+    ]
+    assert textos[-1] == "linha 50"
@@ -0,0 +1,107 @@
+"""
+Testes para o progresso fino e o cancelamento cooperativo da geração
+"""
+
+import pytest
+import os
+import sys
+import signal
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+
+from progresso_od import GeracaoCancelada, TokenCancelamento
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+import gerar_od
+
+
+@pytest.fixture
+def gerador(tmp_path):
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=3, planos_por_cena=1, elenco=3)
+    return GeradorODCompleto(pasta_projeto=str(tmp_path))
+
+
+def test_progresso_por_pagina_diaria_linha_e_od(gerador):
+    """Cada unidade de trabalho é avisada com atual/total coerentes."""
+    eventos = []
+    gerador.ao_progresso = lambda *evento: eventos.append(evento)
+    assert gerador.gerar_todas_ods()
+
+    por_unidade = {}
+    for unidade, atual, total, dia in eventos:
+        por_unidade.setdefault(unidade, []).append((atual, total, dia))
+
+    paginas = por_unidade["pagina"]
+    assert [atual for atual, _, _ in paginas] == list(range(1, paginas[0][1] + 1))
+    assert [dia for _, _, dia in por_unidade["diaria"]] == [1, 2, 3]
+    assert [(atual, dia) for atual, _, dia in por_unidade["od"]] == [
+        (1, 1),
+        (2, 2),
+        (3, 3),
+    ]
+    linhas_dia_2 = [atual for atual, _, dia in por_unidade["linha"] if dia == 2]
+    total_dia_2 = len(gerador.config["dias_filmagem"]["2"]["cronograma_completo"])
+    assert linhas_dia_2 == list(range(1, total_dia_2 + 1))
+
+
+def test_cancelamento_entre_linhas_nao_deixa_od_pela_metade(gerador):
+    """Cancelar no meio do dia 2 mantém a OD 1 e não grava nada do dia 2."""
+    token = TokenCancelamento()
+    gerador.cancelamento = token
+
+    def ao_progresso(unidade, atual, total, dia):
+        if unidade == "linha" and dia == 2 and atual == 2:
+            token.cancelar()
+
+    gerador.ao_progresso = ao_progresso
+    with pytest.raises(GeracaoCancelada):
+        gerador.gerar_todas_ods()
+
+    arquivos = sorted(os.listdir(gerador.pasta_ods))
+    assert "OD_Dia_1.xlsx" in arquivos and "OD_Dia_2.xlsx" not in arquivos
+    assert not [nome for nome in arquivos if nome.endswith(".tmp")]
+    load_workbook(os.path.join(gerador.pasta_ods, "OD_Dia_1.xlsx"))
+
+    # Relatório de métricas é gravado mesmo na execução cancelada
+    assert os.path.exists(gerador.arquivo_metricas)
+
+
+def test_erro_ao_salvar_preserva_od_anterior(gerador):
+    """Gravação atômica: uma falha no meio do save mantém a OD anterior."""
+    assert gerador.gerar_od_dia(1)
+    arquivo_od = os.path.join(gerador.pasta_ods, "OD_Dia_1.xlsx")
+    with open(arquivo_od, "rb") as f:
+        conteudo_anterior = f.read()
+
+    def save_incompleto(self, caminho):
+        with open(caminho, "wb") as f:
+            f.write(b"PK pela metade")
+        raise OSError("disco cheio")
+
+    with patch.object(Workbook, "save", save_incompleto):
+        assert not gerador.renderizar_todas_ods()
+
+    with open(arquivo_od, "rb") as f:
+        assert f.read() == conteudo_anterior
+    assert not [nome for nome in os.listdir(gerador.pasta_ods) if nome.endswith(".tmp")]
+
+
+def test_ctrl_c_cancela_e_restaura_tratador(gerador):
+    """Primeiro SIGINT só marca o cancelamento; o tratador anterior é devolvido."""
+    anterior = signal.getsignal(signal.SIGINT)
+    tratador = gerar_od._cancelar_com_ctrl_c(gerador)
+    try:
+        signal.raise_signal(signal.SIGINT)
+        assert gerador.cancelamento.cancelado
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+    finally:
+        signal.signal(signal.SIGINT, tratador)
+    assert signal.getsignal(signal.SIGINT) is anterior
+
+    with pytest.raises(GeracaoCancelada):
+        gerador.gerar_todas_ods()
@@ -0,0 +1,96 @@
+"""
+Testes para o trace de execução (Chrome/Perfetto trace-event)
+"""
+
+import os
+import sys
+import json
+import threading
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rastreamento_od import RastreadorEventos, executar_com_trace
+from gerador_corpus import gerar_corpus
+from gerador_od_completo import GeradorODCompleto
+from lote_od import main as main_lote
+
+
+def _spans(documento):
+    return [evento for evento in documento["traceEvents"] if evento["ph"] == "X"]
+
+
+def test_spans_aninhados_e_threads(tmp_path):
+    """Spans filhos ficam dentro do pai; cada thread tem seu tid nomeado."""
+    rastreador = RastreadorEventos()
+
+    def trabalho():
+        with rastreador.span("filho", dia=1):
+            pass
+
+    with rastreador.span("pai"):
+        trabalho()
+        thread = threading.Thread(target=trabalho, name="trabalhador")
+        thread.start()
+        thread.join()
+
+    spans = {(s["name"], s["tid"]): s for s in _spans(rastreador.como_dict())}
+    pai = spans[("pai", threading.get_ident())]
+    filho = spans[("filho", threading.get_ident())]
+    assert pai["ts"] <= filho["ts"]
+    assert filho["ts"] + filho["dur"] <= pai["ts"] + pai["dur"]
+    assert filho["args"] == {"dia": "1"}
+
+    nomes_threads = {
+        evento["args"]["name"]
+        for evento in rastreador.como_dict()["traceEvents"]
+        if evento["name"] == "thread_name"
+    }
+    assert "trabalhador" in nomes_threads
+
+    _, caminho = executar_com_trace(lambda: None, rastreador, pasta=str(tmp_path))
+    with open(caminho, encoding="utf-8") as f:
+        assert len(_spans(json.load(f))) == 4
+
+
+def test_etapas_do_gerador_viram_spans(tmp_path):
+    """Com rastreador ligado, as etapas das métricas aparecem no trace."""
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=3)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    rastreador = RastreadorEventos()
+    gerador.metricas.observadores.append(rastreador)
+    assert gerador.gerar_todas_ods()
+
+    spans = _spans(rastreador.como_dict())
+    nomes = [span["name"] for span in spans]
+    for etapa in ("carregar_dados", "extrair_pdf", "analisar_linhas", "salvar_xlsx"):
+        assert etapa in nomes, etapa
+    assert sorted(s["args"]["dia"] for s in spans if s["name"] == "od_dia") == [
+        "1",
+        "2",
+    ]
+
+
+def test_lote_com_trace_junta_processos(tmp_path, monkeypatch):
+    """lote --trace grava um único trace com os spans de cada processo."""
+    projetos = []
+    for nome in ("a", "b"):
+        pasta = tmp_path / nome
+        gerar_corpus(str(pasta), dias=1, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+        projetos.append(str(pasta))
+
+    monkeypatch.chdir(tmp_path)
+    assert main_lote(projetos + ["--workers", "2", "--trace"]) == 0
+
+    pasta_traces = tmp_path / "arquivos" / "perfis"
+    (arquivo,) = os.listdir(pasta_traces)
+    assert arquivo.startswith("trace_lote_")
+    with open(pasta_traces / arquivo, encoding="utf-8") as f:
+        spans = _spans(json.load(f))
+
+    projetos_rastreados = {
+        s["args"]["projeto"] for s in spans if s["name"] == "projeto"
+    }
+    assert projetos_rastreados == {os.path.abspath(p) for p in projetos}
+    assert any(s["name"] == "trace_lote" and s["pid"] == os.getpid() for s in spans)
+    assert {s["pid"] for s in spans if s["name"] == "projeto"} != {os.getpid()}
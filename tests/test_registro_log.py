@@ -0,0 +1,51 @@
+"""
+Testes para o log limitado da interface (buffer circular + arquivo rotativo)
+"""
+
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registro_log import RegistroLog
+
+
+def test_buffer_circular_e_linhas_a_descartar(tmp_path):
+    """A janela em memória não passa do limite, mesmo com mensagens multilinha."""
+    registro = RegistroLog(str(tmp_path / "gui.log"), linhas_visiveis=5)
+    try:
+        assert registro.adicionar(["a", "b"]) == ("a\nb\n", 0)
+        assert registro.adicionar(["c\nd", "e", "f"]) == ("c\nd\ne\nf\n", 1)
+        assert list(registro.linhas) == ["b", "c", "d", "e", "f"]
+
+        # Lote maior que a janela: só o final vai para a tela
+        texto, descartar = registro.adicionar([str(i) for i in range(20)])
+        assert texto == "15\n16\n17\n18\n19\n"
+        assert descartar == 5
+        assert len(registro.linhas) == 5
+    finally:
+        registro.fechar()
+
+
+def test_arquivo_rotativo_guarda_o_historico(tmp_path):
+    """Linhas que saíram da tela continuam no disco e no 'salvar log completo'."""
+    arquivo = str(tmp_path / "logs" / "gui.log")
+    registro = RegistroLog(
+        arquivo, linhas_visiveis=10, tamanho_maximo=2000, arquivos_antigos=50
+    )
+    try:
+        for i in range(500):
+            registro.adicionar([f"mensagem {i:04d}"])
+
+        assert len(registro.arquivos()) > 1
+        assert all(os.path.getsize(caminho) <= 2000 for caminho in registro.arquivos())
+
+        destino = tmp_path / "completo.log"
+        assert registro.salvar_completo(str(destino)) == 500
+        linhas = destino.read_text(encoding="utf-8").splitlines()
+        assert [linha.split(" ", 2)[2] for linha in linhas] == [
+            f"mensagem {i:04d}" for i in range(500)
+        ]
+    finally:
+        registro.fechar()
@@ -0,0 +1,141 @@
+"""
+Testes para o serviço local HTTP/JSON de ODs (somente localhost)
+"""
+
+import pytest
+import os
+import sys
+import io
+import json
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from servidor_od import ServidorOD
+
+
+def _criar_projeto(raiz, nome):
+    """Cria uma pasta de produção com arquivos/ de exemplo."""
+    pasta = raiz / nome / "arquivos"
+    pasta.mkdir(parents=True)
+    shutil.copy("arquivos/DECUPAGEM.csv", pasta)
+    shutil.copy("arquivos/PLANO_FINAL.pdf", pasta)
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    """Serviço em porta livre com dois projetos na raiz."""
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+
+    _criar_projeto(tmp_path, "serie_a")
+    _criar_projeto(tmp_path, "serie_b")
+
+    servidor = ServidorOD(
+        ("127.0.0.1", 0), str(tmp_path), max_projetos=1, silencioso=True
+    )
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _get(servidor, caminho):
+    """Faz GET e retorna (status, cabeçalhos, corpo)."""
+    url = f"http://127.0.0.1:{servidor.server_address[1]}{caminho}"
+    try:
+        with urllib.request.urlopen(url, timeout=60) as resposta:
+            return resposta.status, resposta.headers, resposta.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_listar_e_resumir_dias(servidor):
+    """Listagem de dias e resumo de um dia."""
+    status, _, corpo = _get(servidor, "/dias?projeto=serie_a")
+    dados = json.loads(corpo)
+    assert status == 200
+    assert [dia["dia"] for dia in dados["dias"]] == [1, 2, 3, 4, 5]
+
+    status, _, corpo = _get(servidor, "/dias/2?projeto=serie_a")
+    resumo = json.loads(corpo)
+    assert status == 200
+    assert resumo["cenas"] == ["1", "6", "9", "11"]
+    cena = next(item for item in resumo["cronograma"] if item["tipo"] == "cena")
+    assert cena["numero"] == 1 and cena["planos"]
+
+
+def test_planilha_xlsx(servidor):
+    """Planilha é devolvida em memória, sem gravar na pasta de ODs."""
+    import openpyxl
+
+    status, cabecalhos, corpo = _get(servidor, "/dias/1/xlsx?projeto=serie_a")
+    assert status == 200
+    assert "OD_Dia_1.xlsx" in cabecalhos["Content-Disposition"]
+
+    wb = openpyxl.load_workbook(io.BytesIO(corpo))
+    assert wb.active.title == "OD_Dia_1"
+
+
+def test_erros(servidor):
+    """Rotas inválidas, dias inexistentes e pastas fora da raiz."""
+    assert _get(servidor, "/dias/99?projeto=serie_a")[0] == 404
+    assert _get(servidor, "/dias/abc?projeto=serie_a")[0] == 400
+    assert _get(servidor, "/outra")[0] == 404
+    assert _get(servidor, "/dias?projeto=inexistente")[0] == 404
+    assert _get(servidor, "/dias?projeto=../..")[0] == 403
+
+
+def test_pedidos_simultaneos_e_memoria_limitada(servidor):
+    """Pedidos concorrentes carregam o projeto uma vez; cache respeita o limite."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        respostas = list(
+            executor.map(
+                lambda dia: _get(servidor, f"/dias/{dia}?projeto=serie_a"),
+                [1, 2, 3, 4, 5],
+            )
+        )
+    assert all(status == 200 for status, _, _ in respostas)
+    assert len(servidor.cache) == 1
+
+    assert _get(servidor, "/dias?projeto=serie_b")[0] == 200
+    status, _, corpo = _get(servidor, "/saude")
+    assert status == 200
+    assert json.loads(corpo)["projetos_em_cache"] == 1
+
+
+def test_digest_so_recalculado_quando_stat_muda(servidor, tmp_path, monkeypatch):
+    """Pedidos repetidos não refazem o SHA-256; mudança de tamanho/mtime refaz."""
+    import servidor_od
+
+    chamadas = []
+    original = servidor_od.calcular_digests_fontes
+
+    def contar(*caminhos):
+        chamadas.append(caminhos)
+        return original(*caminhos)
+
+    monkeypatch.setattr(servidor_od, "calcular_digests_fontes", contar)
+
+    for _ in range(3):
+        assert _get(servidor, "/dias?projeto=serie_a")[0] == 200
+    assert len(chamadas) == 1
+
+    decupagem = tmp_path / "serie_a" / "arquivos" / "DECUPAGEM.csv"
+    with open(decupagem, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert _get(servidor, "/dias?projeto=serie_a")[0] == 200
+    assert len(chamadas) == 2
+
+
+def test_digests_saem_com_o_projeto(servidor, tmp_path):
+    """Com o limite de um projeto, só os digests da pasta em memória ficam."""
+    assert _get(servidor, "/dias?projeto=serie_a")[0] == 200
+    assert _get(servidor, "/dias?projeto=serie_b")[0] == 200
+    assert list(servidor.cache._digests) == [str(tmp_path / "serie_b")]
@@ -0,0 +1,200 @@
+"""
+Testes para o snapshot binário do projeto
+"""
+
+import pytest
+import os
+import sys
+import shutil
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot_projeto
+from snapshot_projeto import (
+    calcular_digest_arquivo,
+    calcular_digests_fontes,
+    carregar_snapshot,
+    salvar_snapshot,
+)
+
+DIGESTS = (b"a" * 32, b"b" * 32)
+DADOS = {
+    "dados_decupagem": {"1": {"descricao": "ABERTURA", "planos": []}},
+    "config": {"projeto": {"titulo": "TESTE"}, "dias_filmagem": {}},
+    "titulo_extraido": "TESTE",
+    "indices": {"cenas_por_dia": {}, "dias_por_cena": {}},
+}
+
+
+def test_roundtrip_snapshot(tmp_path):
+    """Dados gravados são restaurados integralmente."""
+    caminho = tmp_path / "projeto.odsnap"
+    salvar_snapshot(str(caminho), DIGESTS, DADOS)
+
+    assert carregar_snapshot(str(caminho), DIGESTS) == DADOS
+
+
+def test_snapshot_invalido_com_digest_diferente(tmp_path):
+    """Fonte alterada invalida o snapshot."""
+    caminho = tmp_path / "projeto.odsnap"
+    salvar_snapshot(str(caminho), DIGESTS, DADOS)
+
+    assert carregar_snapshot(str(caminho), (b"a" * 32, b"c" * 32)) is None
+
+
+def test_snapshot_invalido_com_versao_diferente(tmp_path):
+    """Versão de formato diferente força parse completo."""
+    caminho = tmp_path / "projeto.odsnap"
+    salvar_snapshot(str(caminho), DIGESTS, DADOS)
+
+    with patch.object(snapshot_projeto, "VERSAO_FORMATO", 999):
+        assert carregar_snapshot(str(caminho), DIGESTS) is None
+
+
+def test_snapshot_corrompido(tmp_path):
+    """Arquivo truncado não gera exceção."""
+    caminho = tmp_path / "projeto.odsnap"
+    salvar_snapshot(str(caminho), DIGESTS, DADOS)
+    conteudo = caminho.read_bytes()
+    caminho.write_bytes(conteudo[:-5])
+
+    assert carregar_snapshot(str(caminho), DIGESTS) is None
+    assert carregar_snapshot(str(tmp_path / "inexistente"), DIGESTS) is None
+
+
+def test_digests_fontes(tmp_path):
+    """Digests só existem quando as duas fontes existem."""
+    csv = tmp_path / "DECUPAGEM.csv"
+    csv.write_text("CENA\n1\n", encoding="utf-8")
+
+    assert calcular_digest_arquivo(str(csv)) is not None
+    assert calcular_digests_fontes(str(csv), str(tmp_path / "nao.pdf")) is None
+
+
+def test_gerador_usa_snapshot_na_segunda_carga(tmp_path):
+    """Segunda carga não reprocessa o PDF."""
+    from gerador_od_completo import GeradorODCompleto
+
+    if not os.path.exists("arquivos/PLANO_FINAL.pdf"):
+        pytest.skip("Arquivos de teste não encontrados")
+
+    gerador = GeradorODCompleto()
+    gerador.arquivo_decupagem = shutil.copy("arquivos/DECUPAGEM.csv", tmp_path)
+    gerador.arquivo_plano = shutil.copy("arquivos/PLANO_FINAL.pdf", tmp_path)
+    gerador.arquivo_config = str(tmp_path / "config.json")
+    gerador.arquivo_snapshot = str(tmp_path / ".cache" / "projeto.odsnap")
+
+    assert gerador._carregar_dados()
+    assert os.path.exists(gerador.arquivo_snapshot)
+    config_original = gerador.config
+
+    segundo = GeradorODCompleto()
+    segundo.arquivo_decupagem = gerador.arquivo_decupagem
+    segundo.arquivo_plano = gerador.arquivo_plano
+    segundo.arquivo_config = gerador.arquivo_config
+    segundo.arquivo_snapshot = gerador.arquivo_snapshot
+
+    with patch.object(segundo, "_processar_plano_pdf") as processar:
+        assert segundo._carregar_dados()
+        processar.assert_not_called()
+
+    assert segundo.config == config_original
+    assert "dias_por_cena" in segundo.indices
+
+
+def test_carregar_projeto_reaproveita_ate_as_fontes_mudarem(tmp_path):
+    """carregar_projeto só relê as fontes quando o conteúdo delas muda."""
+    from gerador_corpus import gerar_corpus
+    from gerador_od_completo import GeradorODCompleto
+
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    cargas = []
+    carregar_original = gerador._carregar_dados
+    gerador._carregar_dados = lambda *args, **kwargs: cargas.append(
+        args
+    ) or carregar_original(*args, **kwargs)
+
+    assert gerador.carregar_projeto()
+    assert gerador.carregar_projeto()
+    assert len(cargas) == 1
+
+    # mtime novo com o mesmo conteúdo: o digest confirma que nada mudou
+    os.utime(gerador.arquivo_decupagem, ns=(0, 10**18))
+    assert gerador.carregar_projeto()
+    assert len(cargas) == 1
+
+    with open(gerador.arquivo_decupagem, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert gerador.carregar_projeto()
+    assert len(cargas) == 2
+
+    # Carga parcial de um dia (gerar_od_dia) não serve para os demais
+    assert gerador.gerar_od_dia(1)
+    assert gerador.carregar_projeto()
+    assert sorted(gerador.config["dias_filmagem"]) == ["1", "2"]
+
+
+def test_cada_fonte_alterada_e_hasheada_uma_vez(tmp_path, monkeypatch):
+    """carregar_projeto e recarregar_fontes reaproveitam os digests do monitor."""
+    import monitor_arquivos
+    from gerador_corpus import gerar_corpus
+    from gerador_od_completo import GeradorODCompleto
+
+    gerar_corpus(str(tmp_path), dias=2, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    hasheados = []
+
+    def contar(caminho, *args, **kwargs):
+        hasheados.append(os.path.basename(caminho))
+        return calcular_digest_arquivo(caminho, *args, **kwargs)
+
+    monkeypatch.setattr(snapshot_projeto, "calcular_digest_arquivo", contar)
+    monkeypatch.setattr(monitor_arquivos, "calcular_digest_arquivo", contar)
+
+    assert gerador.carregar_projeto()
+    assert sorted(hasheados) == ["DECUPAGEM.csv", "PLANO_FINAL.pdf"]
+
+    hasheados.clear()
+    with open(gerador.arquivo_decupagem, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert gerador.carregar_projeto()
+    assert hasheados == ["DECUPAGEM.csv"]
+
+    # Modo observação: o monitor detecta, a recarga e o próximo
+    # carregar_projeto usam o digest que ele calculou
+    monitor = monitor_arquivos.MonitorArquivos(
+        [gerador.arquivo_decupagem, gerador.arquivo_plano]
+    )
+    with open(gerador.arquivo_decupagem, "a", encoding="utf-8") as f:
+        f.write("\n")
+    hasheados.clear()
+    alterados = monitor.verificar_agora()
+    gerador.recarregar_fontes(alterados, monitor)
+    assert gerador.carregar_projeto()
+    assert hasheados == ["DECUPAGEM.csv"]
+
+
+def test_recarga_cancelada_e_refeita_na_proxima_chamada(tmp_path):
+    """Cancelar a releitura não deixa o projeto antigo passar por atual."""
+    from gerador_corpus import gerar_corpus
+    from gerador_od_completo import GeradorODCompleto
+    from progresso_od import GeracaoCancelada, TokenCancelamento
+
+    gerar_corpus(str(tmp_path), dias=3, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    gerador = GeradorODCompleto(pasta_projeto=str(tmp_path))
+    assert gerador.carregar_projeto()
+
+    gerar_corpus(str(tmp_path), dias=7, cenas_por_dia=2, planos_por_cena=1, elenco=2)
+    token = TokenCancelamento()
+    gerador.cancelamento = token
+    gerador.ao_progresso = lambda *args: token.cancelar()
+    with pytest.raises(GeracaoCancelada):
+        gerador.carregar_projeto()
+
+    gerador.cancelamento = None
+    gerador.ao_progresso = None
+    assert gerador.carregar_projeto()
+    assert len(gerador.config["dias_filmagem"]) == 7